@@ -1,27 +1,25 @@
 #!/usr/bin/env python3
+import io
 import sys
 import os
 
 # Я у дипсика спрашивал как подключать, он сказал так
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "lib"))
-from text import normalize, tokenize, count_freq, top_n
+from text import iter_tokens, count_freq, top_n
 
 """Я пользуюсь виндой, так как Линух на моем компе жрет 30 ватт (Спасиба НВидия)!!!
 Поэтому я пользуюсь не баш, а повершелл, он почему-то не понимает русский язык, дипсик сказал, что нужно так сделать
 $OutputEncoding = [console]::InputEncoding = [console]::OutputEncoding = New-Object System.Text.UTF8Encoding
 И заработает, он не обманул, ура
 """
-text = sys.stdin.buffer.read().decode("utf-8")
+# Читаем stdin потоково, не загружая весь текст в память
+stdin = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
 
-normalized_text = normalize(text)
-
-tokens = tokenize(normalized_text)
-
-freq = count_freq(tokens)
+freq = count_freq(iter_tokens(stdin))
 
 top_words = top_n(freq, 5)
 
-print(f"Всего слов: {len(tokens)}")
+print(f"Всего слов: {sum(freq.values())}")
 print(f"Уникальных слов: {len(freq)}")
 print("Топ-5:")
 
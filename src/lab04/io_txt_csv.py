@@ -1,6 +1,10 @@
 import csv
+import os
 from pathlib import Path
-from typing import Iterable, Sequence, Union
+from typing import Iterable, Iterator, Sequence, Union
+
+# Сколько строк передавать в writerows за раз
+DEFAULT_BATCH_SIZE = 10_000
 
 
 def read_text(path: Union[str, Path], encoding: str = "utf-8") -> str:
@@ -10,29 +14,57 @@ def read_text(path: Union[str, Path], encoding: str = "utf-8") -> str:
 
 
 def write_csv(
-    rows: Iterable[Sequence], path: Union[str, Path], header: tuple[str, ...] = None
+    rows: Iterable[Sequence],
+    path: Union[str, Path],
+    header: tuple[str, ...] = None,
+    buffer_size: int = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
 ) -> None:
 
     p = Path(path)
-    rows_list = list(rows)
-
-    # Проверка согласованности длин строк
-    if rows_list:
-        first_len = len(rows_list[0])
-        for i, row in enumerate(rows_list):
-            if len(row) != first_len:
-                raise ValueError(
-                    f"Строка {i} имеет длину {len(row)}, ожидалось {first_len}"
-                )
 
     # Создание родительских директорий
     ensure_parent_dir(p)
 
-    with p.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        if header is not None:
-            writer.writerow(header)
-        writer.writerows(rows_list)
+    # Строки пишутся пачками по мере поступления (генераторы не
+    # материализуются), во временный файл - при ошибке в середине
+    # потока старый файл остаётся нетронутым
+    tmp = p.with_name(p.name + ".tmp")
+    try:
+        with tmp.open(
+            "w", newline="", encoding="utf-8", buffering=buffer_size or -1
+        ) as f:
+            writer = csv.writer(f)
+            if header is not None:
+                writer.writerow(header)
+            for batch in _checked_batches(rows, batch_size):
+                writer.writerows(batch)
+        os.replace(tmp, p)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _checked_batches(
+    rows: Iterable[Sequence], batch_size: int
+) -> Iterator[list[Sequence]]:
+    # Проверка согласованности длин строк прямо во время потока:
+    # ошибка возникает на первой строке с другой длиной
+    first_len = None
+    batch = []
+    for i, row in enumerate(rows):
+        if first_len is None:
+            first_len = len(row)
+        elif len(row) != first_len:
+            raise ValueError(
+                f"Строка {i} имеет длину {len(row)}, ожидалось {first_len}"
+            )
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
 
 
 def ensure_parent_dir(path: Union[str, Path]) -> None:
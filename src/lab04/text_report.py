@@ -1,6 +1,11 @@
 #!/usr/bin/env python3
 
+import argparse
+import csv
+import glob
 import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import chain, islice
 from pathlib import Path
 from collections import Counter
 
@@ -11,8 +16,24 @@ sys.path.insert(0, str(lib_dir))
 sys.path.insert(0, str(current_dir))
 
 # Импортируем модули
-from text import normalize, tokenize, count_freq, top_n
-from io_txt_csv import read_text, write_csv
+from text import (
+    normalize,
+    tokenize,
+    count_freq,
+    top_n,
+    iter_tokens,
+    count_freq_parallel,
+    DEFAULT_CHUNK_SIZE,
+)
+from checkpoint import incremental_counts, state_path_for
+from profiling import Profiler, profiled_frequencies
+from external_sort import SpillingCounter
+from ngrams import count_file_ngrams
+from cache import ResultCache, code_version
+from io_txt_csv import write_csv, ensure_parent_dir
+
+# Заголовок CSV-сводки по файлам корпуса
+SUMMARY_HEADER = ("file", "bytes", "words", "unique_words", "error")
 
 
 def frequencies_from_text(text: str) -> dict[str, int]:
@@ -20,27 +41,129 @@ def frequencies_from_text(text: str) -> dict[str, int]:
     return Counter(tokens)
 
 
+def frequencies_from_file(
+    file_obj, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> dict[str, int]:
+    # Потоковый подсчёт: в памяти только словарь частот и один кусок текста
+    return Counter(iter_tokens(file_obj, chunk_size))
+
+
 def sorted_word_counts(freq: dict[str, int]) -> list[tuple[str, int]]:
     return sorted(freq.items(), key=lambda kv: (-kv[1], kv[0]))
 
 
+def write_spilled_report(
+    input_file: str,
+    output_file: str,
+    encoding: str = "utf-8",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_items: int = 1_000_000,
+    stages: Profiler = None,
+) -> tuple[int, int, list[tuple[str, int]]]:
+    # Отчёт для словарей, не помещающихся в память: частоты сбрасываются
+    # на диск отсортированными прогонами, а результат слияния сразу пишется
+    # в CSV в том же порядке (-count, word)
+    stages = stages or Profiler(trace_memory=False)
+    ensure_parent_dir(output_file)
+
+    with SpillingCounter(max_items, tmp_dir=Path(output_file).parent) as counter:
+        with stages.stage("count_freq_spill") as st:
+            with open(input_file, "r", encoding=encoding) as f:
+                counter.update(iter_tokens(f, chunk_size))
+        st.tokens += counter.total
+
+        with stages.stage("sorted_word_counts") as st:
+            items = counter.sorted_items()
+        st.tokens += counter.unique
+
+        with stages.stage("write_csv") as st:
+            # Первые пять строк слияния - это и есть топ-5
+            top_words = list(islice(items, 5))
+            write_csv(chain(top_words, items), output_file, header=("word", "count"))
+        st.bytes += Path(output_file).stat().st_size
+
+        return counter.total, counter.unique, top_words
+
+
 def generate_report(
     input_file: str = "data/lab04/input.txt",
     output_file: str = "data/lab04/report.csv",
     encoding: str = "utf-8",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = 1,
+    incremental: bool = False,
+    profiler: Profiler = None,
+    spill_items: int = None,
+    ngram: int = 1,
+    min_count: int = 1,
 ) -> None:
 
+    # Без профилирования замеряются только крупные стадии, без tracemalloc
+    stages = profiler or Profiler(trace_memory=False)
+
     try:
-        # Чтение входного файла
-        text = read_text(input_file, encoding=encoding)
+        if spill_items:
+            # Словарь больше spill_items слов - внешняя сортировка через диск
+            total_words, unique_words, top_words = write_spilled_report(
+                input_file, output_file, encoding, chunk_size, spill_items, stages
+            )
+            print(f"Всего слов: {total_words}")
+            print(f"Уникальных слов: {unique_words}")
+            print("Топ-5:")
+            for word, count in top_words:
+                print(f"  {word}: {count}")
+            print(f"\nОтчёт сохранён в: {output_file}")
+            return
+
+        header = ("word", "count")
+        if ngram > 1:
+            # Частоты n-грамм; ключи - кортежи ID, строки собираются в конце
+            with stages.stage("count_ngrams") as st:
+                with open(input_file, "r", encoding=encoding) as f:
+                    counter = count_file_ngrams(
+                        f, ngram, chunk_size, min_count=min_count
+                    )
+                freq = counter.to_counter()
+            total_words = counter.total
+            st.tokens += total_words
+            header = ("ngram", "count")
+            print(f"N-граммы из {ngram} слов (не реже {min_count} раз)")
+        elif incremental:
+            # Дочитываем только новый хвост файла, состояние - рядом с отчётом
+            with stages.stage("incremental_counts") as st:
+                freq, new_bytes = incremental_counts(
+                    input_file, state_path_for(output_file), encoding, workers
+                )
+            total_words = sum(freq.values())
+            st.bytes += new_bytes
+            st.tokens += total_words
+            print(f"Обработано новых байт: {new_bytes}")
+        elif workers > 1:
+            # Параллельный подсчёт по диапазонам файла в пуле процессов
+            with stages.stage("count_freq_parallel") as st:
+                freq = count_freq_parallel(input_file, workers, encoding=encoding)
+            total_words = sum(freq.values())
+            st.bytes += Path(input_file).stat().st_size
+            st.tokens += total_words
+        elif profiler is not None:
+            # Пошаговый пайплайн с замером read_text/normalize/tokenize/count_freq
+            with open(input_file, "r", encoding=encoding) as f:
+                freq = profiled_frequencies(f, profiler, chunk_size)
+            total_words = sum(freq.values())
+        else:
+            # Потоковое чтение входного файла и подсчёт через Counter: на
+            # одном файле он не медленнее подсчёта по ID (lib/vocab.py)
+            with open(input_file, "r", encoding=encoding) as f:
+                freq = frequencies_from_file(f, chunk_size)
+            total_words = sum(freq.values())
 
-        # Анализ текста
-        freq = frequencies_from_text(text)
-        sorted_counts = sorted_word_counts(freq)
-        top_words = top_n(freq, 5)
+        with stages.stage("sorted_word_counts") as st:
+            sorted_counts = sorted_word_counts(freq)
+        st.tokens += len(sorted_counts)
+        with stages.stage("top_n"):
+            top_words = top_n(freq, 5)
 
         # Вывод статистики в консоль
-        total_words = sum(freq.values())
         unique_words = len(freq)
 
         print(f"Всего слов: {total_words}")
@@ -50,8 +173,9 @@ def generate_report(
             print(f"  {word}: {count}")
 
         # Сохранение отчёта в CSV
-        header = ("word", "count")
-        write_csv(sorted_counts, output_file, header=header)
+        with stages.stage("write_csv") as st:
+            write_csv(sorted_counts, output_file, header=header)
+        st.bytes += Path(output_file).stat().st_size
         print(f"\nОтчёт сохранён в: {output_file}")
 
     except FileNotFoundError:
@@ -66,15 +190,300 @@ def generate_report(
         sys.exit(1)
 
 
+def expand_inputs(patterns: list[str]) -> list[Path]:
+    # Раскрывает файлы, директории (рекурсивно) и glob-шаблоны в список файлов
+    files = []
+    seen = set()
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            matches = sorted(p for p in path.rglob("*") if p.is_file())
+        elif glob.has_magic(pattern):
+            matches = sorted(Path(p) for p in glob.glob(pattern, recursive=True))
+            matches = [p for p in matches if p.is_file()]
+        else:
+            matches = [path]
+
+        for match in matches:
+            if match not in seen:
+                seen.add(match)
+                files.append(match)
+    return files
+
+
+def is_corpus(patterns: list[str]) -> bool:
+    # Несколько входов, директория или glob-шаблон - отчёт по корпусу
+    return len(patterns) > 1 or any(
+        Path(p).is_dir() or glob.has_magic(p) for p in patterns
+    )
+
+
+def corpus_conflicts(args: argparse.Namespace) -> list[str]:
+    # Опции режима одного файла, которые отчёт по корпусу не поддерживает
+    conflicts = []
+    if args.incremental:
+        conflicts.append("--incremental")
+    if args.profile is not None:
+        conflicts.append("--profile")
+    if args.spill_items is not None:
+        conflicts.append("--spill-items")
+    if args.ngram != 1:
+        conflicts.append("--ngram")
+    if args.min_count != 1:
+        conflicts.append("--min-count")
+    if args.cache is not None:
+        conflicts.append("--cache")
+    return conflicts
+
+
+def mode_conflicts(args: argparse.Namespace) -> list[str]:
+    # Режимы подсчёта одного файла (--spill-items, --ngram, --incremental)
+    # взаимоисключающие, и не каждый из них умеет --workers: вместо того
+    # чтобы молча выбрать один, сообщаем о несовместимых парах
+    modes = []
+    if args.spill_items is not None:
+        modes.append("--spill-items")
+    if args.ngram != 1:
+        modes.append("--ngram")
+    if args.incremental:
+        modes.append("--incremental")
+
+    conflicts = [
+        f"{first} и {second}"
+        for i, first in enumerate(modes)
+        for second in modes[i + 1 :]
+    ]
+    # --workers поддерживают только обычный и инкрементальный подсчёт
+    for mode in ("--spill-items", "--ngram"):
+        if mode in modes and args.workers > 1:
+            conflicts.append(f"{mode} и --workers")
+    if args.min_count != 1 and args.ngram == 1:
+        conflicts.append("--min-count без --ngram")
+    return conflicts
+
+
+def summary_path_for(output_file: str) -> Path:
+    # report.csv -> report_files.csv
+    p = Path(output_file)
+    return p.with_name(f"{p.stem}_files{p.suffix or '.csv'}")
+
+
+def _analyze_file(args: tuple) -> tuple[str, int, Counter, str]:
+    # Задача для процесса-воркера: частоты слов одного файла корпуса
+    path, encoding, chunk_size = args
+    try:
+        size = Path(path).stat().st_size
+        with open(path, "r", encoding=encoding) as f:
+            return path, size, frequencies_from_file(f, chunk_size), ""
+    except (OSError, UnicodeDecodeError) as e:
+        return path, 0, Counter(), str(e)
+
+
+def generate_corpus_report(
+    inputs: list[str],
+    output_file: str = "data/lab04/report.csv",
+    summary_file: str = None,
+    encoding: str = "utf-8",
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> None:
+    # Отчёт по множеству файлов: сводка по каждому файлу пишется по мере
+    # готовности, частоты сливаются в общий словарь. В памяти - только общий
+    # словарь и не больше 2 * workers результатов в работе
+    files = expand_inputs(inputs)
+    if not files:
+        print("Ошибка: по указанным путям не найдено ни одного файла")
+        sys.exit(1)
+
+    summary_file = summary_file or summary_path_for(output_file)
+    ensure_parent_dir(summary_file)
+
+    total = Counter()
+    failed = 0
+    tasks = iter([(str(path), encoding, chunk_size) for path in files])
+
+    workers = max(workers, 1)
+
+    with open(summary_file, "w", newline="", encoding="utf-8") as summary:
+        writer = csv.writer(summary)
+        writer.writerow(SUMMARY_HEADER)
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            while True:
+                # Подкладываем задачи, пока в работе меньше 2 * workers
+                while len(pending) < 2 * workers:
+                    task = next(tasks, None)
+                    if task is None:
+                        break
+                    pending.add(pool.submit(_analyze_file, task))
+                if not pending:
+                    break
+
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, size, freq, error = future.result()
+                    if error:
+                        failed += 1
+                    total.update(freq)
+                    writer.writerow((path, size, sum(freq.values()), len(freq), error))
+
+    top_words = top_n(total, 5)
+    print(f"Файлов: {len(files)} (с ошибками: {failed})")
+    print(f"Всего слов: {sum(total.values())}")
+    print(f"Уникальных слов: {len(total)}")
+    print("Топ-5:")
+    for word, count in top_words:
+        print(f"  {word}: {count}")
+
+    write_csv(sorted_word_counts(total), output_file, header=("word", "count"))
+    print(f"\nСводка по файлам: {summary_file}")
+    print(f"Отчёт сохранён в: {output_file}")
+
+
 def main():
-    if len(sys.argv) > 1:
-        # Базовая поддержка аргументов командной строки
-        input_file = sys.argv[1]
-        output_file = sys.argv[2] if len(sys.argv) > 2 else "data/lab04/report.csv"
-        generate_report(input_file, output_file)
-    else:
-        # Использование путей по умолчанию
-        generate_report()
+    parser = argparse.ArgumentParser(description="Отчёт о частотах слов в тексте")
+    parser.add_argument(
+        "input_file",
+        nargs="?",
+        default="data/lab04/input.txt",
+        help="входной файл, директория или glob-шаблон "
+        "(по умолчанию: data/lab04/input.txt)",
+    )
+    parser.add_argument(
+        "output_file",
+        nargs="?",
+        default="data/lab04/report.csv",
+        help="CSV-отчёт (по умолчанию: data/lab04/report.csv)",
+    )
+    parser.add_argument("--encoding", default="utf-8", help="кодировка входного файла")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="количество процессов для подсчёта частот (по умолчанию: 1)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="дочитывать только новые данные, сохраняя состояние рядом с отчётом",
+    )
+    parser.add_argument(
+        "--input",
+        dest="extra_inputs",
+        action="append",
+        default=[],
+        help="дополнительный файл, директория или glob-шаблон (можно повторять)",
+    )
+    parser.add_argument(
+        "--summary",
+        default=None,
+        help="CSV-сводка по файлам корпуса (по умолчанию: <отчёт>_files.csv)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="JSON",
+        help="замерить стадии пайплайна и записать JSON в файл (без пути - в stderr)",
+    )
+    parser.add_argument(
+        "--spill-items",
+        type=int,
+        default=None,
+        metavar="N",
+        help="держать в памяти не больше N уникальных слов, остальное "
+        "сортировать через временные файлы",
+    )
+    parser.add_argument(
+        "--ngram",
+        type=int,
+        default=1,
+        metavar="N",
+        help="считать n-граммы из N слов вместо отдельных слов (по умолчанию: 1)",
+    )
+    parser.add_argument(
+        "--min-count",
+        type=int,
+        default=1,
+        help="для --ngram: отбрасывать n-граммы реже этого порога "
+        "(и прореживать их во время подсчёта)",
+    )
+    parser.add_argument(
+        "--cache",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="DIR",
+        help="брать отчёт из кэша результатов, если вход и параметры не менялись "
+        "(без пути - ~/.cache/python_labs)",
+    )
+    args = parser.parse_args()
+
+    inputs = [args.input_file] + args.extra_inputs
+    if is_corpus(inputs):
+        conflicts = corpus_conflicts(args)
+        if conflicts:
+            parser.error(
+                "с несколькими входами, директорией или glob-шаблоном нельзя "
+                f"использовать: {', '.join(conflicts)}"
+            )
+        generate_corpus_report(
+            inputs,
+            args.output_file,
+            args.summary,
+            args.encoding,
+            workers=args.workers,
+        )
+        return
+    if args.summary is not None:
+        parser.error("--summary используется только для отчёта по корпусу")
+    conflicts = mode_conflicts(args)
+    if conflicts:
+        parser.error(f"несовместимые опции: {'; '.join(conflicts)}")
+
+    profiler = Profiler().start() if args.profile is not None else None
+
+    def run() -> None:
+        generate_report(
+            args.input_file,
+            args.output_file,
+            args.encoding,
+            workers=args.workers,
+            incremental=args.incremental,
+            profiler=profiler,
+            spill_items=args.spill_items,
+            ngram=args.ngram,
+            min_count=args.min_count,
+        )
+
+    # Инкрементальный режим сам хранит состояние, профилирование должно
+    # мерить реальный прогон - для них кэш не используется
+    if args.cache is not None and not args.incremental and profiler is None:
+        if not Path(args.input_file).exists():
+            print(f"Ошибка: Файл '{args.input_file}' не найден.")
+            sys.exit(1)
+        cache = ResultCache(args.cache or None)
+        # workers и spill_items не влияют на содержимое отчёта
+        params = {
+            "encoding": args.encoding,
+            "ngram": args.ngram,
+            "min_count": args.min_count,
+        }
+        version = code_version(
+            generate_report, top_n, count_file_ngrams, SpillingCounter
+        )
+        if cache.run(
+            "generate_report", [args.input_file], args.output_file, run, params, version
+        ):
+            print(f"Отчёт взят из кэша: {args.output_file}")
+        return
+
+    run()
+    if profiler is not None:
+        profiler.stop()
+        profiler.dump(args.profile or None)
 
 
 if __name__ == "__main__":
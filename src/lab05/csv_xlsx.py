@@ -1,11 +1,32 @@
 # src/lab05/csv_xlsx.py
 import csv
+from contextlib import closing
+from itertools import chain, islice, zip_longest
 from pathlib import Path
+from typing import Iterable, Optional
+
 from openpyxl import Workbook
 from openpyxl.utils import get_column_letter
 
+try:
+    from lib.csv_parallel import iter_csv_rows, map_csv_chunks
+    from lib.io_helpers import detect_compression
+except ImportError:
+    # Импорт как src.lab05.csv_xlsx из корня проекта
+    from src.lib.csv_parallel import iter_csv_rows, map_csv_chunks
+    from src.lib.io_helpers import detect_compression
+
+
+# Сколько первых строк CSV просматривать для ширины колонок по умолчанию
+DEFAULT_WIDTH_SAMPLE = 1000
 
-def csv_to_xlsx(csv_path: str, xlsx_path: str) -> None:
+
+def csv_to_xlsx(
+    csv_path: str,
+    xlsx_path: str,
+    width_sample: Optional[int] = DEFAULT_WIDTH_SAMPLE,
+    workers: int = 1,
+) -> None:
 
     csv_file = Path(csv_path)
     xlsx_file = Path(xlsx_path)
@@ -14,45 +35,68 @@ def csv_to_xlsx(csv_path: str, xlsx_path: str) -> None:
     if not csv_file.exists():
         raise FileNotFoundError(f"CSV файл не найден: {csv_path}")
 
-    # Чтение CSV данных
-    rows = []
-    try:
-        with csv_file.open("r", encoding="utf-8") as f:
-            reader = csv.reader(f)
-            for row in reader:
-                rows.append(row)
-    except csv.Error as e:
-        raise ValueError(f"Ошибка чтения CSV: {e}")
+    # Книга в режиме write-only: строки сразу уходят в файл, в памяти
+    # не хранится весь лист. Ширины колонок в этом режиме задаются до
+    # первой строки, поэтому считаются по первым width_sample строкам
+    # (width_sample=None - по всему файлу, отдельным потоковым проходом).
+    # При workers > 1 несжатый CSV разбирается кусками в пуле процессов
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
 
-    # Валидация данных
-    if not rows:
-        raise ValueError("CSV файл пустой")
+    try:
+        # Полный проход для ширин - до основного чтения, чтобы два пула
+        # процессов не работали одновременно
+        widths = None
+        if width_sample is None:
+            widths = _file_column_widths(csv_file, workers)
 
-    # Создание Excel файла
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
+        # CSV может быть сжат (.gz, .bz2, .xz)
+        with closing(iter_csv_rows(csv_file, workers)) as reader:
+            # Валидация данных
+            first = next(reader, None)
+            if first is None:
+                raise ValueError("CSV файл пустой")
 
-    # Запись данных
-    for row in rows:
-        ws.append(row)
+            head = [first]
+            if widths is None:
+                head.extend(islice(reader, max(width_sample - 1, 0)))
+                widths = _column_widths(head)
 
-    # Настройка авто-ширины колонок
-    for col_idx, column_cells in enumerate(ws.columns, 1):
-        max_length = 0
-        column_letter = get_column_letter(col_idx)
+            # Настройка авто-ширины колонок
+            for col_idx, max_length in enumerate(widths, 1):
+                column_letter = get_column_letter(col_idx)
+                # Минимальная ширина - 8 символов
+                ws.column_dimensions[column_letter].width = max(max_length + 2, 8)
 
-        for cell in column_cells:
-            try:
-                if cell.value:
-                    max_length = max(max_length, len(str(cell.value)))
-            except:
-                pass
-
-        # Минимальная ширина - 8 символов
-        adjusted_width = max(max_length + 2, 8)
-        ws.column_dimensions[column_letter].width = adjusted_width
+            # Запись данных: сначала просмотренные строки, затем остальные
+            for row in chain(head, reader):
+                ws.append(row)
+    except csv.Error as e:
+        raise ValueError(f"Ошибка чтения CSV: {e}")
 
     # Сохранение файла
     xlsx_file.parent.mkdir(parents=True, exist_ok=True)
     wb.save(xlsx_file)
+
+
+def _file_column_widths(csv_file: Path, workers: int) -> list[int]:
+    # Ширины колонок по всему файлу; куски считаются параллельно
+    if workers <= 1 or detect_compression(csv_file) is not None:
+        with closing(iter_csv_rows(csv_file)) as rows:
+            return _column_widths(rows)
+    widths: list[int] = []
+    for chunk in map_csv_chunks(csv_file, _column_widths, workers=workers):
+        widths = [max(a, b) for a, b in zip_longest(widths, chunk, fillvalue=0)]
+    return widths
+
+
+def _column_widths(rows: Iterable[list[str]]) -> list[int]:
+    # Максимальная длина значения в каждой колонке за один проход
+    widths: list[int] = []
+    for row in rows:
+        if len(row) > len(widths):
+            widths.extend([0] * (len(row) - len(widths)))
+        for i, value in enumerate(row):
+            if len(value) > widths[i]:
+                widths[i] = len(value)
+    return widths
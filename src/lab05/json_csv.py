@@ -1,11 +1,58 @@
 # src/lab05/json_csv.py
 import json
 import csv
+import os
+from contextlib import closing
+from itertools import chain, islice
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Iterator, Optional
 
+try:
+    from lib.csv_parallel import iter_csv_rows, map_csv_chunks, read_csv_header
+    from lib.csv_types import (
+        DEFAULT_SAMPLE_ROWS,
+        infer_schema,
+        load_schema,
+        make_converters,
+        save_schema,
+    )
+    from lib.io_helpers import detect_compression, open_file, write_csv
+    from lib.json_stream import (
+        NotAnArrayError,
+        encode_json_items,
+        iter_json_array,
+        json_array_delimiters,
+        write_json_array,
+    )
+    from lib.where import compile_where, row_getter
+except ImportError:
+    # Импорт как src.lab05.json_csv из корня проекта
+    from src.lib.csv_parallel import iter_csv_rows, map_csv_chunks, read_csv_header
+    from src.lib.csv_types import (
+        DEFAULT_SAMPLE_ROWS,
+        infer_schema,
+        load_schema,
+        make_converters,
+        save_schema,
+    )
+    from src.lib.io_helpers import detect_compression, open_file, write_csv
+    from src.lib.json_stream import (
+        NotAnArrayError,
+        encode_json_items,
+        iter_json_array,
+        json_array_delimiters,
+        write_json_array,
+    )
+    from src.lib.where import compile_where, row_getter
 
-def json_to_csv(json_path: str, csv_path: str) -> None:
+
+def json_to_csv(
+    json_path: str,
+    csv_path: str,
+    compresslevel: Optional[int] = None,
+    columns: Optional[List[str]] = None,
+    where: Optional[str] = None,
+) -> None:
 
     json_file = Path(json_path)
     csv_file = Path(csv_path)
@@ -14,47 +61,104 @@ def json_to_csv(json_path: str, csv_path: str) -> None:
     if not json_file.exists():
         raise FileNotFoundError(f"JSON файл не найден: {json_path}")
 
-    # Чтение JSON
-    try:
-        with json_file.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-    except json.JSONDecodeError as e:
-        raise ValueError(f"Ошибка парсинга JSON: {e}")
+    # Условие --where разбирается один раз, до чтения файла
+    predicate = compile_where(where) if where else None
 
-    # Валидация данных
-    if not data:
-        raise ValueError("Пустой JSON или неподдерживаемая структура")
+    if columns is None:
+        # Первый проход: потоковая проверка элементов и сбор ключей
+        # (только у элементов, прошедших условие).
+        # Входной и выходной файлы могут быть сжаты (.gz, .bz2, .xz)
+        all_keys = set()
+        count = 0
+        matched = 0
+        for item in _iter_items(json_file):
+            if not isinstance(item, dict):
+                raise ValueError("Все элементы JSON должны быть словарями")
+            count += 1
+            if predicate is None or predicate(item):
+                matched += 1
+                all_keys.update(item.keys())
+
+        # Валидация данных
+        if not count:
+            raise ValueError("Пустой JSON или неподдерживаемая структура")
+        if not matched:
+            # Колонки берутся из подошедших элементов - без них CSV
+            # не из чего составить даже заголовок
+            raise ValueError(f"Нет записей, подходящих под условие: {where}")
+
+        # Получение всех уникальных ключей (порядок - алфавитный)
+        fieldnames = sorted(all_keys)
+    else:
+        # Колонки заданы - первый проход не нужен, проверка элементов
+        # идёт прямо во время записи
+        fieldnames = list(columns)
+
+    # Запись CSV вторым проходом: в памяти только один объект
+    write_csv(
+        _csv_rows(json_file, fieldnames, predicate),
+        csv_file,
+        header=tuple(fieldnames),
+        compresslevel=compresslevel,
+    )
 
-    if not isinstance(data, list):
-        raise ValueError("JSON должен содержать список объектов")
 
-    if not all(isinstance(item, dict) for item in data):
-        raise ValueError("Все элементы JSON должны быть словарями")
+def _csv_rows(
+    json_file: Path, fieldnames: List[str], predicate: Optional[Callable]
+) -> Iterator[List[str]]:
+    # Строки CSV из элементов JSON: в строки переводятся только значения
+    # выбранных колонок у элементов, прошедших условие
+    count = 0
+    for item in _iter_items(json_file):
+        if not isinstance(item, dict):
+            raise ValueError("Все элементы JSON должны быть словарями")
+        count += 1
+        if predicate is not None and not predicate(item):
+            continue
+        # Отсутствующие поля и None - пустые строки
+        yield ["" if v is None else str(v) for v in map(item.get, fieldnames)]
 
-    # Получение всех уникальных ключей (порядок - алфавитный)
-    all_keys = set()
-    for item in data:
-        all_keys.update(item.keys())
-    fieldnames = sorted(all_keys)
+    # Валидация данных
+    if not count:
+        raise ValueError("Пустой JSON или неподдерживаемая структура")
 
-    # Запись CSV
-    csv_file.parent.mkdir(parents=True, exist_ok=True)
 
-    with csv_file.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
+def _iter_items(json_file: Path) -> Iterator[Any]:
+    # Элементы JSON-массива по одному, с ошибками в формате json_to_csv
+    try:
+        with open_file(json_file, "r", encoding="utf-8") as f:
+            yield from iter_json_array(f)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Ошибка парсинга JSON: {e}")
+    except NotAnArrayError as e:
+        if not e.value:
+            raise ValueError("Пустой JSON или неподдерживаемая структура")
+        raise ValueError("JSON должен содержать список объектов")
 
-        for row in data:
-            # Заполняем отсутствующие поля пустыми строками
-            complete_row = {key: row.get(key, "") for key in fieldnames}
-            # Конвертируем все значения в строки
-            complete_row = {
-                k: str(v) if v is not None else "" for k, v in complete_row.items()
-            }
-            writer.writerow(complete_row)
 
+def csv_to_json(
+    csv_path: str,
+    json_path: str,
+    compresslevel: Optional[int] = None,
+    compact: bool = False,
+    workers: int = 1,
+    columns: Optional[List[str]] = None,
+    where: Optional[str] = None,
+    infer_types: bool = False,
+    sample_rows: int = DEFAULT_SAMPLE_ROWS,
+    schema_file: Optional[str] = None,
+) -> None:
+    """
+    Потоковая конвертация CSV в JSON-массив объектов.
 
-def csv_to_json(csv_path: str, json_path: str) -> None:
+    По умолчанию все значения - строки. С infer_types тип каждой колонки
+    (bool, int, float, date, null, str) выбирается по первым sample_rows
+    строкам, и дальше значения колонки разбираются одним выбранным
+    преобразованием; значения, не подошедшие под тип, разбираются
+    отдельно. schema_file - файл схемы (JSON с типами колонок): если он
+    есть и подходит к заголовку, выборка не читается, иначе схема
+    выводится и сохраняется в него (schema_file включает infer_types).
+    """
 
     csv_file = Path(csv_path)
     json_file = Path(json_path)
@@ -63,28 +167,199 @@ def csv_to_json(csv_path: str, json_path: str) -> None:
     if not csv_file.exists():
         raise FileNotFoundError(f"CSV файл не найден: {csv_path}")
 
-    # Чтение CSV
-    rows = []
+    # Строки читаются и пишутся потоково: JSON-массив выводится по одной
+    # записи, в памяти - только текущая строка. Пишем во временный файл,
+    # чтобы при ошибке в середине CSV не оставить обрезанный JSON
+    json_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = json_file.with_name(json_file.name + ".tmp")
+    indent = None if compact else 2
     try:
-        with csv_file.open("r", encoding="utf-8") as f:
+        types = None
+        if infer_types or schema_file is not None:
+            types = _column_types(csv_file, sample_rows, schema_file)
+
+        with open_file(
+            tmp,
+            "w",
+            encoding="utf-8",
+            compression=detect_compression(json_file, "w"),
+            compresslevel=compresslevel,
+        ) as out:
+            # Несжатый CSV при workers > 1 разбирается кусками параллельно
+            if workers > 1 and detect_compression(csv_file) is None:
+                _write_json_parallel(
+                    csv_file, out, indent, workers, columns, where, types
+                )
+            else:
+                _write_json(csv_file, out, indent, columns, where, types)
+        os.replace(tmp, json_file)
+
+    except csv.Error as e:
+        raise ValueError(f"Ошибка чтения CSV: {e}")
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _column_types(
+    csv_file: Path, sample_rows: int, schema_file: Optional[str]
+) -> Optional[List[str]]:
+    # Типы колонок из файла схемы или по выборке первых строк
+    # (None для пустого файла - ошибку выдаст основной проход)
+    with closing(iter_csv_rows(csv_file)) as rows:
+        header = next(rows, None)
+        if header is None:
+            return None
+        if schema_file is not None:
+            types = load_schema(schema_file, header)
+            if types is not None:
+                return types
+        types = infer_schema(islice(rows, sample_rows), header)
+    if schema_file is not None:
+        save_schema(schema_file, header, types)
+    return types
+
+
+def _write_json(
+    csv_file: Path,
+    out,
+    indent: Optional[int],
+    columns: Optional[List[str]] = None,
+    where: Optional[str] = None,
+    types: Optional[List[str]] = None,
+) -> None:
+    with open_file(csv_file, "r", newline="", encoding="utf-8") as f:
+        if columns is None and where is None and types is None:
             reader = csv.DictReader(f)
 
             # Проверка наличия заголовка
             if reader.fieldnames is None:
                 raise ValueError("CSV файл не содержит заголовка")
 
-            for row in reader:
-                rows.append(row)
+            # Валидация данных
+            first = next(reader, None)
+            if first is None:
+                raise ValueError("CSV файл пустой или содержит только заголовок")
 
-    except csv.Error as e:
-        raise ValueError(f"Ошибка чтения CSV: {e}")
+            write_json_array(chain([first], reader), out, indent=indent)
+            return
+
+        # С выборкой колонок, условием или типами строки читаются списками,
+        # словарь строится только из выбранных колонок прошедших строк
+        reader = csv.reader(f)
+        header = next(reader, None)
+
+        # Проверка наличия заголовка
+        if header is None:
+            raise ValueError("CSV файл не содержит заголовка")
+
+        stats = {"rows": 0}
+        write_json_array(
+            _select_records(reader, header, columns, where, stats, types),
+            out,
+            indent=indent,
+        )
+
+        # Валидация данных (строки, не прошедшие условие, тоже считаются)
+        if not stats["rows"]:
+            raise ValueError("CSV файл пустой или содержит только заголовок")
+
+
+def _select_records(
+    rows: Iterator[List[str]],
+    header: List[str],
+    columns: Optional[List[str]],
+    where: Optional[str],
+    stats: Dict[str, int],
+    types: Optional[List[str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    # Строки csv.reader -> словари выбранных колонок для строк, прошедших
+    # условие. Условие и выборка работают по индексам колонок, значения
+    # при заданных types разбираются преобразованием своей колонки
+    predicate = compile_where(where, header) if where else None
+    columns = list(columns) if columns is not None else header
+    getter = row_getter(header, columns)
+    converters = None
+    if types is not None:
+        by_name = dict(zip(header, make_converters(types)))
+        converters = [by_name[name] for name in columns]
+    width = len(header)
+    for row in rows:
+        # Пустые строки пропускаются, как в csv.DictReader
+        if not row:
+            continue
+        stats["rows"] += 1
+        if len(row) < width:
+            # Недостающие значения - None, как в csv.DictReader
+            row = row + [None] * (width - len(row))
+        if predicate is None or predicate(row):
+            values = getter(row)
+            if converters is not None:
+                values = [convert(v) for convert, v in zip(converters, values)]
+            yield dict(zip(columns, values))
+
+
+def _write_json_parallel(
+    csv_file: Path,
+    out,
+    indent: Optional[int],
+    workers: int,
+    columns: Optional[List[str]] = None,
+    where: Optional[str] = None,
+    types: Optional[List[str]] = None,
+) -> None:
+    # Каждый кусок CSV кодируется в JSON в своём процессе, здесь
+    # готовые фрагменты только склеиваются по порядку
+    header, start = read_csv_header(csv_file)
+
+    # Проверка наличия заголовка
+    if header is None:
+        raise ValueError("CSV файл не содержит заголовка")
+
+    if columns is None and where is None and types is None:
+        fieldnames, args = header, (indent,)
+    else:
+        # Воркеры получают строки списками и сами применяют выборку
+        # (условие передаётся строкой и компилируется в каждом процессе)
+        row_getter(header, columns or header)
+        if where:
+            compile_where(where, header)
+        fieldnames, args = None, (indent, header, columns, where, types)
+
+    sep, open_tok, close_tok = json_array_delimiters(indent)
+    rows = count = 0
+    for chunk_rows, chunk_count, text in map_csv_chunks(
+        csv_file,
+        _chunk_to_json,
+        args,
+        workers=workers,
+        start=start,
+        fieldnames=fieldnames,
+    ):
+        rows += chunk_rows
+        if chunk_count:
+            out.write(sep if count else open_tok)
+            out.write(text)
+            count += chunk_count
 
     # Валидация данных
     if not rows:
         raise ValueError("CSV файл пустой или содержит только заголовок")
+    out.write(close_tok if count else "[]")
 
-    # Запись JSON
-    json_file.parent.mkdir(parents=True, exist_ok=True)
 
-    with json_file.open("w", encoding="utf-8") as f:
-        json.dump(rows, f, ensure_ascii=False, indent=2)
+def _chunk_to_json(
+    records: Iterator,
+    indent: Optional[int],
+    header: Optional[List[str]] = None,
+    columns: Optional[List[str]] = None,
+    where: Optional[str] = None,
+    types: Optional[List[str]] = None,
+) -> tuple[int, int, str]:
+    # Задача для воркера: записи куска -> (число строк, число элементов,
+    # фрагмент тела массива)
+    stats = {"rows": 0}
+    if header is not None:
+        records = _select_records(records, header, columns, where, stats, types)
+    items = list(encode_json_items(records, indent))
+    rows = stats["rows"] if header is not None else len(items)
+    return rows, len(items), json_array_delimiters(indent)[0].join(items)
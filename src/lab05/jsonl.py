@@ -0,0 +1,209 @@
+# src/lab05/jsonl.py
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, Optional
+
+try:
+    from lib.io_helpers import detect_compression, open_file, split_line_ranges
+except ImportError:
+    # Импорт как src.lab05.jsonl из корня проекта
+    from src.lib.io_helpers import detect_compression, open_file, split_line_ranges
+
+
+def _iter_range_records(path: str, start: int, end: Optional[int]) -> Iterator[dict]:
+    # Записи JSON Lines из диапазона байтов [start, end) несжатого файла
+    # (end=None - весь файл, в том числе сжатый)
+    if end is None:
+        f = open_file(path, "rb")
+    else:
+        f = open(path, "rb")
+        f.seek(start)
+    with f:
+        offset = start
+        for line in f:
+            if end is not None and offset >= end:
+                break
+            line_offset = offset
+            offset += len(line)
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                raise ValueError(f"Ошибка парсинга JSON (байт {line_offset}): {e}")
+            if not isinstance(record, dict):
+                raise ValueError("Все элементы JSON должны быть словарями")
+            yield record
+
+
+def _chunk_fields(args: tuple) -> tuple[set, int]:
+    # Задача для воркера: ключи и число записей одного диапазона
+    path, start, end = args
+    keys = set()
+    count = 0
+    for record in _iter_range_records(path, start, end):
+        keys.update(record.keys())
+        count += 1
+    return keys, count
+
+
+def _chunk_to_csv(args: tuple) -> None:
+    # Задача для воркера: строки CSV (без заголовка) одного диапазона
+    path, start, end, fieldnames, part_path = args
+    with open(part_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        for record in _iter_range_records(path, start, end):
+            writer.writerow(
+                {
+                    key: str(value) if value is not None else ""
+                    for key, value in ((k, record.get(k, "")) for k in fieldnames)
+                }
+            )
+
+
+def _ranges(path: Path, workers: int) -> list[tuple[int, Optional[int]]]:
+    # Сжатый файл нельзя делить по байтам - он читается одним куском
+    if workers <= 1 or detect_compression(path) is not None:
+        return [(0, None)]
+    return split_line_ranges(path, workers) or [(0, None)]
+
+
+def jsonl_to_csv(
+    jsonl_path: str,
+    csv_path: str,
+    workers: int = 1,
+    compresslevel: Optional[int] = None,
+) -> None:
+    """
+    Конвертация JSON Lines (по объекту на строку) в CSV.
+
+    Файл делится по переводам строк на диапазоны, которые обрабатываются
+    в пуле из workers процессов: сначала каждый диапазон собирает свои
+    ключи (объединение - колонки CSV в алфавитном порядке, как в
+    json_to_csv), затем пишет свои строки во временный файл. Части
+    склеиваются в исходном порядке.
+    """
+    jsonl_file = Path(jsonl_path)
+    csv_file = Path(csv_path)
+
+    # Проверка существования файла
+    if not jsonl_file.exists():
+        raise FileNotFoundError(f"JSONL файл не найден: {jsonl_path}")
+
+    tmp = csv_file.with_name(csv_file.name + ".tmp")
+    ranges = _ranges(jsonl_file, workers)
+    tasks = [(str(jsonl_file), start, end) for start, end in ranges]
+
+    # Один диапазон обрабатывается в текущем процессе, без пула
+    pool = ProcessPoolExecutor(max_workers=len(tasks)) if len(tasks) > 1 else None
+    run = pool.map if pool is not None else map
+    try:
+        # Первый проход: поля по каждому диапазону, затем их объединение
+        all_keys = set()
+        count = 0
+        for keys, chunk_count in run(_chunk_fields, tasks):
+            all_keys |= keys
+            count += chunk_count
+
+        if not count:
+            raise ValueError("JSONL файл не содержит записей")
+        fieldnames = sorted(all_keys)
+
+        # Второй проход: каждый диапазон пишет свою часть CSV
+        csv_file.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=csv_file.parent) as tmp_dir:
+            parts = [
+                os.path.join(tmp_dir, f"part_{i:05d}.csv") for i in range(len(tasks))
+            ]
+            list(
+                run(
+                    _chunk_to_csv,
+                    [task + (fieldnames, part) for task, part in zip(tasks, parts)],
+                )
+            )
+
+            # Склейка частей по порядку после заголовка
+            header = io.StringIO()
+            csv.DictWriter(header, fieldnames=fieldnames).writeheader()
+            # Пишем во временный файл и подменяем результат только после
+            # успешной склейки - прежний CSV не заменится обрезанным
+            with open_file(
+                tmp,
+                "wb",
+                compression=detect_compression(csv_file, "w"),
+                compresslevel=compresslevel,
+            ) as out:
+                out.write(header.getvalue().encode("utf-8"))
+                for part in parts:
+                    with open(part, "rb") as f:
+                        shutil.copyfileobj(f, out, 1 << 20)
+            os.replace(tmp, csv_file)
+    finally:
+        tmp.unlink(missing_ok=True)
+        if pool is not None:
+            pool.shutdown()
+
+
+def csv_to_jsonl(
+    csv_path: str, jsonl_path: str, compresslevel: Optional[int] = None
+) -> None:
+    """Потоковая конвертация CSV в JSON Lines: по объекту на строку"""
+    csv_file = Path(csv_path)
+    jsonl_file = Path(jsonl_path)
+
+    # Проверка существования файла
+    if not csv_file.exists():
+        raise FileNotFoundError(f"CSV файл не найден: {csv_path}")
+
+    jsonl_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = jsonl_file.with_name(jsonl_file.name + ".tmp")
+    try:
+        with open_file(csv_file, "r", newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+
+            # Проверка наличия заголовка
+            if reader.fieldnames is None:
+                raise ValueError("CSV файл не содержит заголовка")
+
+            first = next(reader, None)
+            if first is None:
+                raise ValueError("CSV файл пустой или содержит только заголовок")
+
+            with open_file(
+                tmp,
+                "w",
+                encoding="utf-8",
+                compression=detect_compression(jsonl_file, "w"),
+                compresslevel=compresslevel,
+            ) as out:
+                out.write(json.dumps(first, ensure_ascii=False) + "\n")
+                for row in reader:
+                    out.write(json.dumps(row, ensure_ascii=False) + "\n")
+        os.replace(tmp, jsonl_file)
+
+    except csv.Error as e:
+        raise ValueError(f"Ошибка чтения CSV: {e}")
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def jsonl_to_xlsx(jsonl_path: str, xlsx_path: str, workers: int = 1) -> None:
+    """Конвертация JSON Lines в XLSX через промежуточный CSV"""
+    # openpyxl нужен только здесь - импортируем его лениво
+    try:
+        from lab05.csv_xlsx import csv_to_xlsx
+    except ImportError:
+        from src.lab05.csv_xlsx import csv_to_xlsx
+
+    xlsx_file = Path(xlsx_path)
+    xlsx_file.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=xlsx_file.parent) as tmp_dir:
+        tmp_csv = os.path.join(tmp_dir, "data.csv")
+        jsonl_to_csv(jsonl_path, tmp_csv, workers)
+        csv_to_xlsx(tmp_csv, xlsx_path)
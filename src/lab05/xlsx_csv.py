@@ -0,0 +1,194 @@
+# src/lab05/xlsx_csv.py
+import datetime
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from openpyxl import load_workbook
+
+try:
+    from lib.io_helpers import detect_compression, open_file, write_csv
+    from lib.json_stream import write_json_array
+except ImportError:
+    # Импорт как src.lab05.xlsx_csv из корня проекта
+    from src.lib.io_helpers import detect_compression, open_file, write_csv
+    from src.lib.json_stream import write_json_array
+
+
+def _iter_sheet_rows(xlsx_file: Path, sheet: Optional[str]) -> Iterator[tuple]:
+    # Строки листа по одной. Книга открывается в режиме read-only: ячейки
+    # читаются из XML лениво, и в памяти не хранится весь лист
+    wb = load_workbook(xlsx_file, read_only=True, data_only=True)
+    try:
+        if sheet is None:
+            ws = wb.worksheets[0]
+        elif sheet in wb.sheetnames:
+            ws = wb[sheet]
+        else:
+            raise ValueError(f"Лист не найден: {sheet}")
+        for row in ws.iter_rows(values_only=True):
+            # Полностью пустые строки (часто - хвост листа) пропускаем
+            if any(value is not None for value in row):
+                yield row
+    finally:
+        # В режиме read-only книга держит файл открытым до close()
+        wb.close()
+
+
+def _iso(value: Any) -> str:
+    # Excel хранит дату как дату-время: дата без времени (полночь)
+    # пишется как дата, а не как "...T00:00:00"
+    if isinstance(value, datetime.datetime) and value.time() == datetime.time(0):
+        return value.date().isoformat()
+    return value.isoformat()
+
+
+def _cell_text(value: Any) -> str:
+    # Значение ячейки -> строка CSV
+    if value is None:
+        return ""
+    if isinstance(value, (datetime.date, datetime.time)):
+        return _iso(value)
+    return str(value)
+
+
+def _cell_json(value: Any) -> Any:
+    # Значение ячейки -> значение JSON (числа и bool остаются как есть)
+    if isinstance(value, (datetime.date, datetime.time)):
+        return _iso(value)
+    if isinstance(value, datetime.timedelta):
+        return str(value)
+    return value
+
+
+def _open_rows(xlsx_path: str, sheet: Optional[str]) -> tuple[list[str], Iterator]:
+    # Заголовок (первая непустая строка) и итератор остальных строк
+    xlsx_file = Path(xlsx_path)
+
+    # Проверка существования файла
+    if not xlsx_file.exists():
+        raise FileNotFoundError(f"XLSX файл не найден: {xlsx_path}")
+
+    rows = _iter_sheet_rows(xlsx_file, sheet)
+    first = next(rows, None)
+    if first is None:
+        raise ValueError("Лист XLSX пустой")
+    return [_cell_text(value) for value in first], rows
+
+
+def xlsx_to_csv(
+    xlsx_path: str,
+    csv_path: str,
+    sheet: Optional[str] = None,
+    compresslevel: Optional[int] = None,
+) -> None:
+    """
+    Потоковая конвертация листа XLSX в CSV (sheet=None - первый лист).
+    Строки короче заголовка дополняются пустыми значениями, длиннее -
+    обрезаются по заголовку.
+    """
+    header, rows = _open_rows(xlsx_path, sheet)
+    width = len(header)
+    write_csv(
+        (
+            [_cell_text(value) for value in row[:width]] + [""] * (width - len(row))
+            for row in rows
+        ),
+        csv_path,
+        header=tuple(header),
+        compresslevel=compresslevel,
+    )
+
+
+def xlsx_to_json(
+    xlsx_path: str,
+    json_path: str,
+    sheet: Optional[str] = None,
+    compresslevel: Optional[int] = None,
+    compact: bool = False,
+) -> None:
+    """
+    Потоковая конвертация листа XLSX в JSON-массив объектов: ключи - первая
+    строка листа, числа, bool и пустые ячейки (null) сохраняют свой тип,
+    даты пишутся в ISO 8601.
+    """
+    header, rows = _open_rows(xlsx_path, sheet)
+    json_file = Path(json_path)
+    json_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = json_file.with_name(json_file.name + ".tmp")
+    try:
+        with open_file(
+            tmp,
+            "w",
+            encoding="utf-8",
+            compression=detect_compression(json_file, "w"),
+            compresslevel=compresslevel,
+        ) as out:
+            write_json_array(
+                (
+                    {key: _cell_json(value) for key, value in zip(header, row)}
+                    for row in rows
+                ),
+                out,
+                indent=None if compact else 2,
+            )
+        os.replace(tmp, json_file)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def sheet_names(xlsx_path: str) -> list[str]:
+    """Имена листов книги (без чтения их содержимого)"""
+    wb = load_workbook(xlsx_path, read_only=True)
+    try:
+        return list(wb.sheetnames)
+    finally:
+        wb.close()
+
+
+_CONVERTERS = {"csv": xlsx_to_csv, "json": xlsx_to_json}
+
+
+def _convert_sheet(args: tuple) -> str:
+    # Задача для воркера: один лист в отдельный файл
+    fmt, xlsx_path, sheet, output, options = args
+    _CONVERTERS[fmt](xlsx_path, output, sheet, **options)
+    return output
+
+
+def xlsx_sheets_to_dir(
+    xlsx_path: str,
+    out_dir: str,
+    fmt: str = "csv",
+    sheets: Optional[list[str]] = None,
+    workers: int = 1,
+    **options,
+) -> list[str]:
+    """
+    Конвертирует несколько листов (sheets=None - все) в файлы
+    out_dir/<лист>.<fmt>. Листы обрабатываются в пуле из workers процессов,
+    каждый процесс открывает книгу сам и читает свой лист потоково.
+
+    Returns:
+        Пути созданных файлов в порядке листов
+    """
+    if fmt not in _CONVERTERS:
+        raise ValueError(f"Неподдерживаемый формат: {fmt}")
+    if not Path(xlsx_path).exists():
+        raise FileNotFoundError(f"XLSX файл не найден: {xlsx_path}")
+    if sheets is None:
+        sheets = sheet_names(xlsx_path)
+
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    tasks = [
+        (fmt, str(xlsx_path), sheet, str(out / f"{sheet}.{fmt}"), options)
+        for sheet in sheets
+    ]
+
+    # Один лист обрабатывается в текущем процессе, без пула
+    if workers <= 1 or len(tasks) <= 1:
+        return [_convert_sheet(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        return list(pool.map(_convert_sheet, tasks))
@@ -0,0 +1,223 @@
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+# Для корректного импорта модулей из lab05 (см. cli_convert.py)
+try:
+    from src.lab05.json_csv import json_to_csv, csv_to_json
+    from src.lab05.csv_xlsx import csv_to_xlsx
+    from src.lab05.jsonl import jsonl_to_csv, csv_to_jsonl, jsonl_to_xlsx
+    from src.lab05.xlsx_csv import xlsx_to_csv, xlsx_to_json
+    from src.lib.io_helpers import COMPRESSION_EXTENSIONS
+except ImportError:
+    import sys
+
+    sys.path.insert(
+        0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    )
+    from src.lab05.json_csv import json_to_csv, csv_to_json
+    from src.lab05.csv_xlsx import csv_to_xlsx
+    from src.lab05.jsonl import jsonl_to_csv, csv_to_jsonl, jsonl_to_xlsx
+    from src.lab05.xlsx_csv import xlsx_to_csv, xlsx_to_json
+    from src.lib.io_helpers import COMPRESSION_EXTENSIONS
+
+
+# Конвертации по паре (формат входа, формат выхода)
+CONVERTERS = {
+    ("json", "csv"): json_to_csv,
+    ("csv", "json"): csv_to_json,
+    ("csv", "xlsx"): csv_to_xlsx,
+    ("jsonl", "csv"): jsonl_to_csv,
+    ("csv", "jsonl"): csv_to_jsonl,
+    ("jsonl", "xlsx"): jsonl_to_xlsx,
+    ("xlsx", "csv"): xlsx_to_csv,
+    ("xlsx", "json"): xlsx_to_json,
+}
+
+TARGET_FORMATS = sorted({target for _, target in CONVERTERS})
+
+# Расширения, которые считаются JSON Lines
+_FORMAT_ALIASES = {"ndjson": "jsonl"}
+
+
+def source_format(path: Union[str, Path]) -> Optional[str]:
+    """Формат файла по расширению (сжатие .gz/.bz2/.xz не учитывается)"""
+    path = Path(path)
+    suffixes = [s.lower() for s in path.suffixes]
+    if suffixes and suffixes[-1] in COMPRESSION_EXTENSIONS:
+        suffixes.pop()
+    if not suffixes:
+        return None
+    fmt = suffixes[-1].lstrip(".")
+    return _FORMAT_ALIASES.get(fmt, fmt)
+
+
+def _output_name(path: Path, target: str) -> str:
+    # data.csv.gz -> data.json: расширения формата и сжатия заменяются
+    name = path.name
+    if path.suffix.lower() in COMPRESSION_EXTENSIONS:
+        name = name[: -len(path.suffix)]
+    return Path(name).stem + "." + target
+
+
+def _expand(pattern: str) -> list[tuple[Path, Optional[Path]]]:
+    # Пары (файл, корень директории или None): директория обходится
+    # рекурсивно, остальное раскрывается как glob (** - рекурсивно)
+    if Path(pattern).is_dir():
+        root = Path(pattern)
+        return [(p, root) for p in sorted(root.rglob("*")) if p.is_file()]
+    matches = sorted(glob.glob(pattern, recursive=True))
+    return [(Path(match), None) for match in matches if Path(match).is_file()]
+
+
+def plan_batch(
+    patterns: Iterable[str], out_dir: Union[str, Path], target: str
+) -> tuple[list[tuple], list[tuple[str, str]]]:
+    """
+    Составляет список конвертаций в формат target.
+
+    Файлы из директорий попадают в out_dir с сохранением подкаталогов,
+    файлы по шаблонам - прямо в out_dir. Файлы из директорий, для которых
+    нет конвертации в target, пропускаются молча; указанные шаблоном -
+    попадают в ошибки.
+
+    Returns:
+        (задачи (формат входа, вход, выход), ошибки (вход, сообщение))
+    """
+    if target not in TARGET_FORMATS:
+        raise ValueError(f"Неподдерживаемый формат: {target}")
+    out_dir = Path(out_dir)
+    tasks = []
+    failures = []
+    seen_inputs = set()
+    outputs = {}
+    files = []
+    for pattern in patterns:
+        matched = _expand(pattern)
+        if not matched:
+            failures.append((pattern, "нет файлов по шаблону"))
+        files.extend(matched)
+
+    for path, root in files:
+        key = path.resolve()
+        if key in seen_inputs:
+            continue
+        seen_inputs.add(key)
+
+        fmt = source_format(path)
+        if (fmt, target) not in CONVERTERS:
+            if root is None:
+                failures.append((str(path), f"нет конвертации {fmt} -> {target}"))
+            continue
+
+        rel = path.parent.relative_to(root) if root is not None else Path()
+        output = out_dir / rel / _output_name(path, target)
+        if output in outputs:
+            failures.append(
+                (str(path), f"выходной файл {output} совпадает с {outputs[output]}")
+            )
+            continue
+        outputs[output] = path
+        tasks.append((fmt, str(path), str(output)))
+    return tasks, failures
+
+
+def _is_up_to_date(input_file: str, output_file: str) -> bool:
+    # Выход новее входа - конвертация не нужна
+    try:
+        return os.stat(output_file).st_mtime_ns >= os.stat(input_file).st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+def _convert_one(task: tuple) -> tuple[str, Optional[str], int]:
+    # Задача для воркера: одна конвертация. Ошибка не прерывает пакет,
+    # а возвращается как сообщение
+    fmt, target, input_file, output_file = task
+    try:
+        size = os.path.getsize(input_file)
+        Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+        CONVERTERS[(fmt, target)](input_file, output_file)
+        error = None
+    except Exception as e:
+        size = 0
+        error = f"{type(e).__name__}: {e}"
+    return input_file, error, size
+
+
+def run_batch(
+    patterns: Iterable[str],
+    out_dir: Union[str, Path],
+    target: str,
+    workers: Optional[int] = None,
+    force: bool = False,
+) -> dict:
+    """
+    Пакетная конвертация файлов и директорий patterns в формат target
+    в пуле из workers процессов (None - по числу ядер). Интерпретатор и
+    библиотеки (в т.ч. openpyxl) загружаются один раз на процесс, а не на файл.
+
+    Файлы, выход которых новее входа, пропускаются (если не force).
+    Ошибка в одном файле не останавливает остальные.
+
+    Returns:
+        Словарь: converted, skipped, failed, bytes, seconds и
+        failures - список (файл, сообщение)
+    """
+    started = time.perf_counter()
+    tasks, failures = plan_batch(patterns, out_dir, target)
+
+    todo = []
+    skipped = 0
+    for fmt, input_file, output_file in tasks:
+        if not force and _is_up_to_date(input_file, output_file):
+            skipped += 1
+        else:
+            todo.append((fmt, target, input_file, output_file))
+
+    workers = workers or os.cpu_count() or 1
+    converted = 0
+    total_bytes = 0
+    if workers > 1 and len(todo) > 1:
+        # Мелкие файлы отдаются воркерам пачками, чтобы не платить
+        # за передачу каждой задачи между процессами
+        chunksize = max(1, len(todo) // (workers * 8))
+        with ProcessPoolExecutor(max_workers=min(workers, len(todo))) as pool:
+            results = list(pool.map(_convert_one, todo, chunksize=chunksize))
+    else:
+        results = [_convert_one(task) for task in todo]
+
+    for input_file, error, size in results:
+        if error is None:
+            converted += 1
+            total_bytes += size
+        else:
+            failures.append((input_file, error))
+
+    return {
+        "converted": converted,
+        "skipped": skipped,
+        "failed": len(failures),
+        "bytes": total_bytes,
+        "seconds": time.perf_counter() - started,
+        "failures": failures,
+    }
+
+
+def format_summary(stats: dict) -> str:
+    """Итог пакетной конвертации: счётчики, пропускная способность, ошибки"""
+    seconds = max(stats["seconds"], 1e-9)
+    lines = [
+        f"Сконвертировано: {stats['converted']}, "
+        f"пропущено (актуальны): {stats['skipped']}, ошибок: {stats['failed']}",
+        f"Время: {stats['seconds']:.2f} с, "
+        f"{stats['converted'] / seconds:.1f} файлов/с, "
+        f"{stats['bytes'] / seconds / (1 << 20):.2f} МиБ/с",
+    ]
+    if stats["failures"]:
+        lines.append("Ошибки:")
+        lines.extend(f"  {path}: {message}" for path, message in stats["failures"])
+    return "\n".join(lines)
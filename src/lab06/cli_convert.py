@@ -7,6 +7,12 @@ try:
     # Если запускаем из корня проекта python_labs/
     from src.lab05.json_csv import json_to_csv, csv_to_json
     from src.lab05.csv_xlsx import csv_to_xlsx
+    from src.lab05.jsonl import jsonl_to_csv, csv_to_jsonl, jsonl_to_xlsx
+    from src.lab05.xlsx_csv import xlsx_to_csv, xlsx_to_json, xlsx_sheets_to_dir
+    from src.lib.cache import ResultCache, code_version, file_digest
+    from src.lib.csv_types import DEFAULT_SAMPLE_ROWS, schema_path
+    from src.lab06.batch import TARGET_FORMATS, format_summary, run_batch
+    from src.lib.where import parse_columns
 except ImportError:
     # Если запускаем из директории src/lab06/
     import sys
@@ -18,18 +24,102 @@ except ImportError:
     )
     from src.lab05.json_csv import json_to_csv, csv_to_json
     from src.lab05.csv_xlsx import csv_to_xlsx
+    from src.lab05.jsonl import jsonl_to_csv, csv_to_jsonl, jsonl_to_xlsx
+    from src.lab05.xlsx_csv import xlsx_to_csv, xlsx_to_json, xlsx_sheets_to_dir
+    from src.lib.cache import ResultCache, code_version, file_digest
+    from src.lib.csv_types import DEFAULT_SAMPLE_ROWS, schema_path
+    from src.lab06.batch import TARGET_FORMATS, format_summary, run_batch
+    from src.lib.where import parse_columns
+
+
+def run_conversion(
+    func, input_file: str, output_file: str, cache_dir=None, **options
+) -> None:
+    """
+    Запускает конвертацию func(input_file, output_file, **options), при
+    заданном cache_dir ("" - директория по умолчанию) - через кэш результатов
+    """
+    if cache_dir is None:
+        func(input_file, output_file, **options)
+        return
+
+    if not Path(input_file).exists():
+        # Сообщение об ошибке - то же, что выдала бы сама конвертация
+        func(input_file, output_file, **options)
+    # Число процессов не влияет на результат и в ключ кэша не входит
+    params = {k: v for k, v in options.items() if k != "workers"}
+    schema_file = options.get("schema_file")
+    if schema_file is not None:
+        if not Path(schema_file).exists():
+            # Схема будет выведена и сохранена самой конвертацией - этот
+            # побочный эффект из кэша не восстановить
+            func(input_file, output_file, **options)
+            return
+        # Результат зависит от содержимого схемы, а не только от её пути
+        params["schema_digest"] = file_digest(schema_file)
+
+    cache = ResultCache(cache_dir or None)
+    hit = cache.run(
+        func.__name__,
+        [input_file],
+        output_file,
+        lambda: func(input_file, output_file, **options),
+        params=params,
+        version=code_version(func),
+    )
+    if hit:
+        print("  Результат взят из кэша")
+
+
+def add_cache_argument(subparser) -> None:
+    subparser.add_argument(
+        "--cache",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="DIR",
+        help="кэш результатов по содержимому входа (без пути - ~/.cache/python_labs)",
+    )
+
+
+def cache_command(action: str, cache_dir: str = None) -> None:
+    """Реализация команды cache - статистика и очистка кэша результатов"""
+    cache = ResultCache(cache_dir)
+    if action == "purge":
+        cache.purge()
+        print(f"Кэш очищен: {cache.cache_dir}")
+        return
+
+    stats = cache.stats()
+    total = stats["hits"] + stats["misses"]
+    ratio = stats["hits"] / total if total else 0.0
+    print(f"Кэш: {cache.cache_dir}")
+    print(f"  Попаданий: {stats['hits']}, промахов: {stats['misses']} ({ratio:.0%})")
+    print(
+        f"  Объектов: {stats['entries']}, "
+        f"размер: {stats['bytes']} из {stats['max_bytes']} байт"
+    )
 
 
 def main():
     """Основная функция CLI для конвертации данных"""
     parser = argparse.ArgumentParser(
-        description="Конвертер данных между форматами JSON, CSV и XLSX",
+        description="Конвертер данных между форматами JSON, JSON Lines, CSV и XLSX",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Примеры использования (относительно корня проекта python_labs/):
   python -m src.lab06.cli_convert json2csv --in data/samples/people.json --out data/out/people.csv
   python -m src.lab06.cli_convert csv2json --in data/samples/people.csv --out data/out/people.json
   python -m src.lab06.cli_convert csv2xlsx --in data/samples/cities.csv --out data/out/cities.xlsx
+  python -m src.lab06.cli_convert json2csv --in data/samples/people.json --out data/out/people.csv --cache
+  python -m src.lab06.cli_convert csv2json --in data/samples/people.csv --out data/out/adults.json --columns name,age --where "age >= 25"
+  python -m src.lab06.cli_convert csv2json --in data/samples/people.csv --out data/out/people.json --infer-types --schema
+  python -m src.lab06.cli_convert csv2json --in data/out/big.csv --out data/out/big.json --workers 8
+  python -m src.lab06.cli_convert jsonl2csv --in data/out/events.jsonl --out data/out/events.csv --workers 4
+  python -m src.lab06.cli_convert xlsx2csv --in data/out/cities.xlsx --out data/out/cities.csv --sheet Sheet1
+  python -m src.lab06.cli_convert xlsx2json --in data/out/report.xlsx --out data/out/report --all-sheets --workers 4
+  python -m src.lab06.cli_convert batch --in data/incoming --in "data/extra/*.json" --out data/out/csv --to csv --workers 8
+  python -m src.lab06.cli_convert cache stats
   
 Аргументы:
   --in     Входной файл (обязательный)
@@ -69,6 +159,32 @@ def main():
         required=True,
         help="путь для сохранения JSON файла",
     )
+    csv2json_parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="компактный JSON без отступов и переводов строк",
+    )
+    csv2json_parser.add_argument(
+        "--infer-types",
+        action="store_true",
+        help="определять типы колонок (bool, int, float, date, null) вместо строк",
+    )
+    csv2json_parser.add_argument(
+        "--sample-rows",
+        type=int,
+        default=DEFAULT_SAMPLE_ROWS,
+        metavar="N",
+        help=f"строк для определения типов (по умолчанию: {DEFAULT_SAMPLE_ROWS})",
+    )
+    csv2json_parser.add_argument(
+        "--schema",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="FILE",
+        help="файл схемы типов: читается, если подходит, иначе создаётся "
+        "(без пути - <вход>.schema.json; включает --infer-types)",
+    )
 
     # Команда csv2xlsx
     csv2xlsx_parser = subparsers.add_parser(
@@ -83,6 +199,170 @@ def main():
         required=True,
         help="путь для сохранения XLSX файла",
     )
+    csv2xlsx_parser.add_argument(
+        "--width-sample",
+        type=int,
+        default=1000,
+        metavar="N",
+        help="считать ширину колонок по первым N строкам (0 - по всему файлу)",
+    )
+
+    # Команды для JSON Lines (по объекту JSON на строку)
+    jsonl2csv_parser = subparsers.add_parser(
+        "jsonl2csv", help="конвертировать JSON Lines (NDJSON) в CSV формат"
+    )
+    csv2jsonl_parser = subparsers.add_parser(
+        "csv2jsonl", help="конвертировать CSV файл в JSON Lines (NDJSON)"
+    )
+    jsonl2xlsx_parser = subparsers.add_parser(
+        "jsonl2xlsx", help="конвертировать JSON Lines (NDJSON) в XLSX формат"
+    )
+    for jsonl_parser, src_name, dst_name in (
+        (jsonl2csv_parser, "JSONL", "CSV"),
+        (csv2jsonl_parser, "CSV", "JSONL"),
+        (jsonl2xlsx_parser, "JSONL", "XLSX"),
+    ):
+        jsonl_parser.add_argument(
+            "--in",
+            dest="input_file",
+            required=True,
+            help=f"путь к входному {src_name} файлу",
+        )
+        jsonl_parser.add_argument(
+            "--out",
+            dest="output_file",
+            required=True,
+            help=f"путь для сохранения {dst_name} файла",
+        )
+    for jsonl_parser in (jsonl2csv_parser, jsonl2xlsx_parser):
+        jsonl_parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="количество процессов для обработки кусков файла (по умолчанию: 1)",
+        )
+
+    # Команды для XLSX -> CSV / JSON (книга читается в режиме read-only)
+    xlsx2csv_parser = subparsers.add_parser(
+        "xlsx2csv", help="конвертировать лист(ы) XLSX (Excel) в CSV формат"
+    )
+    xlsx2json_parser = subparsers.add_parser(
+        "xlsx2json", help="конвертировать лист(ы) XLSX (Excel) в JSON формат"
+    )
+    for xlsx_parser, dst_name in ((xlsx2csv_parser, "CSV"), (xlsx2json_parser, "JSON")):
+        xlsx_parser.add_argument(
+            "--in", dest="input_file", required=True, help="путь к входному XLSX файлу"
+        )
+        xlsx_parser.add_argument(
+            "--out",
+            dest="output_file",
+            required=True,
+            help=f"путь для сохранения {dst_name} файла "
+            "(директория, если листов несколько)",
+        )
+        xlsx_parser.add_argument(
+            "--sheet",
+            dest="sheets",
+            action="append",
+            metavar="NAME",
+            help="имя листа (можно несколько раз; по умолчанию - первый лист)",
+        )
+        xlsx_parser.add_argument(
+            "--all-sheets",
+            action="store_true",
+            help="конвертировать все листы, каждый в свой файл в директории --out",
+        )
+        xlsx_parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="количество процессов для обработки листов (по умолчанию: 1)",
+        )
+    xlsx2json_parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="компактный JSON без отступов и переводов строк",
+    )
+
+    for select_parser in (json2csv_parser, csv2json_parser):
+        select_parser.add_argument(
+            "--columns",
+            type=parse_columns,
+            default=None,
+            metavar="A,B,...",
+            help="оставить только эти колонки (в указанном порядке)",
+        )
+        select_parser.add_argument(
+            "--where",
+            default=None,
+            metavar="EXPR",
+            help="оставить только строки по условию, "
+            'например: "age >= 18 and city = Moscow"',
+        )
+
+    for csv_parser in (csv2json_parser, csv2xlsx_parser):
+        csv_parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="количество процессов для разбора кусков CSV (по умолчанию: 1)",
+        )
+
+    for conversion_parser in (
+        json2csv_parser,
+        csv2json_parser,
+        csv2xlsx_parser,
+        jsonl2csv_parser,
+        csv2jsonl_parser,
+        jsonl2xlsx_parser,
+        xlsx2csv_parser,
+        xlsx2json_parser,
+    ):
+        add_cache_argument(conversion_parser)
+
+    # Команда batch - много файлов за один запуск
+    batch_parser = subparsers.add_parser(
+        "batch", help="пакетная конвертация директорий и шаблонов файлов"
+    )
+    batch_parser.add_argument(
+        "--in",
+        dest="inputs",
+        action="append",
+        required=True,
+        metavar="PATH",
+        help="директория (обходится рекурсивно) или шаблон файлов, например "
+        '"data/*.json" (можно несколько раз)',
+    )
+    batch_parser.add_argument(
+        "--out", dest="output_dir", required=True, help="директория для результатов"
+    )
+    batch_parser.add_argument(
+        "--to",
+        dest="target",
+        required=True,
+        choices=TARGET_FORMATS,
+        help="формат результата",
+    )
+    batch_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="количество процессов (по умолчанию: по числу ядер)",
+    )
+    batch_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="конвертировать и файлы, результат которых новее входа",
+    )
+
+    # Команда cache
+    cache_parser = subparsers.add_parser(
+        "cache", help="статистика и очистка кэша результатов"
+    )
+    cache_parser.add_argument("action", choices=("stats", "purge"))
+    cache_parser.add_argument(
+        "--dir", dest="cache_dir", default=None, help="директория кэша"
+    )
 
     args = parser.parse_args()
 
@@ -101,7 +381,14 @@ def main():
             output_path = Path(args.output_file)
             output_path.parent.mkdir(parents=True, exist_ok=True)
 
-            json_to_csv(args.input_file, args.output_file)
+            run_conversion(
+                json_to_csv,
+                args.input_file,
+                args.output_file,
+                args.cache,
+                columns=args.columns,
+                where=args.where,
+            )
             print("✓ Конвертация успешно завершена!")
 
         elif args.command == "csv2json":
@@ -113,7 +400,23 @@ def main():
             output_path = Path(args.output_file)
             output_path.parent.mkdir(parents=True, exist_ok=True)
 
-            csv_to_json(args.input_file, args.output_file)
+            run_conversion(
+                csv_to_json,
+                args.input_file,
+                args.output_file,
+                args.cache,
+                compact=args.compact,
+                workers=args.workers,
+                columns=args.columns,
+                where=args.where,
+                infer_types=args.infer_types,
+                sample_rows=args.sample_rows,
+                schema_file=(
+                    str(schema_path(args.input_file))
+                    if args.schema == ""
+                    else args.schema
+                ),
+            )
             print("✓ Конвертация успешно завершена!")
 
         elif args.command == "csv2xlsx":
@@ -125,9 +428,81 @@ def main():
             output_path = Path(args.output_file)
             output_path.parent.mkdir(parents=True, exist_ok=True)
 
-            csv_to_xlsx(args.input_file, args.output_file)
+            run_conversion(
+                csv_to_xlsx,
+                args.input_file,
+                args.output_file,
+                args.cache,
+                width_sample=args.width_sample or None,
+                workers=args.workers,
+            )
+            print("✓ Конвертация успешно завершена!")
+
+        elif args.command in ("jsonl2csv", "csv2jsonl", "jsonl2xlsx"):
+            func, title = {
+                "jsonl2csv": (jsonl_to_csv, "JSONL в CSV"),
+                "csv2jsonl": (csv_to_jsonl, "CSV в JSONL"),
+                "jsonl2xlsx": (jsonl_to_xlsx, "JSONL в XLSX"),
+            }[args.command]
+            print(f"Конвертация {title}:")
+            print(f"  Входной файл: {args.input_file}")
+            print(f"  Выходной файл: {args.output_file}")
+
+            options = {"workers": args.workers} if hasattr(args, "workers") else {}
+            run_conversion(
+                func, args.input_file, args.output_file, args.cache, **options
+            )
             print("✓ Конвертация успешно завершена!")
 
+        elif args.command in ("xlsx2csv", "xlsx2json"):
+            fmt = args.command[len("xlsx2") :]
+            print(f"Конвертация XLSX в {fmt.upper()}:")
+            print(f"  Входной файл: {args.input_file}")
+            print(f"  Выходной файл: {args.output_file}")
+
+            options = {"compact": args.compact} if fmt == "json" else {}
+            if args.all_sheets or len(args.sheets or []) > 1:
+                # Несколько листов - по файлу на лист, без кэша
+                outputs = xlsx_sheets_to_dir(
+                    args.input_file,
+                    args.output_file,
+                    fmt,
+                    sheets=None if args.all_sheets else args.sheets,
+                    workers=args.workers,
+                    **options,
+                )
+                for output in outputs:
+                    print(f"  Создан файл: {output}")
+            else:
+                run_conversion(
+                    xlsx_to_csv if fmt == "csv" else xlsx_to_json,
+                    args.input_file,
+                    args.output_file,
+                    args.cache,
+                    sheet=args.sheets[0] if args.sheets else None,
+                    **options,
+                )
+            print("✓ Конвертация успешно завершена!")
+
+        elif args.command == "batch":
+            print(f"Пакетная конвертация в {args.target.upper()}:")
+            print(f"  Выходная директория: {args.output_dir}")
+
+            stats = run_batch(
+                args.inputs,
+                args.output_dir,
+                args.target,
+                workers=args.workers,
+                force=args.force,
+            )
+            print(format_summary(stats))
+            if stats["failed"]:
+                sys.exit(1)
+            print("✓ Конвертация успешно завершена!")
+
+        elif args.command == "cache":
+            cache_command(args.action, args.cache_dir)
+
         else:
             parser.print_help()
             sys.exit(1)
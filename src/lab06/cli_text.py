@@ -1,8 +1,31 @@
 import argparse
+import codecs
+import io
+import mmap
+import os
+import stat
 import sys
 from pathlib import Path
 from collections import Counter
-import re
+
+# Для корректного импорта модулей из lib
+try:
+    # Если запускаем из корня проекта python_labs/
+    from src.lib.text import iter_tokens, count_freq_parallel, top_n as select_top
+    from src.lib.sketches import sketch_file
+    from src.lib.profiling import Profiler, profiled_frequencies
+    from src.lib.ngrams import count_file_ngrams
+    from src.lib.index import InvertedIndex, compact_index, update_index
+except ImportError:
+    # Если запускаем из директории src/lab06/
+    sys.path.insert(
+        0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    )
+    from src.lib.text import iter_tokens, count_freq_parallel, top_n as select_top
+    from src.lib.sketches import sketch_file
+    from src.lib.profiling import Profiler, profiled_frequencies
+    from src.lib.ngrams import count_file_ngrams
+    from src.lib.index import InvertedIndex, compact_index, update_index
 
 
 def read_text_file(filepath: str) -> str:
@@ -18,10 +41,102 @@ def read_text_file(filepath: str) -> str:
         raise IOError(f"Ошибка чтения файла: {e}")
 
 
+# Размер буфера для записи в stdout в команде cat
+CAT_BUFFER_SIZE = 1 << 20
+
+
+def _sendfile(src, out, size: int) -> bool:
+    """
+    Копирует файл в out через os.sendfile (без копирования в память процесса).
+    Возвращает False, если out не поддерживает sendfile и ничего не записано.
+    """
+    try:
+        out_fd = out.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return False
+
+    offset = 0
+    while offset < size:
+        try:
+            sent = os.sendfile(out_fd, src.fileno(), offset, size - offset)
+        except (AttributeError, OSError):
+            if offset == 0:
+                # sendfile недоступен для такого stdout - используем запасной путь
+                return False
+            raise
+        if sent == 0:
+            break
+        offset += sent
+    return True
+
+
+def _write_numbered(data, out) -> None:
+    """Пишет строки data с номерами, не декодируя их в str"""
+    buffer = bytearray()
+    size = len(data)
+    pos = 0
+    number = 0
+    while pos < size:
+        end = data.find(b"\n", pos)
+        if end == -1:
+            end = size
+        number += 1
+        buffer += b"%6d\t" % number
+        buffer += data[pos:end]
+        buffer += b"\n"
+        pos = end + 1
+        if len(buffer) >= CAT_BUFFER_SIZE:
+            out.write(buffer)
+            buffer.clear()
+    out.write(buffer)
+
+
+def _copy_stream(f, out, number_lines: bool) -> None:
+    # Запасной путь для каналов, FIFO, /proc и других файлов, размер которых
+    # заранее неизвестен (st_size == 0): обычное чтение блоками
+    if not number_lines:
+        while True:
+            block = f.read(CAT_BUFFER_SIZE)
+            if not block:
+                break
+            out.write(block)
+        return
+
+    buffer = bytearray()
+    for number, line in enumerate(f, 1):
+        buffer += b"%6d\t" % number
+        buffer += line
+        if not line.endswith(b"\n"):
+            buffer += b"\n"
+        if len(buffer) >= CAT_BUFFER_SIZE:
+            out.write(buffer)
+            buffer.clear()
+    out.write(buffer)
+
+
+class _TextWriter:
+    """Байтовый интерфейс над текстовым потоком (например, в тестах)"""
+
+    def __init__(self, stream) -> None:
+        self._stream = stream
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+
+    def write(self, data) -> None:
+        self._stream.write(self._decoder.decode(bytes(data)))
+
+    def flush(self) -> None:
+        self._stream.write(self._decoder.decode(b"", final=True))
+        self._stream.flush()
+
+
 def cat_command(input_file: str, number_lines: bool = False) -> None:
     """
     Реализация команды cat - вывод содержимого файла
 
+    Файл отображается в память (mmap) и пишется в stdout крупными блоками
+    байтов; без нумерации используется os.sendfile, если stdout - файл или канал.
+    Каналы, FIFO и файлы /proc (размер 0) читаются обычным чтением блоками.
+
     Args:
         input_file: путь к входному файлу
         number_lines: добавлять нумерацию строк
@@ -32,49 +147,159 @@ def cat_command(input_file: str, number_lines: bool = False) -> None:
             print(f"Ошибка: файл '{input_file}' не найден", file=sys.stderr)
             sys.exit(1)
 
-        with open(path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
+        sys.stdout.flush()
+        # Если stdout подменён текстовым потоком без .buffer, пишем через него
+        out = getattr(sys.stdout, "buffer", None)
+
+        with open(path, "rb") as f:
+            info = os.fstat(f.fileno())
+            size = info.st_size
+            if not stat.S_ISREG(info.st_mode) or size == 0:
+                if out is None:
+                    out = _TextWriter(sys.stdout)
+                _copy_stream(f, out, number_lines)
+                out.flush()
+                return
+
+            if out is not None and not number_lines and _sendfile(f, out, size):
+                return
 
-            for i, line in enumerate(lines, 1):
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if out is None:
+                    out = _TextWriter(sys.stdout)
                 if number_lines:
-                    # Убираем символ новой строки, потом добавляем обратно
-                    line_content = line.rstrip("\n")
-                    print(f"{i:6d}\t{line_content}")
+                    _write_numbered(data, out)
                 else:
-                    print(line, end="")
+                    for start in range(0, size, CAT_BUFFER_SIZE):
+                        out.write(data[start : start + CAT_BUFFER_SIZE])
+                out.flush()
 
     except Exception as e:
         print(f"Ошибка при выполнении cat: {e}", file=sys.stderr)
         sys.exit(1)
 
 
-def stats_command(input_file: str, top_n: int = 5) -> None:
+def approx_stats_command(
+    path: Path, top_n: int = 5, workers: int = 1, capacity: int = None
+) -> None:
+    """
+    Приближённая статистика с фиксированной памятью: топ слов
+    (Space-Saving + Count-Min Sketch) и число уникальных слов (HyperLogLog)
+
+    Args:
+        path: путь к входному файлу
+        top_n: количество топ-слов для вывода
+        workers: количество процессов для подсчета
+        capacity: количество счетчиков (по умолчанию max(10 * top_n, 100))
+    """
+    if capacity is None:
+        capacity = max(10 * top_n, 100)
+
+    sketch = sketch_file(path, workers, capacity=capacity)
+    if not sketch.total:
+        print("Файл не содержит слов для анализа")
+        return
+
+    guaranteed = {word for word, _ in sketch.top.guaranteed(top_n)}
+    unique = sketch.unique
+
+    print(f"Всего слов: {sketch.total}")
+    print(
+        f"Уникальных слов: ~{unique.count()} "
+        f"(±{unique.relative_error() * 100:.1f}%)"
+    )
+    print(f"\nТоп-{top_n} самых частых слов (приближенно):")
+    print("-" * 30)
+
+    # Обе сводки дают верхние оценки частоты, берём меньшую и
+    # переупорядочиваем кандидатов по уточнённым оценкам
+    candidates = [(word, sketch.estimate(word)) for word, _ in sketch.top.top(capacity)]
+    candidates.sort(key=lambda kv: (-kv[1], kv[0]))
+
+    for word, count in candidates[:top_n]:
+        lower = sketch.top.estimate(word) - sketch.top.error(word)
+        percentage = (count / sketch.total) * 100
+        mark = "" if word in guaranteed else " ?"
+        print(f"{word:<20} {count:>6} (>={lower}, {percentage:.2f}%){mark}")
+
+
+def stats_command(
+    input_file: str,
+    top_n: int = 5,
+    workers: int = 1,
+    approx: bool = False,
+    capacity: int = None,
+    profiler: Profiler = None,
+    ngram: int = 1,
+    min_count: int = 1,
+) -> None:
     """
     Реализация команды stats - анализ частот слов
 
     Args:
         input_file: путь к входному файлу
         top_n: количество топ-слов для вывода
+        workers: количество процессов для подсчета частот
+        approx: приближённый подсчет с ограниченной памятью
+        capacity: количество счетчиков для приближённого подсчета
+        profiler: профилировщик стадий (см. lib/profiling.py)
+        ngram: считать n-граммы из ngram слов вместо отдельных слов
+        min_count: порог частоты для n-грамм (с прореживанием при подсчете)
     """
+    stages = profiler or Profiler(trace_memory=False)
     try:
-        text = read_text_file(input_file)
+        path = Path(input_file)
+        if not path.exists():
+            raise FileNotFoundError(f"Файл не найден: {input_file}")
 
-        # Очистка текста и подсчет слов (функции из lab03)
-        words = re.findall(r"\b[a-zA-Zа-яА-ЯёЁ]+\b", text.lower())
+        if approx:
+            with stages.stage("approx_stats") as st:
+                approx_stats_command(path, top_n, workers, capacity)
+            st.bytes += path.stat().st_size
+            return
+
+        if ngram > 1:
+            # Потоковый подсчет n-грамм по ID слов (lib/ngrams.py)
+            with stages.stage("count_ngrams") as st:
+                with open(path, "r", encoding="utf-8") as f:
+                    counter = count_file_ngrams(f, ngram, min_count=min_count)
+                word_counts = counter.to_counter()
+            st.tokens += counter.total
+        elif workers > 1:
+            # Параллельный подсчет по диапазонам файла
+            with stages.stage("count_freq_parallel") as st:
+                word_counts = Counter(count_freq_parallel(path, workers))
+            st.bytes += path.stat().st_size
+            st.tokens += sum(word_counts.values())
+        elif profiler is not None:
+            # Пошаговый подсчет с замером каждой стадии
+            with open(path, "r", encoding="utf-8") as f:
+                word_counts = profiled_frequencies(f, profiler)
+        else:
+            # Потоковая нормализация и подсчет слов (функции из lib/text.py)
+            with open(path, "r", encoding="utf-8") as f:
+                word_counts = Counter(iter_tokens(f))
 
-        if not words:
+        total_words = counter.total if ngram > 1 else sum(word_counts.values())
+        if not total_words:
             print("Файл не содержит слов для анализа")
             return
 
-        word_counts = Counter(words)
-
-        print(f"Всего слов: {len(words)}")
-        print(f"Уникальных слов: {len(word_counts)}")
-        print(f"\nТоп-{top_n} самых частых слов:")
+        if ngram > 1:
+            print(f"Всего {ngram}-грамм: {total_words}")
+            print(f"Уникальных {ngram}-грамм: {len(word_counts)}")
+            print(f"\nТоп-{top_n} самых частых {ngram}-грамм:")
+        else:
+            print(f"Всего слов: {total_words}")
+            print(f"Уникальных слов: {len(word_counts)}")
+            print(f"\nТоп-{top_n} самых частых слов:")
         print("-" * 30)
 
-        for word, count in word_counts.most_common(top_n):
-            percentage = (count / len(words)) * 100
+        # Порядок (-count, word) не зависит от числа процессов
+        with stages.stage("top_n"):
+            top_words = select_top(word_counts, top_n)
+        for word, count in top_words:
+            percentage = (count / total_words) * 100
             print(f"{word:<20} {count:>6} ({percentage:.2f}%)")
 
     except Exception as e:
@@ -82,15 +307,82 @@ def stats_command(input_file: str, top_n: int = 5) -> None:
         sys.exit(1)
 
 
+def index_command(inputs: list[str], index_dir: str, compact: bool = False) -> None:
+    """
+    Реализация команды index - построение или обновление индекса
+
+    Args:
+        inputs: файлы и директории для индексации
+        index_dir: директория индекса
+        compact: слить сегменты индекса в один после обновления
+    """
+    try:
+        stats = update_index(index_dir, inputs)
+        if compact:
+            compact_index(index_dir)
+        print(
+            f"Индекс {index_dir}: добавлено {stats['added']}, "
+            f"обновлено {stats['updated']}, удалено {stats['removed']}, "
+            f"без изменений {stats['unchanged']}, пропущено {stats['skipped']}"
+        )
+    except Exception as e:
+        print(f"Ошибка при выполнении index: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def search_command(
+    index_dir: str, query: str, top: int = 10, inputs: list[str] = None
+) -> None:
+    """
+    Реализация команды search - поиск по индексу
+
+    Args:
+        index_dir: директория индекса
+        query: запрос (слова - AND, OR между группами, "фраза" в кавычках)
+        top: количество результатов
+        inputs: если заданы, индекс сначала обновляется по этим путям
+    """
+    try:
+        if inputs:
+            update_index(index_dir, inputs)
+        with InvertedIndex(index_dir) as index:
+            results = index.search(query, top)
+        if not results:
+            print("Ничего не найдено")
+            return
+        for path, score in results:
+            print(f"{score:8.3f}  {path}")
+    except Exception as e:
+        print(f"Ошибка при выполнении search: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def stats_conflicts(args: argparse.Namespace) -> list[str]:
+    # Комбинации опций stats, при которых часть из них была бы молча
+    # проигнорирована и статистика посчиталась бы не та, что запрошена
+    conflicts = []
+    if args.approx and args.ngram != 1:
+        conflicts.append("--approx и --ngram")
+    if args.ngram != 1 and args.workers > 1:
+        conflicts.append("--ngram и --workers")
+    if args.min_count != 1 and args.ngram == 1:
+        conflicts.append("--min-count без --ngram")
+    if args.capacity is not None and not args.approx:
+        conflicts.append("--capacity без --approx")
+    return conflicts
+
+
 def main():
     """Основная функция CLI для работы с текстом"""
     parser = argparse.ArgumentParser(
-        description="CLI-утилиты для работы с текстом: cat и stats",
+        description="CLI-утилиты для работы с текстом: cat, stats, index и search",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Примеры использования:
   %(prog)s cat --input data/samples/people.csv -n
   %(prog)s stats --input data/samples/example.txt --top 10
+  %(prog)s index --input data/samples --index data/out/index
+  %(prog)s search --index data/out/index '"привет мир" OR кот'
   
 Пути относительно корня проекта python_labs/
         """,
@@ -129,6 +421,85 @@ def main():
         default=5,
         help="количество топ-слов для вывода (по умолчанию: 5)",
     )
+    stats_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="количество процессов для подсчета частот (по умолчанию: 1)",
+    )
+    stats_parser.add_argument(
+        "--approx",
+        action="store_true",
+        help="приближенная статистика с фиксированной памятью",
+    )
+    stats_parser.add_argument(
+        "--capacity",
+        type=int,
+        default=None,
+        help="количество счетчиков для --approx (по умолчанию: max(10*top, 100))",
+    )
+    stats_parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="JSON",
+        help="замерить стадии и записать JSON в файл (без пути - в stderr)",
+    )
+
+    stats_parser.add_argument(
+        "--ngram",
+        type=int,
+        default=1,
+        metavar="N",
+        help="считать n-граммы из N слов (по умолчанию: 1 - отдельные слова)",
+    )
+    stats_parser.add_argument(
+        "--min-count",
+        type=int,
+        default=1,
+        help="для --ngram: отбрасывать n-граммы реже этого порога",
+    )
+
+    # Подкоманда index
+    index_parser = subparsers.add_parser(
+        "index", help="построить или обновить поисковый индекс"
+    )
+    index_parser.add_argument(
+        "--input",
+        dest="inputs",
+        action="append",
+        required=True,
+        help="файл или директория для индексации (можно повторять)",
+    )
+    index_parser.add_argument(
+        "--index", dest="index_dir", required=True, help="директория индекса"
+    )
+    index_parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="слить сегменты и выбросить удаленные документы",
+    )
+
+    # Подкоманда search
+    search_parser = subparsers.add_parser("search", help="поиск по индексу")
+    search_parser.add_argument("query", help='запрос: слова, OR, "фраза"')
+    search_parser.add_argument(
+        "--index", dest="index_dir", required=True, help="директория индекса"
+    )
+    search_parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="количество результатов (по умолчанию: 10)",
+    )
+    search_parser.add_argument(
+        "--input",
+        dest="inputs",
+        action="append",
+        default=None,
+        help="перед поиском обновить индекс по этому пути (можно повторять)",
+    )
 
     args = parser.parse_args()
 
@@ -136,7 +507,27 @@ def main():
         if args.command == "cat":
             cat_command(args.input_file, args.number)
         elif args.command == "stats":
-            stats_command(args.input_file, args.top)
+            conflicts = stats_conflicts(args)
+            if conflicts:
+                stats_parser.error(f"несовместимые опции: {'; '.join(conflicts)}")
+            profiler = Profiler().start() if args.profile is not None else None
+            stats_command(
+                args.input_file,
+                args.top,
+                args.workers,
+                args.approx,
+                args.capacity,
+                profiler,
+                args.ngram,
+                args.min_count,
+            )
+            if profiler is not None:
+                profiler.stop()
+                profiler.dump(args.profile or None)
+        elif args.command == "index":
+            index_command(args.inputs, args.index_dir, args.compact)
+        elif args.command == "search":
+            search_command(args.index_dir, args.query, args.top, args.inputs)
         else:
             parser.print_help()
             sys.exit(1)
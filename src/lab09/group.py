@@ -4,19 +4,22 @@ from typing import List, Optional
 from datetime import datetime
 
 from lab08.models import Student
+from lib.csv_parallel import iter_csv_dicts
 
 
 class Group:
     """Класс для работы с хранилищем студентов в CSV-формате"""
     
-    def __init__(self, storage_path: str):
+    def __init__(self, storage_path: str, workers: int = 1):
         """
         Инициализация группы с указанием пути к CSV-файлу
         
         Args:
             storage_path: Путь к CSV-файлу с данными студентов
+            workers: Количество процессов для чтения большого CSV
         """
         self.path = Path(storage_path)
+        self.workers = workers
         self._ensure_storage_exists()
     
     def _ensure_storage_exists(self) -> None:
@@ -29,13 +32,9 @@ class Group:
     
     def _read_all(self) -> List[dict]:
         """Читает все записи из CSV файла"""
-        students_data = []
-        
         try:
-            with open(self.path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    students_data.append(row)
+            # При workers > 1 файл разбирается кусками в пуле процессов
+            students_data = list(iter_csv_dicts(self.path, self.workers))
         except FileNotFoundError:
             self._ensure_storage_exists()
             return []
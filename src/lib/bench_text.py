@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Бенчмарки lib.text (normalize, tokenize, count_freq, top_n) на синтетических
+корпусах с фиксированным seed, сохранение результатов в JSON и сравнение
+с базовой линией.
+
+Примеры (из корня проекта):
+  python -m src.lib.bench_text run --sizes 1KB,1MB,100MB --out data/out/bench.json
+  python -m src.lib.bench_text compare data/out/bench_base.json data/out/bench.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+try:
+    from .text import count_freq, iter_text_chunks, normalize, tokenize, top_n
+except ImportError:
+    # Модуль запущен как скрипт или импортирован как top-level
+    from text import count_freq, iter_text_chunks, normalize, tokenize, top_n
+
+# Версия формата JSON с результатами
+RESULTS_VERSION = 2
+
+# Измеряемые функции и единица их пропускной способности
+BENCHMARKS = {
+    "normalize": "bytes",
+    "tokenize": "tokens",
+    "count_freq": "tokens",
+    "top_n": "words",
+}
+
+ALPHABETS = {
+    "ru": "абвгдеёжзийклмнопрстуфхцчшщъыьэюя",
+    "en": "abcdefghijklmnopqrstuvwxyz",
+}
+
+LANGUAGES = ("ru", "en", "mixed")
+
+_SIZE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMG]?B?)\s*$", re.IGNORECASE)
+_SIZE_UNITS = {"": 1, "B": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+
+def parse_size(text: str) -> int:
+    """'1KB' -> 1024, '100MB' -> 104857600, '1GB' -> 1073741824"""
+    match = _SIZE_RE.match(text)
+    if not match:
+        raise ValueError(f"Некорректный размер: {text}")
+    number, unit = match.groups()
+    return int(float(number) * _SIZE_UNITS[unit.upper().rstrip("B")])
+
+
+def format_size(size: int) -> str:
+    for unit, factor in (("GB", 1 << 30), ("MB", 1 << 20), ("KB", 1 << 10)):
+        if size >= factor and size % factor == 0:
+            return f"{size // factor}{unit}"
+    return f"{size}B"
+
+
+def _make_vocabulary(rng: random.Random, alphabet: str, size: int) -> list[str]:
+    # Псевдослова длиной 1-12 символов, часть - через дефис, с заглавными и ё
+    words = []
+    for _ in range(size):
+        word = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 12)))
+        if rng.random() < 0.05:
+            word += "-" + "".join(
+                rng.choice(alphabet) for _ in range(rng.randint(2, 6))
+            )
+        if rng.random() < 0.1:
+            word = word.capitalize()
+        words.append(word)
+    return words
+
+
+def generate_corpus(
+    path: Path, language: str, size: int, seed: int = 42, vocab_size: int = 20000
+) -> Path:
+    """
+    Записывает в path синтетический корпус около size байт (utf-8).
+
+    Слова выбираются по закону Ципфа из фиксированного словаря, между ними -
+    пробелы, знаки препинания и переводы строк. Один и тот же seed всегда
+    даёт один и тот же файл.
+    """
+    if language not in LANGUAGES:
+        raise ValueError(f"Неизвестный язык корпуса: {language}")
+
+    rng = random.Random(f"{language}:{seed}")
+    if language == "mixed":
+        half = vocab_size // 2
+        words = _make_vocabulary(rng, ALPHABETS["ru"], half)
+        words += _make_vocabulary(rng, ALPHABETS["en"], vocab_size - half)
+        rng.shuffle(words)
+    else:
+        words = _make_vocabulary(rng, ALPHABETS[language], vocab_size)
+    weights = [1 / rank for rank in range(1, len(words) + 1)]
+    separators = [" "] * 12 + [", ", ". ", "! ", "\n", "\t", " - ", "  "]
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        while written < size:
+            batch = rng.choices(words, weights, k=1000)
+            seps = rng.choices(separators, k=1000)
+            block = "".join(w + s for w, s in zip(batch, seps)).encode("utf-8")
+            block = block[: size - written]
+            # Не режем многобайтовый символ посередине
+            text = block.decode("utf-8", errors="ignore")
+            f.write(text)
+            written += len(block)
+    return path
+
+
+def corpus_path(corpus_dir: Path, language: str, size: int, seed: int) -> Path:
+    return corpus_dir / f"corpus_{language}_{format_size(size)}_seed{seed}.txt"
+
+
+def _run_once(path: Path, chunk_size: int) -> dict:
+    # Один проход по корпусу; чтение файла и слияние частот не замеряются
+    seconds = dict.fromkeys(BENCHMARKS, 0.0)
+    volume = dict.fromkeys(BENCHMARKS, 0)
+    freq = Counter()
+
+    with open(path, "r", encoding="utf-8") as f:
+        for chunk in iter_text_chunks(f, chunk_size):
+            start = time.perf_counter()
+            text = normalize(chunk)
+            seconds["normalize"] += time.perf_counter() - start
+            volume["normalize"] += len(chunk.encode("utf-8"))
+
+            start = time.perf_counter()
+            tokens = tokenize(text)
+            seconds["tokenize"] += time.perf_counter() - start
+            volume["tokenize"] += len(tokens)
+
+            start = time.perf_counter()
+            part = count_freq(tokens)
+            seconds["count_freq"] += time.perf_counter() - start
+            volume["count_freq"] += len(tokens)
+
+            freq.update(part)
+
+    start = time.perf_counter()
+    top_n(freq, 10)
+    seconds["top_n"] += time.perf_counter() - start
+    volume["top_n"] = len(freq)
+
+    return {"seconds": seconds, "volume": volume}
+
+
+def peak_memory(path: Path, chunk_size: int = 1 << 20) -> int:
+    """
+    Пик памяти (байт), выделенной за один проход по корпусу, по tracemalloc.
+    Замеряется отдельным проходом: трассировка сильно замедляет код, и
+    время с ней не сравнимо с остальными замерами.
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        _run_once(path, chunk_size)
+        return tracemalloc.get_traced_memory()[1] - base
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+def bench_corpus(
+    path: Path, repeat: int = 5, warmup: int = 1, chunk_size: int = 1 << 20
+) -> dict:
+    """Прогревы и повторы по одному корпусу; берётся медиана времени"""
+    if repeat <= 0:
+        raise ValueError("repeat должен быть положительным")
+
+    for _ in range(warmup):
+        _run_once(path, chunk_size)
+    runs = [_run_once(path, chunk_size) for _ in range(repeat)]
+
+    results = {}
+    for name, unit in BENCHMARKS.items():
+        times = [run["seconds"][name] for run in runs]
+        median = statistics.median(times)
+        volume = runs[0]["volume"][name]
+        results[name] = {
+            "unit": unit,
+            "volume": volume,
+            "median_seconds": median,
+            "min_seconds": min(times),
+            "per_second": volume / median if median else None,
+        }
+    return results
+
+
+def run_suite(
+    sizes: list[int],
+    languages: list[str],
+    *,
+    seed: int = 42,
+    repeat: int = 5,
+    warmup: int = 1,
+    corpus_dir: Optional[Path] = None,
+) -> dict:
+    """Запускает бенчмарки на всех сочетаниях размеров и языков"""
+    corpus_dir = Path(corpus_dir or Path(tempfile.gettempdir()) / "python_labs_bench")
+    cases = []
+    for language in languages:
+        for size in sizes:
+            path = corpus_path(corpus_dir, language, size, seed)
+            if not path.exists():
+                generate_corpus(path, language, size, seed)
+            name = f"{language}-{format_size(size)}"
+            print(f"  {name} ...", file=sys.stderr)
+            cases.append(
+                {
+                    "corpus": name,
+                    "language": language,
+                    "size": size,
+                    "results": bench_corpus(path, repeat, warmup),
+                    # Пик своего прохода, а не всего процесса (ru_maxrss
+                    # копился бы от случая к случаю)
+                    "peak_memory_bytes": peak_memory(path),
+                }
+            )
+
+    return {
+        "version": RESULTS_VERSION,
+        "seed": seed,
+        "repeat": repeat,
+        "warmup": warmup,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cases": cases,
+    }
+
+
+def compare_results(
+    baseline: dict, current: dict, threshold: float = 0.1
+) -> list[dict]:
+    """
+    Сравнивает пропускную способность с базовой линией.
+
+    Returns:
+        Список регрессий: случаи, где per_second упал больше чем на threshold
+    """
+    base_cases = {case["corpus"]: case for case in baseline["cases"]}
+    regressions = []
+    for case in current["cases"]:
+        base = base_cases.get(case["corpus"])
+        if base is None:
+            continue
+        for name, result in case["results"].items():
+            old = base["results"].get(name, {}).get("per_second")
+            new = result.get("per_second")
+            if not old or new is None:
+                continue
+            change = new / old - 1
+            if change < -threshold:
+                regressions.append(
+                    {
+                        "corpus": case["corpus"],
+                        "benchmark": name,
+                        "baseline": old,
+                        "current": new,
+                        "change": change,
+                    }
+                )
+    return regressions
+
+
+def print_results(results: dict) -> None:
+    print(f"{'корпус':<14} {'функция':<11} {'медиана, с':>11} {'в секунду':>14}")
+    print("-" * 53)
+    for case in results["cases"]:
+        for name, result in case["results"].items():
+            per_second = result["per_second"]
+            rate = f"{per_second:,.0f} {result['unit']}" if per_second else "-"
+            print(
+                f"{case['corpus']:<14} {name:<11} "
+                f"{result['median_seconds']:>11.4f} {rate:>14}"
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарки lib.text")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="запустить бенчмарки")
+    run_parser.add_argument(
+        "--sizes", default="1KB,1MB", help="размеры корпусов (по умолчанию: 1KB,1MB)"
+    )
+    run_parser.add_argument(
+        "--langs", default="ru,en,mixed", help="языки корпусов: ru, en, mixed"
+    )
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--warmup", type=int, default=1)
+    run_parser.add_argument(
+        "--corpus-dir", default=None, help="где хранить сгенерированные корпуса"
+    )
+    run_parser.add_argument("--out", default=None, help="JSON-файл с результатами")
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="сравнить результаты с базовой линией"
+    )
+    compare_parser.add_argument("baseline", help="JSON базовой линии")
+    compare_parser.add_argument("current", help="JSON текущего прогона")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="допустимое падение пропускной способности (по умолчанию: 0.1 = 10%%)",
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        sizes = [parse_size(s) for s in args.sizes.split(",")]
+        languages = [lang.strip() for lang in args.langs.split(",")]
+        results = run_suite(
+            sizes,
+            languages,
+            seed=args.seed,
+            repeat=args.repeat,
+            warmup=args.warmup,
+            corpus_dir=args.corpus_dir,
+        )
+        print_results(results)
+        if args.out:
+            out = Path(args.out)
+            out.parent.mkdir(parents=True, exist_ok=True)
+            out.write_text(json.dumps(results, indent=2), encoding="utf-8")
+            print(f"\nРезультаты сохранены в: {out}")
+        return 0
+
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+    current = json.loads(Path(args.current).read_text(encoding="utf-8"))
+    regressions = compare_results(baseline, current, args.threshold)
+    if not regressions:
+        print(f"Регрессий больше {args.threshold:.0%} нет")
+        return 0
+
+    print(f"Найдены регрессии (порог {args.threshold:.0%}):")
+    for item in regressions:
+        print(
+            f"  {item['corpus']:<14} {item['benchmark']:<11} "
+            f"{item['baseline']:,.0f} -> {item['current']:,.0f} ({item['change']:+.1%})"
+        )
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
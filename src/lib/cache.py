@@ -0,0 +1,276 @@
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Iterable, Optional, Union
+
+# Версия формата кэша; входит в каждый ключ
+CACHE_VERSION = 1
+
+# Директория кэша по умолчанию (можно переопределить переменной окружения)
+CACHE_DIR_ENV = "PYTHON_LABS_CACHE"
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "python_labs"
+
+# Предельный размер кэша по умолчанию
+DEFAULT_MAX_BYTES = 1 << 30
+
+_HASH_BLOCK = 1 << 20
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    """sha256 содержимого файла, читаемого блоками по 1 МиБ"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _source_root() -> Path:
+    # Корень исходников проекта (src/): учитываются только его модули,
+    # стандартная библиотека и сторонние пакеты в версию не входят
+    return Path(__file__).resolve().parent.parent
+
+
+def _module_sources(module: ModuleType, root: Path, found: dict) -> None:
+    # Исходники модуля и (транзитивно) всех модулей проекта, которые он
+    # использует: импортированных целиком или через from ... import
+    source = getattr(module, "__file__", None)
+    if not source or not source.endswith(".py"):
+        return
+    path = Path(source).resolve()
+    if path in found or root not in path.parents:
+        return
+    found[path] = module
+    for value in list(vars(module).values()):
+        if isinstance(value, ModuleType):
+            _module_sources(value, root, found)
+        else:
+            name = getattr(value, "__module__", None)
+            if isinstance(name, str) and name in sys.modules:
+                _module_sources(sys.modules[name], root, found)
+
+
+def code_sources(*objects: object) -> list[Path]:
+    """
+    Исходные файлы модулей, где определены объекты, и всех модулей
+    проекта, которые эти модули (транзитивно) импортируют
+    """
+    root = _source_root()
+    found: dict = {}
+    for obj in objects:
+        module = inspect.getmodule(obj)
+        if module is not None:
+            _module_sources(module, root, found)
+    return sorted(found)
+
+
+def code_version(*objects: object) -> str:
+    """
+    Версия кода - хеш исходных файлов (см. code_sources), от которых
+    зависит результат объектов (функций, классов).
+    """
+    h = hashlib.sha256()
+    for path in code_sources(*objects):
+        h.update(path.name.encode("utf-8"))
+        h.update(path.read_bytes())
+    return h.hexdigest()[:16]
+
+
+class ResultCache:
+    """
+    Кэш результатов, адресуемый по содержимому: ключ - хеш содержимого
+    входных файлов, имени функции, параметров и версии кода.
+
+    Результаты хранятся в cache_dir/objects, при попадании выходной файл
+    создаётся жёсткой ссылкой на объект кэша (или копией, если ссылку
+    сделать нельзя). Если выходной файл потом перезаписали на месте,
+    изменившийся объект распознаётся по размеру и mtime и считается
+    промахом. При превышении max_bytes удаляются давно не использованные
+    объекты (LRU).
+
+    Пример:
+        cache = ResultCache()
+        cache.run(
+            "json_to_csv", [src], dst, lambda: json_to_csv(src, dst),
+            version=code_version(json_to_csv),
+        )
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        link: bool = True,
+    ) -> None:
+        if cache_dir is None:
+            cache_dir = os.environ.get(CACHE_DIR_ENV) or DEFAULT_CACHE_DIR
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.link = link
+        self._index_path = self.cache_dir / "index.json"
+        self._index = self._load_index()
+
+    def _load_index(self) -> dict:
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            index = None
+        if not isinstance(index, dict) or index.get("version") != CACHE_VERSION:
+            index = {"version": CACHE_VERSION, "entries": {}, "digests": {}}
+            index["stats"] = {"hits": 0, "misses": 0}
+        return index
+
+    def _save_index(self) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self._index_path.with_name(self._index_path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, ensure_ascii=False)
+        os.replace(tmp, self._index_path)
+
+    def _object_path(self, key: str) -> Path:
+        return self.cache_dir / "objects" / key[:2] / key
+
+    def _digest(self, path: Path) -> str:
+        # Хеш входа запоминается по (пути, размеру, mtime, inode), чтобы
+        # не перечитывать большие неизменные файлы при каждом запуске
+        st = path.stat()
+        stamp = [st.st_size, st.st_mtime_ns, st.st_ino]
+        name = str(path.resolve())
+        known = self._index["digests"].get(name)
+        if known is not None and known[0] == stamp:
+            return known[1]
+        digest = file_digest(path)
+        self._index["digests"][name] = [stamp, digest]
+        return digest
+
+    def key(
+        self,
+        name: str,
+        inputs: Iterable[Union[str, Path]],
+        params: Optional[dict] = None,
+        version: str = "",
+    ) -> str:
+        """Ключ результата: функция, параметры, версия кода и входы"""
+        h = hashlib.sha256()
+        payload = {
+            "cache": CACHE_VERSION,
+            "name": name,
+            "params": params or {},
+            "version": version,
+            "inputs": [self._digest(Path(p)) for p in inputs],
+        }
+        h.update(json.dumps(payload, sort_keys=True, default=str).encode("utf-8"))
+        return h.hexdigest()
+
+    def fetch(self, key: str, output: Union[str, Path]) -> bool:
+        """Восстанавливает output из кэша; False, если результата нет"""
+        entry = self._index["entries"].get(key)
+        obj = self._object_path(key)
+        if entry is None:
+            return False
+        try:
+            st = obj.stat()
+        except FileNotFoundError:
+            st = None
+        if st is None or [st.st_size, st.st_mtime_ns] != entry["stamp"]:
+            # Объект удалён или изменён через жёсткую ссылку
+            self._index["entries"].pop(key)
+            obj.unlink(missing_ok=True)
+            return False
+
+        output = Path(output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.unlink(missing_ok=True)
+        try:
+            if not self.link:
+                raise OSError
+            os.link(obj, output)
+        except OSError:
+            # Другая файловая система или ссылки не поддерживаются
+            shutil.copyfile(obj, output)
+        entry["last_used"] = time.time()
+        return True
+
+    def store(self, key: str, output: Union[str, Path]) -> None:
+        """Кладёт готовый output в кэш и при необходимости вытесняет старое"""
+        obj = self._object_path(key)
+        obj.parent.mkdir(parents=True, exist_ok=True)
+        tmp = obj.with_name(obj.name + ".tmp")
+        shutil.copyfile(output, tmp)
+        os.replace(tmp, obj)
+        st = obj.stat()
+        self._index["entries"][key] = {
+            "size": st.st_size,
+            "stamp": [st.st_size, st.st_mtime_ns],
+            "last_used": time.time(),
+        }
+        self.evict()
+
+    def evict(self) -> int:
+        """Удаляет давно не использованные объекты сверх max_bytes"""
+        entries = self._index["entries"]
+        total = sum(entry["size"] for entry in entries.values())
+        removed = 0
+        for key in sorted(entries, key=lambda k: entries[k]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            total -= entries.pop(key)["size"]
+            self._object_path(key).unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+    def run(
+        self,
+        name: str,
+        inputs: Iterable[Union[str, Path]],
+        output: Union[str, Path],
+        compute: Callable[[], object],
+        params: Optional[dict] = None,
+        version: str = "",
+    ) -> bool:
+        """
+        Вызывает compute(), который пишет output, если результата нет в кэше.
+
+        Returns:
+            True при попадании в кэш
+        """
+        key = self.key(name, inputs, params, version)
+        stats = self._index["stats"]
+        if self.fetch(key, output):
+            stats["hits"] += 1
+            self._save_index()
+            return True
+
+        output = Path(output)
+        if output.exists() and output.stat().st_nlink > 1:
+            # Выход - ссылка на объект кэша от прошлого запуска
+            output.unlink()
+        compute()
+        stats["misses"] += 1
+        self.store(key, output)
+        self._save_index()
+        return False
+
+    def stats(self) -> dict:
+        """Попадания, промахи, число объектов и их общий размер"""
+        entries = self._index["entries"]
+        return {
+            "hits": self._index["stats"]["hits"],
+            "misses": self._index["stats"]["misses"],
+            "entries": len(entries),
+            "bytes": sum(entry["size"] for entry in entries.values()),
+            "max_bytes": self.max_bytes,
+        }
+
+    def purge(self) -> None:
+        """Полностью очищает кэш вместе со статистикой"""
+        shutil.rmtree(self.cache_dir / "objects", ignore_errors=True)
+        self._index_path.unlink(missing_ok=True)
+        self._index = self._load_index()
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+from collections import Counter
+from pathlib import Path
+from typing import Optional, Union
+
+try:
+    from .text import count_freq_parallel, last_token_boundary
+except ImportError:
+    # Модуль импортирован как top-level (src/lib добавлен в sys.path)
+    from text import count_freq_parallel, last_token_boundary
+
+# Версия формата файла состояния
+STATE_VERSION = 1
+
+# Сколько байт начала файла хешируется для проверки его идентичности
+HEAD_SIZE = 4096
+
+
+def state_path_for(report_path: Union[str, Path]) -> Path:
+    """Файл состояния рядом с отчётом: report.csv -> report.csv.state.json"""
+    p = Path(report_path)
+    return p.with_name(p.name + ".state.json")
+
+
+def file_identity(path: Union[str, Path], offset: int) -> dict:
+    """
+    Идентичность файла: устройство, inode и хеш первых min(offset, HEAD_SIZE)
+    байт. Изменение любой части означает ротацию или перезапись файла.
+    """
+    st = os.stat(path)
+    with open(path, "rb") as f:
+        head = f.read(min(offset, HEAD_SIZE))
+    return {
+        "device": st.st_dev,
+        "inode": st.st_ino,
+        "head_size": len(head),
+        "head_sha256": hashlib.sha256(head).hexdigest(),
+    }
+
+
+def load_state(state_path: Union[str, Path]) -> Optional[dict]:
+    """Читает файл состояния; None, если его нет или он повреждён"""
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+        return None
+    return state
+
+
+def save_state(state_path: Union[str, Path], state: dict) -> None:
+    """Атомарно записывает файл состояния (через временный файл)"""
+    p = Path(state_path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_name(p.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp, p)
+
+
+def _is_continuation(state: dict, input_path: Path, encoding: str) -> bool:
+    # Можно ли продолжить с сохранённого смещения
+    offset = state.get("offset", 0)
+    if state.get("encoding") != encoding:
+        return False
+    if os.path.getsize(input_path) < offset:
+        # Файл стал короче сохранённого смещения - усечение
+        return False
+    return file_identity(input_path, offset) == state.get("identity")
+
+
+def incremental_counts(
+    input_path: Union[str, Path],
+    state_path: Union[str, Path],
+    encoding: str = "utf-8",
+    workers: int = 1,
+) -> tuple[Counter, int]:
+    """
+    Частоты слов файла, который только дописывается, с учётом сохранённого
+    состояния: токенизируется только новый хвост.
+
+    В состоянии хранятся частоты всех законченных слов до последнего
+    пробельного байта; недописанное последнее слово считается отдельно
+    и в состояние не попадает. При усечении или ротации файла состояние
+    пересобирается с нуля.
+
+    Returns:
+        (частоты всех слов файла, количество заново прочитанных байт)
+    """
+    input_path = Path(input_path)
+    state = load_state(state_path)
+
+    if state is not None and _is_continuation(state, input_path, encoding):
+        offset = state["offset"]
+        freq = Counter(state["counts"])
+    else:
+        offset = 0
+        freq = Counter()
+
+    size = os.path.getsize(input_path)
+    boundary = last_token_boundary(input_path, offset, size)
+
+    # Законченные слова нового участка добавляются в состояние
+    if boundary > offset:
+        freq.update(
+            count_freq_parallel(
+                input_path, workers, encoding=encoding, start=offset, end=boundary
+            )
+        )
+
+    save_state(
+        state_path,
+        {
+            "version": STATE_VERSION,
+            "encoding": encoding,
+            "offset": boundary,
+            "identity": file_identity(input_path, boundary),
+            "counts": dict(freq),
+        },
+    )
+
+    # Хвост после последнего пробела (слово может ещё дописываться)
+    if size > boundary:
+        freq.update(
+            count_freq_parallel(input_path, 1, encoding=encoding, start=boundary)
+        )
+
+    return freq, size - offset
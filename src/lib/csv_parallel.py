@@ -0,0 +1,226 @@
+import csv
+import io
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+try:
+    from .io_helpers import detect_compression, open_file
+except ImportError:
+    # Модуль импортирован как top-level (src/lib добавлен в sys.path)
+    from io_helpers import detect_compression, open_file
+
+# Примерный размер куска файла, который разбирает один воркер
+DEFAULT_CHUNK_BYTES = 8 << 20
+
+# Блок чтения при подсчёте кавычек и поиске границы записи
+_BLOCK = 1 << 20
+
+_QUOTE = b'"'
+_NEWLINE = b"\n"
+
+
+def _count_quotes(args: tuple) -> int:
+    # Задача для воркера: число кавычек в диапазоне байтов [start, end)
+    path, start, end = args
+    count = 0
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = f.read(min(_BLOCK, remaining))
+            if not block:
+                break
+            count += block.count(_QUOTE)
+            remaining -= len(block)
+    return count
+
+
+def _record_end(f, pos: int, in_quotes: bool) -> int:
+    # Позиция сразу после первого перевода строки вне кавычек, начиная с pos
+    # (in_quotes - находится ли pos внутри поля в кавычках). По RFC 4180
+    # кавычка внутри поля удваивается, поэтому чётность числа кавычек
+    # однозначно говорит, внутри поля мы или нет
+    f.seek(pos)
+    while True:
+        block = f.read(_BLOCK)
+        if not block:
+            return pos
+        i = 0
+        while True:
+            nl = block.find(_NEWLINE, i)
+            if nl < 0:
+                in_quotes ^= block.count(_QUOTE, i) & 1
+                break
+            in_quotes ^= block.count(_QUOTE, i, nl) & 1
+            if not in_quotes:
+                return pos + nl + 1
+            i = nl + 1
+        pos += len(block)
+
+
+def read_csv_header(path: Union[str, Path]) -> tuple[Optional[list[str]], int]:
+    """
+    Первая запись несжатого CSV и позиция байта сразу после неё.
+
+    Returns:
+        (заголовок или None для пустого файла, начало данных)
+    """
+    with open(path, "rb") as f:
+        end = _record_end(f, 0, False)
+        f.seek(0)
+        head = f.read(end)
+    rows = list(csv.reader(io.StringIO(head.decode("utf-8"), newline="")))
+    return (rows[0] if rows else None), end
+
+
+def split_csv_ranges(
+    path: Union[str, Path],
+    chunk_size: int = DEFAULT_CHUNK_BYTES,
+    start: int = 0,
+    executor: Optional[Executor] = None,
+) -> list[tuple[int, int]]:
+    """
+    Делит несжатый CSV (начиная с байта start, который должен быть началом
+    записи) на диапазоны байтов [start, end) примерно по chunk_size, границы
+    которых совпадают с границами записей - в том числе когда поля
+    в кавычках содержат переводы строк.
+
+    Сначала файл режется на равные куски и в каждом считаются кавычки
+    (в executor, если он задан); чётность суммы кавычек до границы
+    говорит, попала ли она внутрь поля в кавычках. От каждой границы
+    ищется ближайший перевод строки вне кавычек.
+
+    Предполагается стандартный диалект: кавычка '"', удвоение кавычек
+    внутри полей, перевод строки \\n или \\r\\n.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size должен быть положительным")
+    path = str(path)
+    size = os.path.getsize(path)
+    if start >= size:
+        return []
+
+    cuts = list(range(start, size, chunk_size)) + [size]
+    tasks = [(path, a, b) for a, b in zip(cuts, cuts[1:])]
+    run = executor.map if executor is not None else map
+    counts = list(run(_count_quotes, tasks))
+
+    bounds = [start]
+    quotes = 0
+    with open(path, "rb") as f:
+        for (_, cut, _), count in zip(tasks[1:], counts):
+            quotes += count
+            if cut <= bounds[-1]:
+                # Предыдущая запись длиннее куска и уже перекрыла эту границу
+                continue
+            end = _record_end(f, cut, bool(quotes & 1))
+            if end > bounds[-1]:
+                bounds.append(end)
+    if bounds[-1] < size:
+        bounds.append(size)
+
+    return list(zip(bounds, bounds[1:]))
+
+
+def _read_range(
+    path: str, start: int, end: int, fieldnames: Optional[list[str]]
+) -> Iterator:
+    # Записи диапазона: списки полей или, если задан fieldnames, словари
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+    lines = io.StringIO(text, newline="")
+    if fieldnames is None:
+        return csv.reader(lines)
+    return csv.DictReader(lines, fieldnames=fieldnames)
+
+
+def _parse_range(args: tuple) -> Any:
+    # Задача для воркера: разобрать диапазон и применить к записям func
+    path, start, end, fieldnames, func, func_args = args
+    records = _read_range(path, start, end, fieldnames)
+    if func is None:
+        return list(records)
+    return func(records, *func_args)
+
+
+def _ordered_map(
+    executor: Executor, fn: Callable, tasks: Iterable, window: int
+) -> Iterator:
+    # Как executor.map, но в работе не больше window задач одновременно:
+    # готовые, но ещё не запрошенные результаты не копятся в памяти
+    tasks = iter(tasks)
+    pending = deque(executor.submit(fn, task) for task in islice(tasks, window))
+    while pending:
+        result = pending.popleft().result()
+        for task in islice(tasks, 1):
+            pending.append(executor.submit(fn, task))
+        yield result
+
+
+def map_csv_chunks(
+    path: Union[str, Path],
+    func: Optional[Callable] = None,
+    args: tuple = (),
+    workers: int = 2,
+    chunk_size: int = DEFAULT_CHUNK_BYTES,
+    start: int = 0,
+    fieldnames: Optional[list[str]] = None,
+) -> Iterator:
+    """
+    Разбирает куски несжатого CSV в пуле из workers процессов и выдаёт
+    func(records, *args) для каждого куска в порядке кусков (func=None -
+    сам список записей). records - итератор списков полей или словарей
+    по fieldnames (как у csv.DictReader). func должна быть функцией
+    верхнего уровня модуля, чтобы её можно было передать в процесс.
+
+    Одновременно в работе не больше 2 * workers кусков, поэтому память
+    зависит от chunk_size и workers, но не от размера файла.
+    """
+    path = str(path)
+    with ProcessPoolExecutor(max_workers=max(workers, 1)) as pool:
+        try:
+            ranges = split_csv_ranges(path, chunk_size, start, pool)
+            tasks = ((path, a, b, fieldnames, func, args) for a, b in ranges)
+            yield from _ordered_map(pool, _parse_range, tasks, 2 * max(workers, 1))
+        except BaseException:
+            # Ошибка или брошенный генератор - не ждём оставшиеся куски
+            pool.shutdown(cancel_futures=True)
+            raise
+
+
+def iter_csv_rows(
+    path: Union[str, Path], workers: int = 1, chunk_size: int = DEFAULT_CHUNK_BYTES
+) -> Iterator[list[str]]:
+    """
+    Строки CSV (включая заголовок) в исходном порядке, как у csv.reader.
+    При workers > 1 несжатый файл разбирается кусками параллельно
+    (см. map_csv_chunks), иначе - обычным потоковым csv.reader.
+    """
+    if workers <= 1 or detect_compression(path) is not None:
+        with open_file(path, "r", newline="", encoding="utf-8") as f:
+            yield from csv.reader(f)
+        return
+    for rows in map_csv_chunks(path, workers=workers, chunk_size=chunk_size):
+        yield from rows
+
+
+def iter_csv_dicts(
+    path: Union[str, Path], workers: int = 1, chunk_size: int = DEFAULT_CHUNK_BYTES
+) -> Iterator[dict]:
+    """Записи CSV словарями по заголовку, как у csv.DictReader"""
+    if workers <= 1 or detect_compression(path) is not None:
+        with open_file(path, "r", newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+        return
+    header, start = read_csv_header(path)
+    if not header:
+        return
+    for records in map_csv_chunks(
+        path, workers=workers, chunk_size=chunk_size, start=start, fieldnames=header
+    ):
+        yield from records
@@ -0,0 +1,204 @@
+import datetime
+import json
+import math
+import os
+import re
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional, Sequence, Union
+
+# Версия формата файла схемы
+SCHEMA_VERSION = 1
+
+# Сколько первых строк просматривать для выбора типа колонки
+DEFAULT_SAMPLE_ROWS = 1000
+
+# Типы от самого узкого к самому широкому; колонке назначается первый,
+# которому соответствуют все непустые значения выборки
+TYPES = ("bool", "int", "float", "date", "str")
+
+_INT = re.compile(r"-?(?:0|[1-9][0-9]*)")
+_FLOAT = re.compile(
+    r"-?(?:(?:0|[1-9][0-9]*)(?:\.[0-9]*)?|\.[0-9]+)(?:[eE][-+]?[0-9]+)?"
+)
+_DATE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}(?:[T ][0-9:.]+(?:Z|[-+][0-9:]+)?)?")
+_BOOLS = {"true": True, "false": False}
+
+
+def _is_bool(value: str) -> bool:
+    return value.lower() in _BOOLS
+
+
+def _is_int(value: str) -> bool:
+    # Числа с ведущими нулями (индексы, коды) остаются строками
+    return _INT.fullmatch(value) is not None
+
+
+def _is_float(value: str) -> bool:
+    # Так же без ведущих нулей в целой части
+    return _FLOAT.fullmatch(value) is not None
+
+
+def _is_date(value: str) -> bool:
+    if _DATE.fullmatch(value) is None:
+        return False
+    try:
+        datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return False
+    return True
+
+
+_CHECKS = {
+    "bool": _is_bool,
+    "int": _is_int,
+    "float": _is_float,
+    "date": _is_date,
+    "str": lambda value: True,
+}
+
+
+def infer_type(values: Iterable[str]) -> str:
+    """
+    Тип колонки по выборке значений: bool, int, float, date, str
+    или null, если все значения пустые.
+    """
+    candidates = list(TYPES)
+    seen = False
+    for value in values:
+        if not value:
+            continue
+        seen = True
+        # Отбрасываем типы, которым значение не соответствует; str
+        # подходит всегда, поэтому список не опустеет
+        candidates = [name for name in candidates if _CHECKS[name](value)]
+        if candidates == ["str"]:
+            break
+    return candidates[0] if seen else "null"
+
+
+def infer_schema(rows: Iterable[Sequence[str]], header: Sequence[str]) -> list[str]:
+    """Типы колонок header по строкам выборки (списки значений как у csv.reader)"""
+    columns: list[list[str]] = [[] for _ in header]
+    for row in rows:
+        for values, value in zip(columns, row):
+            values.append(value)
+    return [infer_type(values) for values in columns]
+
+
+def guess_value(value: Optional[str]) -> Any:
+    """
+    Значение в самом узком подходящем типе - медленный путь, только для
+    значений, не подошедших под тип своей колонки
+    """
+    if not value:
+        return None
+    if _is_bool(value):
+        return _BOOLS[value.lower()]
+    if _is_int(value):
+        return int(value)
+    if _is_float(value):
+        result = float(value)
+        return result if math.isfinite(result) else value
+    return value
+
+
+def _to_bool(value: Optional[str]) -> Any:
+    if not value:
+        return None
+    result = _BOOLS.get(value.lower())
+    return result if result is not None else guess_value(value)
+
+
+def _to_int(value: Optional[str]) -> Any:
+    # int() принимает и "1_000", " 12", "+5", "١٢" - такие значения
+    # не число колонки, а разбираются как прочие
+    if not value:
+        return None
+    if _INT.fullmatch(value) is None:
+        return guess_value(value)
+    return int(value)
+
+
+def _to_float(value: Optional[str]) -> Any:
+    if not value:
+        return None
+    if _FLOAT.fullmatch(value) is None:
+        return guess_value(value)
+    result = float(value)
+    # Переполнение ("1e999") не представимо в JSON
+    return result if math.isfinite(result) else value
+
+
+def _to_date(value: Optional[str]) -> Any:
+    # Дата остаётся строкой ISO 8601 (в JSON нет типа даты), поэтому
+    # достаточно быстрой проверки формата; остальное разбирается как прочие
+    if not value:
+        return None
+    return value if _DATE.match(value) else guess_value(value)
+
+
+def _to_str(value: Optional[str]) -> Any:
+    return value
+
+
+_CONVERTERS: dict[str, Callable[[Optional[str]], Any]] = {
+    "null": guess_value,
+    "bool": _to_bool,
+    "int": _to_int,
+    "float": _to_float,
+    "date": _to_date,
+    "str": _to_str,
+}
+
+
+def make_converters(types: Sequence[str]) -> list[Callable[[Optional[str]], Any]]:
+    """
+    Функции преобразования строки в значение для каждой колонки.
+    Пустая строка в типизированной колонке - None; значение, не
+    подошедшее под тип колонки, не теряется, а разбирается guess_value.
+    """
+    try:
+        return [_CONVERTERS[name] for name in types]
+    except KeyError as e:
+        raise ValueError(f"Неизвестный тип колонки: {e.args[0]}") from None
+
+
+def schema_path(csv_path: Union[str, Path]) -> Path:
+    """Файл схемы рядом с CSV по умолчанию: data.csv -> data.csv.schema.json"""
+    csv_path = Path(csv_path)
+    return csv_path.with_name(csv_path.name + ".schema.json")
+
+
+def load_schema(path: Union[str, Path], header: Sequence[str]) -> Optional[list[str]]:
+    """
+    Типы колонок из файла схемы; None, если файла нет, он повреждён или
+    составлен для другого заголовка
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            schema = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if not isinstance(schema, dict) or schema.get("version") != SCHEMA_VERSION:
+        return None
+    columns = schema.get("columns")
+    if not isinstance(columns, dict) or list(columns) != list(header):
+        return None
+    return list(columns.values())
+
+
+def save_schema(
+    path: Union[str, Path], header: Sequence[str], types: Sequence[str]
+) -> None:
+    """Сохраняет типы колонок (порядок колонок - как в заголовке)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(
+            {"version": SCHEMA_VERSION, "columns": dict(zip(header, types))},
+            f,
+            ensure_ascii=False,
+            indent=2,
+        )
+    os.replace(tmp, path)
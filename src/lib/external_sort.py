@@ -0,0 +1,140 @@
+import heapq
+import shutil
+import tempfile
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
+
+try:
+    from .text import freq_order
+except ImportError:
+    # Модуль импортирован как top-level (src/lib добавлен в sys.path)
+    from text import freq_order
+
+# Сколько уникальных слов держать в памяти до сброса на диск по умолчанию
+DEFAULT_MAX_ITEMS = 1_000_000
+
+
+def _write_run(path: Path, items: Iterable[tuple[str, int]]) -> None:
+    # Прогон - текстовый файл "слово<TAB>частота"; токены не содержат
+    # пробельных символов, поэтому разделитель однозначен
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.writelines(f"{word}\t{count}\n" for word, count in items)
+
+
+def _read_run(path: Path) -> Iterator[tuple[str, int]]:
+    with open(path, "r", encoding="utf-8", newline="\n") as f:
+        for line in f:
+            word, count = line.rstrip("\n").split("\t")
+            yield word, int(count)
+
+
+class SpillingCounter:
+    """
+    Счётчик частот, который сбрасывает отсортированные прогоны во временные
+    файлы, когда число уникальных слов превышает max_items, и затем собирает
+    результат k-путевым слиянием кучей.
+
+    sorted_items() выдаёт пары в том же порядке (-count, word), что и
+    top_n/sorted_word_counts, но не держит весь словарь в памяти.
+
+    Пример:
+        with SpillingCounter(max_items=100_000) as counter:
+            counter.update(iter_tokens(f))
+            for word, count in counter.sorted_items():
+                ...
+    """
+
+    def __init__(
+        self,
+        max_items: int = DEFAULT_MAX_ITEMS,
+        tmp_dir: Optional[Union[str, Path]] = None,
+    ) -> None:
+        if max_items <= 0:
+            raise ValueError("max_items должен быть положительным")
+        self.max_items = max_items
+        self.total = 0
+        self.unique: Optional[int] = None
+        self._counts: dict[str, int] = {}
+        self._tmp_root = tmp_dir
+        self._tmp: Optional[Path] = None
+        self._runs: list[Path] = []
+
+    def __enter__(self) -> "SpillingCounter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def spilled(self) -> int:
+        """Количество прогонов, сброшенных на диск"""
+        return len(self._runs)
+
+    def _new_run_path(self) -> Path:
+        if self._tmp is None:
+            self._tmp = Path(tempfile.mkdtemp(prefix="spill_", dir=self._tmp_root))
+        return self._tmp / f"run_{len(self._runs):05d}.tsv"
+
+    def update(self, tokens: Iterable[str]) -> None:
+        """Учитывает поток токенов"""
+        counts = self._counts
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+            self.total += 1
+            if len(counts) > self.max_items:
+                self._spill()
+                counts = self._counts
+
+    def _spill(self) -> None:
+        # Прогон отсортирован по слову, чтобы частичные частоты одного слова
+        # из разных прогонов можно было сложить при слиянии
+        path = self._new_run_path()
+        _write_run(path, sorted(self._counts.items()))
+        self._runs.append(path)
+        self._counts = {}
+
+    def _items_by_word(self) -> Iterator[tuple[str, int]]:
+        # Слияние прогонов по слову с суммированием частичных частот
+        sources = [_read_run(path) for path in self._runs]
+        sources.append(iter(sorted(self._counts.items())))
+        merged = heapq.merge(*sources, key=itemgetter(0))
+        for word, group in groupby(merged, key=itemgetter(0)):
+            yield word, sum(count for _, count in group)
+
+    def sorted_items(self) -> Iterator[tuple[str, int]]:
+        """Все пары (слово, частота) в порядке (-count, word)"""
+        if not self._runs:
+            self.unique = len(self._counts)
+            return iter(sorted(self._counts.items(), key=freq_order))
+
+        # Второй этап: внешняя сортировка суммарных частот по (-count, word)
+        self.unique = 0
+        batch = []
+        runs = []
+        for item in self._items_by_word():
+            self.unique += 1
+            batch.append(item)
+            if len(batch) >= self.max_items:
+                runs.append(self._write_sorted_run(batch))
+                batch = []
+        self._counts = {}
+
+        sources = [_read_run(path) for path in runs]
+        sources.append(iter(sorted(batch, key=freq_order)))
+        return heapq.merge(*sources, key=freq_order)
+
+    def _write_sorted_run(self, items: list[tuple[str, int]]) -> Path:
+        path = self._new_run_path()
+        items.sort(key=freq_order)
+        _write_run(path, items)
+        self._runs.append(path)
+        return path
+
+    def close(self) -> None:
+        """Удаляет временные файлы прогонов"""
+        if self._tmp is not None:
+            shutil.rmtree(self._tmp, ignore_errors=True)
+            self._tmp = None
+        self._runs = []
@@ -0,0 +1,484 @@
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+from array import array
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence, Union
+
+try:
+    from .text import iter_tokens, normalize, tokenize
+except ImportError:
+    # Модуль импортирован как top-level (src/lib добавлен в sys.path)
+    from text import iter_tokens, normalize, tokenize
+
+# Версия формата индекса
+INDEX_VERSION = 1
+
+META_FILE = "meta.json"
+
+# Сколько позиций копить в памяти перед сбросом сегмента на диск
+DEFAULT_FLUSH_POSITIONS = 5_000_000
+
+# Параметры ранжирования BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_QUERY_PART = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def encode_varint(value: int, out: bytearray) -> None:
+    """Дописывает неотрицательное число в out по 7 бит на байт"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varints(data: bytes) -> Iterator[int]:
+    """Последовательно декодирует все varint из data"""
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            yield value
+            value = shift = 0
+
+
+def encode_postings(postings: Iterable[tuple[int, Sequence]], out: bytearray) -> None:
+    """
+    Блок постингов одного терма: для каждого документа (по возрастанию ID)
+    разность ID с предыдущим, число вхождений и разности позиций - всё varint.
+    """
+    prev_doc = 0
+    for doc_id, positions in postings:
+        encode_varint(doc_id - prev_doc, out)
+        encode_varint(len(positions), out)
+        prev_pos = 0
+        for pos in positions:
+            encode_varint(pos - prev_pos, out)
+            prev_pos = pos
+        prev_doc = doc_id
+
+
+def decode_postings(data: bytes) -> Iterator[tuple[int, list[int]]]:
+    """Обратная к encode_postings: пары (ID документа, позиции)"""
+    values = decode_varints(data)
+    doc_id = 0
+    for delta in values:
+        doc_id += delta
+        tf = next(values)
+        positions = []
+        pos = 0
+        for _ in range(tf):
+            pos += next(values)
+            positions.append(pos)
+        yield doc_id, positions
+
+
+def parse_query(query: str) -> list[list[tuple[str, ...]]]:
+    """
+    Разбирает запрос на OR-группы из AND-условий.
+
+    Слова в группе соединяются по AND, группы разделяются словом OR, текст
+    в кавычках - фраза (слова подряд). Каждое условие - кортеж нормализованных
+    токенов; кортеж из нескольких токенов ищется как фраза.
+
+    Пример:
+        parse_query('кот "серый мир" OR собака')
+        # [[("кот",), ("серый", "мир")], [("собака",)]]
+    """
+    clauses: list[list[tuple[str, ...]]] = [[]]
+    for match in _QUERY_PART.finditer(query):
+        phrase, word = match.groups()
+        if word == "OR":
+            clauses.append([])
+            continue
+        if word == "AND":
+            continue
+        terms = tuple(tokenize(normalize(phrase if phrase is not None else word)))
+        if terms:
+            clauses[-1].append(terms)
+    return [clause for clause in clauses if clause]
+
+
+def _load_meta(index_dir: Path) -> dict:
+    try:
+        with open(index_dir / META_FILE, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        return {
+            "version": INDEX_VERSION,
+            "next_id": 0,
+            "next_segment": 0,
+            "segments": [],
+            "docs": {},
+            "deleted": [],
+        }
+    if meta.get("version") != INDEX_VERSION:
+        raise ValueError(f"Неподдерживаемая версия индекса: {meta.get('version')}")
+    return meta
+
+
+def _save_meta(index_dir: Path, meta: dict) -> None:
+    # Метаданные пишутся последними и атомарно: незавершённое обновление
+    # оставляет только лишние файлы сегментов, но не портит индекс
+    tmp = index_dir / (META_FILE + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp, index_dir / META_FILE)
+
+
+def _write_segment(
+    index_dir: Path, name: str, postings: dict[str, list[tuple[int, Sequence]]]
+) -> None:
+    # Сегмент - два файла: .post с блоками постингов и .lex со строками
+    # "терм<TAB>смещение<TAB>длина", отсортированными для бинарного поиска
+    lex_lines = []
+    offset = 0
+    with open(index_dir / f"{name}.post", "wb") as post:
+        for term in sorted(postings):
+            block = bytearray()
+            encode_postings(postings[term], block)
+            post.write(block)
+            lex_lines.append(f"{term}\t{offset}\t{len(block)}\n")
+            offset += len(block)
+    with open(index_dir / f"{name}.lex", "w", encoding="utf-8", newline="\n") as lex:
+        lex.writelines(lex_lines)
+
+
+def _iter_files(paths: Iterable[Union[str, Path]], skip: Path) -> Iterator[Path]:
+    # Файлы paths; всё, что лежит в директории skip (самого индекса, если
+    # она внутри индексируемого корня), пропускается
+    def wanted(path: Path) -> bool:
+        resolved = path.resolve()
+        return resolved != skip and skip not in resolved.parents
+
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            yield from sorted(p for p in path.rglob("*") if p.is_file() and wanted(p))
+        elif path.is_file() and wanted(path):
+            yield path
+
+
+def update_index(
+    index_dir: Union[str, Path],
+    paths: Iterable[Union[str, Path]],
+    encoding: str = "utf-8",
+    flush_positions: int = DEFAULT_FLUSH_POSITIONS,
+) -> dict[str, int]:
+    """
+    Создаёт или обновляет индекс по файлам и директориям paths.
+
+    Переиндексируются только новые и изменившиеся (по размеру и mtime)
+    файлы - их постинги пишутся в новые сегменты, а старые версии
+    помечаются удалёнными. Файлы, пропавшие с диска, тоже удаляются из
+    индекса. Файлы не в кодировке encoding и файлы самого индекса (если
+    index_dir лежит внутри индексируемой директории) пропускаются.
+
+    Returns:
+        Счётчики added, updated, removed, unchanged, skipped
+    """
+    index_dir = Path(index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+    paths = list(paths)
+    meta = _load_meta(index_dir)
+    docs = meta["docs"]
+    deleted = set(meta["deleted"])
+    stats = dict.fromkeys(("added", "updated", "removed", "unchanged", "skipped"), 0)
+
+    postings: dict[str, list[tuple[int, array]]] = {}
+    buffered = 0
+
+    def flush() -> None:
+        nonlocal postings, buffered
+        if postings:
+            name = f"seg_{meta['next_segment']:05d}"
+            _write_segment(index_dir, name, postings)
+            meta["segments"].append(name)
+            meta["next_segment"] += 1
+        postings = {}
+        buffered = 0
+
+    seen = set()
+    for path in _iter_files(paths, index_dir.resolve()):
+        key = str(path.resolve())
+        seen.add(key)
+        st = path.stat()
+        old = docs.get(key)
+        if (
+            old is not None
+            and old["size"] == st.st_size
+            and old["mtime_ns"] == st.st_mtime_ns
+        ):
+            stats["unchanged"] += 1
+            continue
+
+        doc_positions: dict[str, array] = {}
+        length = 0
+        try:
+            with open(path, "r", encoding=encoding) as f:
+                for length, token in enumerate(iter_tokens(f), 1):
+                    positions = doc_positions.get(token)
+                    if positions is None:
+                        positions = doc_positions[token] = array("I")
+                    positions.append(length - 1)
+        except UnicodeDecodeError:
+            stats["skipped"] += 1
+            continue
+
+        if old is not None:
+            deleted.add(old["id"])
+            stats["updated"] += 1
+        else:
+            stats["added"] += 1
+
+        doc_id = meta["next_id"]
+        meta["next_id"] += 1
+        docs[key] = {
+            "id": doc_id,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "length": length,
+        }
+        for token, positions in doc_positions.items():
+            postings.setdefault(token, []).append((doc_id, positions))
+        buffered += length
+        if buffered >= flush_positions:
+            flush()
+
+    # Файлы под индексируемыми путями, которых больше нет на диске
+    roots = [str(Path(p).resolve()) for p in paths]
+    for key in list(docs):
+        if key in seen:
+            continue
+        under_root = any(key == root or key.startswith(root + os.sep) for root in roots)
+        if under_root or not Path(key).exists():
+            deleted.add(docs.pop(key)["id"])
+            stats["removed"] += 1
+
+    flush()
+    meta["deleted"] = sorted(deleted)
+    _save_meta(index_dir, meta)
+    return stats
+
+
+class _Segment:
+    # Открытый сегмент: лексикон и постинги отображены в память через mmap
+
+    def __init__(self, index_dir: Path, name: str) -> None:
+        self._files = []
+        self.lex = self._map(index_dir / f"{name}.lex")
+        self.post = self._map(index_dir / f"{name}.post")
+
+    def _map(self, path: Path) -> Optional[mmap.mmap]:
+        f = open(path, "rb")
+        self._files.append(f)
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self) -> None:
+        for data in (self.lex, self.post):
+            if data is not None:
+                data.close()
+        for f in self._files:
+            f.close()
+
+    def lookup(self, term: str) -> Optional[bytes]:
+        """Блок постингов терма; бинарный поиск по строкам лексикона"""
+        lex = self.lex
+        if lex is None:
+            return None
+        key = term.encode("utf-8")
+        lo, hi = 0, len(lex)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = lex.rfind(b"\n", 0, mid) + 1
+            end = lex.find(b"\n", start)
+            line = lex[start:end].split(b"\t")
+            if line[0] == key:
+                offset, length = int(line[1]), int(line[2])
+                return self.post[offset : offset + length]
+            if line[0] < key:
+                lo = end + 1
+            else:
+                hi = start
+        return None
+
+    def iter_terms(self) -> Iterator[tuple[str, bytes]]:
+        """Все термы сегмента по порядку вместе с блоками постингов"""
+        if self.lex is None:
+            return
+        for line in iter(self.lex.readline, b""):
+            term, offset, length = line.rstrip(b"\n").split(b"\t")
+            offset, length = int(offset), int(length)
+            yield term.decode("utf-8"), self.post[offset : offset + length]
+
+
+class InvertedIndex:
+    """
+    Позиционный инвертированный индекс на диске (см. update_index).
+
+    Поиск не перечитывает файлы: лексиконы сегментов отображаются в память
+    и просматриваются бинарным поиском, декодируются только постинги термов
+    из запроса.
+
+    Пример:
+        with InvertedIndex("data/out/index") as index:
+            for path, score in index.search('"привет мир" OR кот'):
+                print(path, score)
+    """
+
+    def __init__(self, index_dir: Union[str, Path]) -> None:
+        self.index_dir = Path(index_dir)
+        if not (self.index_dir / META_FILE).exists():
+            raise FileNotFoundError(f"Индекс не найден: {index_dir}")
+        meta = _load_meta(self.index_dir)
+        self._deleted = set(meta["deleted"])
+        self._paths = {doc["id"]: path for path, doc in meta["docs"].items()}
+        self._lengths = {doc["id"]: doc["length"] for doc in meta["docs"].values()}
+        self._segments = [_Segment(self.index_dir, name) for name in meta["segments"]]
+        total = sum(self._lengths.values())
+        self._avg_length = total / len(self._lengths) if self._lengths else 0.0
+
+    def __enter__(self) -> "InvertedIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for segment in self._segments:
+            segment.close()
+        self._segments = []
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def postings(self, term: str) -> dict[int, list[int]]:
+        """Позиции терма по живым документам: {ID документа: позиции}"""
+        result = {}
+        for segment in self._segments:
+            block = segment.lookup(term)
+            if block is None:
+                continue
+            for doc_id, positions in decode_postings(block):
+                if doc_id not in self._deleted:
+                    result[doc_id] = positions
+        return result
+
+    def _match_clause(self, clause: list[tuple[str, ...]], cache: dict) -> set[int]:
+        # Документы, где выполнены все условия группы (AND)
+        docs = None
+        for terms in clause:
+            for term in terms:
+                if term not in cache:
+                    cache[term] = self.postings(term)
+            lists = [cache[term] for term in terms]
+            found = set(lists[0])
+            for postings in lists[1:]:
+                found &= postings.keys()
+            if len(terms) > 1:
+                found = {doc_id for doc_id in found if _has_phrase(lists, doc_id)}
+            docs = found if docs is None else docs & found
+            if not docs:
+                return set()
+        return docs or set()
+
+    def search(self, query: str, limit: int = 10) -> list[tuple[str, float]]:
+        """
+        Документы, подходящие под запрос (см. parse_query), по убыванию
+        оценки BM25, при равенстве - по пути.
+        """
+        cache: dict[str, dict[int, list[int]]] = {}
+        matched: set[int] = set()
+        for clause in parse_query(query):
+            matched |= self._match_clause(clause, cache)
+        if not matched:
+            return []
+
+        n_docs = len(self._paths)
+        scores = dict.fromkeys(matched, 0.0)
+        for postings in cache.values():
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id in matched.intersection(postings):
+                tf = len(postings[doc_id])
+                norm = 1 - BM25_B + BM25_B * self._lengths[doc_id] / self._avg_length
+                scores[doc_id] += idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+
+        ranked = heapq.nsmallest(
+            limit, scores.items(), key=lambda kv: (-kv[1], self._paths[kv[0]])
+        )
+        return [(self._paths[doc_id], score) for doc_id, score in ranked]
+
+
+def _has_phrase(lists: list[dict[int, list[int]]], doc_id: int) -> bool:
+    # Есть ли позиция p, где i-й терм фразы стоит на месте p + i
+    starts = set(lists[0][doc_id])
+    for i, postings in enumerate(lists[1:], 1):
+        starts &= {pos - i for pos in postings[doc_id]}
+        if not starts:
+            return False
+    return True
+
+
+def compact_index(index_dir: Union[str, Path]) -> None:
+    """Сливает все сегменты в один, выбрасывая постинги удалённых документов"""
+    index_dir = Path(index_dir)
+    meta = _load_meta(index_dir)
+    deleted = set(meta["deleted"])
+    old_names = meta["segments"]
+    segments = [_Segment(index_dir, name) for name in old_names]
+    name = f"seg_{meta['next_segment']:05d}"
+
+    try:
+        # Лексиконы отсортированы, поэтому термы сливаются кучей, а ID
+        # документов в более поздних сегментах всегда больше
+        merged = heapq.merge(
+            *(
+                ((term, i, block) for term, block in segment.iter_terms())
+                for i, segment in enumerate(segments)
+            )
+        )
+        lex_lines = []
+        offset = 0
+        with open(index_dir / f"{name}.post", "wb") as post:
+            for term, group in groupby(merged, key=itemgetter(0)):
+                docs = [
+                    item
+                    for _, _, block in group
+                    for item in decode_postings(block)
+                    if item[0] not in deleted
+                ]
+                if not docs:
+                    continue
+                out = bytearray()
+                encode_postings(docs, out)
+                post.write(out)
+                lex_lines.append(f"{term}\t{offset}\t{len(out)}\n")
+                offset += len(out)
+        with open(
+            index_dir / f"{name}.lex", "w", encoding="utf-8", newline="\n"
+        ) as lex:
+            lex.writelines(lex_lines)
+    finally:
+        for segment in segments:
+            segment.close()
+
+    meta["segments"] = [name]
+    meta["next_segment"] += 1
+    meta["deleted"] = []
+    _save_meta(index_dir, meta)
+    for old in old_names:
+        for suffix in (".lex", ".post"):
+            (index_dir / f"{old}{suffix}").unlink(missing_ok=True)
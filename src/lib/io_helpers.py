@@ -1,46 +1,181 @@
 # src/lib/io_helpers.py
+import bz2
 import csv
+import gzip
+import lzma
+import os
+import re
 from pathlib import Path
-from typing import Iterable, Sequence, Union
+from typing import IO, Iterable, Iterator, Optional, Sequence, Union
 
+# Сколько строк передавать в writerows за раз
+DEFAULT_BATCH_SIZE = 10_000
 
-def read_text(path: Union[str, Path], encoding: str = "utf-8") -> str:
-    # Читает текстовый файл и возвращает его содержимое
+# Сжатие по расширению файла и по первым байтам содержимого (сигнатуре)
+COMPRESSION_EXTENSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+COMPRESSION_MAGIC = {
+    "gzip": re.compile(rb"\x1f\x8b"),
+    # "BZh", размер блока 1-9 и сигнатура первого блока (или конца
+    # пустого потока): текст, начинающийся с "BZh", за bz2 не примется
+    "bz2": re.compile(rb"BZh[1-9](?:1AY&SY|\x17rE8P\x90)"),
+    "xz": re.compile(rb"\xfd7zXZ\x00"),
+}
+
+# Уровень сжатия по умолчанию (как у утилит gzip/bzip2/xz)
+DEFAULT_COMPRESSLEVEL = {"gzip": 6, "bz2": 9, "xz": 6}
+
+
+def detect_compression(path: Union[str, Path], mode: str = "r") -> Optional[str]:
+    # Определяет сжатие файла по расширению; при чтении файла без
+    # расширения сжатия - по сигнатуре в начале файла
     p = Path(path)
-    return p.read_text(encoding=encoding)
+    codec = COMPRESSION_EXTENSIONS.get(p.suffix.lower())
+    if codec is not None or "r" not in mode or not p.is_file():
+        return codec
+    with p.open("rb") as f:
+        head = f.read(10)
+    for codec, magic in COMPRESSION_MAGIC.items():
+        if magic.match(head):
+            return codec
+    return None
+
 
+def open_file(
+    path: Union[str, Path],
+    mode: str = "r",
+    encoding: Optional[str] = "utf-8",
+    newline: Optional[str] = None,
+    compression: Optional[str] = "auto",
+    compresslevel: Optional[int] = None,
+    buffering: int = -1,
+) -> IO:
+    # Открывает обычный или сжатый (gzip, bz2, xz) файл; сжатие
+    # распаковывается и упаковывается потоково, без временных файлов
+    if compression == "auto":
+        compression = detect_compression(path, mode)
+    if compression is None:
+        if "b" in mode:
+            return open(path, mode, buffering=buffering)
+        return open(path, mode, buffering=buffering, encoding=encoding, newline=newline)
+
+    if "b" not in mode and "t" not in mode:
+        mode += "t"
+    text_args = {} if "b" in mode else {"encoding": encoding, "newline": newline}
+    level = compresslevel
+    if level is None:
+        level = DEFAULT_COMPRESSLEVEL[compression]
+
+    if compression == "gzip":
+        return gzip.open(path, mode, compresslevel=level, **text_args)
+    if compression == "bz2":
+        return bz2.open(path, mode, compresslevel=level, **text_args)
+    if compression == "xz":
+        if "r" in mode:
+            return lzma.open(path, mode, **text_args)
+        return lzma.open(path, mode, preset=level, **text_args)
+    raise ValueError(f"Неизвестный формат сжатия: {compression}")
+
+
+def read_text(path: Union[str, Path], encoding: str = "utf-8") -> str:
+    # Читает текстовый файл (в том числе сжатый) и возвращает его содержимое
+    with open_file(path, "r", encoding=encoding) as f:
+        return f.read()
 
-def write_text(path: Union[str, Path], content: str, encoding: str = "utf-8") -> None:
-    # Записывает текст в файл
+
+def write_text(
+    path: Union[str, Path],
+    content: str,
+    encoding: str = "utf-8",
+    compresslevel: Optional[int] = None,
+) -> None:
+    # Записывает текст в файл; .gz/.bz2/.xz сжимаются
     p = Path(path)
     ensure_parent_dir(p)
-    p.write_text(content, encoding=encoding)
+    with open_file(p, "w", encoding=encoding, compresslevel=compresslevel) as f:
+        f.write(content)
 
 
 def write_csv(
-    rows: Iterable[Sequence], path: Union[str, Path], header: tuple[str, ...] = None
+    rows: Iterable[Sequence],
+    path: Union[str, Path],
+    header: tuple[str, ...] = None,
+    buffer_size: int = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    compresslevel: Optional[int] = None,
 ) -> None:
-    # Записывает данные в CSV файл
+    # Записывает данные в CSV файл; .gz/.bz2/.xz сжимаются
     p = Path(path)
-    rows_list = list(rows)
-
-    # Проверка согласованности длин строк
-    if rows_list:
-        first_len = len(rows_list[0])
-        for i, row in enumerate(rows_list):
-            if len(row) != first_len:
-                raise ValueError(
-                    f"Строка {i} имеет длину {len(row)}, ожидалось {first_len}"
-                )
 
     # Создание родительских директорий
     ensure_parent_dir(p)
 
-    with p.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        if header is not None:
-            writer.writerow(header)
-        writer.writerows(rows_list)
+    # Строки пишутся пачками по мере поступления (генераторы не
+    # материализуются), во временный файл - при ошибке в середине
+    # потока старый файл остаётся нетронутым
+    tmp = p.with_name(p.name + ".tmp")
+    try:
+        with open_file(
+            tmp,
+            "w",
+            newline="",
+            compression=detect_compression(p, "w"),
+            compresslevel=compresslevel,
+            buffering=buffer_size or -1,
+        ) as f:
+            writer = csv.writer(f)
+            if header is not None:
+                writer.writerow(header)
+            for batch in _checked_batches(rows, batch_size):
+                writer.writerows(batch)
+        os.replace(tmp, p)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _checked_batches(
+    rows: Iterable[Sequence], batch_size: int
+) -> Iterator[list[Sequence]]:
+    # Проверка согласованности длин строк прямо во время потока:
+    # ошибка возникает на первой строке с другой длиной
+    first_len = None
+    batch = []
+    for i, row in enumerate(rows):
+        if first_len is None:
+            first_len = len(row)
+        elif len(row) != first_len:
+            raise ValueError(
+                f"Строка {i} имеет длину {len(row)}, ожидалось {first_len}"
+            )
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def split_line_ranges(path: Union[str, Path], parts: int) -> list[tuple[int, int]]:
+    # Делит несжатый файл на диапазоны байтов [start, end), границы которых
+    # стоят сразу после перевода строки, поэтому строки не разрываются
+    if parts <= 0:
+        raise ValueError("parts должен быть положительным")
+
+    size = os.path.getsize(path)
+    bounds = [0]
+    with open(path, "rb") as f:
+        for i in range(1, parts):
+            pos = max(size * i // parts, bounds[-1], 1)
+            if pos >= size:
+                break
+            # Дочитываем до конца строки, в которую попала граница
+            # (с байта pos - 1, чтобы не пропустить строку, начинающуюся в pos)
+            f.seek(pos - 1)
+            f.readline()
+            bounds.append(min(f.tell(), size))
+    bounds.append(size)
+
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
 
 
 def ensure_parent_dir(path: Union[str, Path]) -> None:
@@ -0,0 +1,223 @@
+import json
+import math
+from json.encoder import encode_basestring as encode_string
+from typing import Any, Iterable, Iterator, Optional, TextIO
+
+# Сколько символов читать из файла за раз
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+_WHITESPACE = " \t\n\r"
+
+
+class NotAnArrayError(ValueError):
+    """Корректный JSON, но верхний уровень - не массив"""
+
+    def __init__(self, value: Any) -> None:
+        super().__init__("JSON верхнего уровня не является массивом")
+        self.value = value
+
+
+class _Buffer:
+    # Скользящее окно над текстовым потоком: прочитанное, но ещё не
+    # разобранное содержимое и позиция разбора в нём
+
+    def __init__(self, file_obj: TextIO, chunk_size: int) -> None:
+        self.file_obj = file_obj
+        self.chunk_size = chunk_size
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, at_least: int = 0) -> bool:
+        """Дочитывает не меньше chunk_size символов; False, если файл кончился"""
+        if self.eof:
+            return False
+        if self.pos:
+            # Разобранное начало больше не нужно
+            self.text = self.text[self.pos :]
+            self.pos = 0
+        chunk = self.file_obj.read(max(self.chunk_size, at_least))
+        if not chunk:
+            self.eof = True
+            return False
+        self.text += chunk
+        return True
+
+    def skip_whitespace(self) -> str:
+        """Пропускает пробелы; возвращает следующий символ или "" в конце"""
+        while True:
+            text, pos = self.text, self.pos
+            while pos < len(text) and text[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(text):
+                return text[pos]
+            if not self.fill():
+                return ""
+
+
+# Символы, которыми может продолжаться число JSON
+_NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+
+def iter_json_array(
+    file_obj: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Any]:
+    """
+    Потоково разбирает JSON-массив верхнего уровня и выдаёт его элементы
+    по одному. В памяти - только текущий элемент и буфер чтения.
+
+    Элементы разбираются json.JSONDecoder.raw_decode; если элемент не
+    помещается в буфер, буфер дочитывается и разбор повторяется.
+
+    Raises:
+        json.JSONDecodeError: синтаксическая ошибка
+        NotAnArrayError: верхний уровень - не массив (сам документ корректен)
+    """
+    decoder = json.JSONDecoder()
+    buf = _Buffer(file_obj, chunk_size)
+
+    first = buf.skip_whitespace()
+    if first != "[":
+        # Не массив: разбираем документ целиком, чтобы отличить
+        # некорректный JSON от JSON другого типа
+        while buf.fill():
+            pass
+        raise NotAnArrayError(json.loads(buf.text[buf.pos :]))
+    buf.pos += 1
+
+    if buf.skip_whitespace() == "]":
+        buf.pos += 1
+    else:
+        while True:
+            if not buf.skip_whitespace():
+                raise json.JSONDecodeError(
+                    "Неожиданный конец массива", buf.text, buf.pos
+                )
+            try:
+                value, end = decoder.raw_decode(buf.text, buf.pos)
+                # Число или литерал на границе буфера может продолжаться;
+                # число обрывается и на ".", "e" и т. п. ("1.5" -> "1" + ".")
+                complete = buf.eof or (
+                    end < len(buf.text)
+                    and not (
+                        isinstance(value, (int, float))
+                        and buf.text[end] in _NUMBER_CHARS
+                    )
+                )
+            except json.JSONDecodeError:
+                if buf.eof:
+                    raise
+                complete = False
+            if not complete:
+                # Элемент обрывается на границе буфера - читаем больше
+                # (с удвоением, чтобы большие элементы не разбирались
+                # заново слишком много раз)
+                buf.fill(len(buf.text) - buf.pos)
+                continue
+            buf.pos = end
+            yield value
+
+            sep = buf.skip_whitespace()
+            if sep == ",":
+                buf.pos += 1
+            elif sep == "]":
+                buf.pos += 1
+                break
+            else:
+                raise json.JSONDecodeError("Ожидалась ',' или ']'", buf.text, buf.pos)
+
+    if buf.skip_whitespace():
+        raise json.JSONDecodeError("Лишние данные после массива", buf.text, buf.pos)
+
+
+def json_array_delimiters(indent: Optional[int] = 2) -> tuple[str, str, str]:
+    """Разделитель элементов, начало и конец массива для данного indent"""
+    if indent is None:
+        return ",", "[", "]"
+    pad = " " * indent
+    return ",\n" + pad, "[\n" + pad, "\n]"
+
+
+def encode_json_items(items: Iterable[Any], indent: Optional[int] = 2) -> Iterator[str]:
+    """
+    Кодирует элементы массива по одному - с отступами, как внутри
+    json.dumps(list(items), indent=indent), или компактно при indent=None.
+    Склеенные через разделитель из json_array_delimiters, они дают
+    тело массива (так его можно собирать по кускам, в т.ч. в разных процессах).
+    """
+    compact = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    if indent is None:
+        yield from map(compact.encode, items)
+        return
+
+    encoder = json.JSONEncoder(ensure_ascii=False, indent=indent)
+    pad = " " * indent
+    # Разделители строк плоского объекта внутри массива
+    field_sep = ",\n" + pad * 2
+    field_open, field_close = "{\n" + pad * 2, "\n" + pad + "}"
+    for item in items:
+        # Плоский словарь (типичная строка CSV) - собираем отступы сами
+        fields = _encode_flat_dict(item)
+        if fields is not None:
+            yield field_open + field_sep.join(fields) + field_close
+        else:
+            # Элемент вложен в массив - сдвигаем его строки на один уровень
+            yield encoder.encode(item).replace("\n", "\n" + pad)
+
+
+def write_json_array(
+    items: Iterable[Any], file_obj: TextIO, indent: Optional[int] = 2
+) -> int:
+    """
+    Потоково пишет элементы как JSON-массив, по одному элементу за раз.
+
+    С indent вывод совпадает с json.dump(list(items), indent=indent),
+    с indent=None - компактный вывод без пробелов и переводов строк.
+
+    Returns:
+        Количество записанных элементов
+    """
+    sep, opening, closing = json_array_delimiters(indent)
+    count = 0
+    write = file_obj.write
+    for text in encode_json_items(items, indent):
+        write(sep if count else opening)
+        write(text)
+        count += 1
+    write(closing if count else "[]")
+    return count
+
+
+def _encode_float(value: float) -> str:
+    # Как json: repr для конечных чисел, NaN/Infinity - иначе
+    if value != value:
+        return "NaN"
+    if value in (math.inf, -math.inf):
+        return "Infinity" if value > 0 else "-Infinity"
+    return float.__repr__(value)
+
+
+# Кодировщики скалярных значений по точному типу - без накладных
+# расходов JSONEncoder.encode на каждое значение
+_SCALAR_ENCODERS = {
+    str: encode_string,
+    int: int.__repr__,
+    float: _encode_float,
+    bool: lambda value: "true" if value else "false",
+    type(None): lambda value: "null",
+}
+
+
+def _encode_flat_dict(item: Any) -> Optional[list[str]]:
+    # Поля '"ключ": значение' непустого словаря со строковыми ключами
+    # и скалярными значениями; None, если словарь не такой
+    if type(item) is not dict or not item:
+        return None
+    fields = []
+    for key, value in item.items():
+        encode = _SCALAR_ENCODERS.get(type(value))
+        if encode is None or type(key) is not str:
+            return None
+        fields.append(encode_string(key) + ": " + encode(value))
+    return fields
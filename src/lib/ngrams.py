@@ -0,0 +1,118 @@
+from array import array
+from collections import Counter
+from typing import Iterable, Iterator, Optional, TextIO
+
+try:
+    from .text import DEFAULT_CHUNK_SIZE, top_n
+    from .vocab import Vocabulary, iter_token_ids
+except ImportError:
+    # Модуль импортирован как top-level (src/lib добавлен в sys.path)
+    from text import DEFAULT_CHUNK_SIZE, top_n
+    from vocab import Vocabulary, iter_token_ids
+
+# Сколько разных n-грамм держать до прореживания по min_count
+DEFAULT_PRUNE_AT = 1_000_000
+
+
+def iter_ngram_ids(ids: array, n: int) -> Iterator[tuple[int, ...]]:
+    """Скользящее окно из n ID: (ids[0], ..., ids[n-1]), (ids[1], ...), ..."""
+    return zip(*(ids[i:] for i in range(n)))
+
+
+class NgramCounter:
+    """
+    Потоковый счётчик n-грамм. N-грамма хранится как кортеж ID словаря
+    (см. lib/vocab.py), а не как строка, и весь поток токенов в памяти
+    не держится: между кусками переносятся только последние n-1 ID.
+
+    Если min_count > 1, то каждый раз, когда разных n-грамм становится больше
+    prune_at, редкие (< min_count) выбрасываются. Это ограничивает память,
+    но частоты n-грамм, которые были выброшены и встретились снова, занижаются.
+
+    Пример:
+        counter = NgramCounter(2, min_count=2)
+        counter.update(["мир", "привет", "мир", "привет"])
+        counter.most_common(1)  # [("мир привет", 2)]
+    """
+
+    def __init__(
+        self,
+        n: int = 2,
+        vocab: Optional[Vocabulary] = None,
+        min_count: int = 1,
+        prune_at: int = DEFAULT_PRUNE_AT,
+    ) -> None:
+        if n < 1:
+            raise ValueError("n должен быть положительным")
+        if min_count < 1:
+            raise ValueError("min_count должен быть положительным")
+        self.n = n
+        self.vocab = vocab if vocab is not None else Vocabulary()
+        self.min_count = min_count
+        self.prune_at = prune_at
+        self.counts: Counter = Counter()
+        self.total = 0
+        self.pruned = 0
+        self._tail = array("I")
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def update_ids(self, ids: array) -> None:
+        """Учитывает очередной кусок потока ID токенов"""
+        window = self._tail + ids
+        before = len(window) - self.n + 1
+        if before > 0:
+            # Counter.update по итератору считает на уровне C
+            self.counts.update(iter_ngram_ids(window, self.n))
+            self.total += before
+        if self.n > 1:
+            self._tail = window[-(self.n - 1) :]
+        if self.min_count > 1 and len(self.counts) > self.prune_at:
+            self.prune()
+
+    def update(self, tokens: Iterable[str]) -> None:
+        """Учитывает поток токенов-строк"""
+        self.update_ids(self.vocab.encode(tokens))
+
+    def prune(self) -> None:
+        """Выбрасывает n-граммы с частотой меньше min_count"""
+        rare = [key for key, count in self.counts.items() if count < self.min_count]
+        for key in rare:
+            del self.counts[key]
+        self.pruned += len(rare)
+
+    def join(self, key: tuple[int, ...]) -> str:
+        """Кортеж ID -> строка из слов через пробел"""
+        words = self.vocab.words
+        return " ".join(words[token_id] for token_id in key)
+
+    def items(self) -> Iterator[tuple[str, int]]:
+        """Пары (n-грамма, частота) с частотой не меньше min_count"""
+        min_count = self.min_count
+        for key, count in self.counts.items():
+            if count >= min_count:
+                yield self.join(key), count
+
+    def to_counter(self) -> Counter:
+        """Counter по строковым n-граммам (для top_n, отчётов и т.п.)"""
+        return Counter(dict(self.items()))
+
+    def most_common(self, n: int) -> list[tuple[str, int]]:
+        """n самых частых n-грамм в порядке (-count, ngram)"""
+        return top_n(self.to_counter(), n)
+
+
+def count_file_ngrams(
+    file_obj: TextIO,
+    n: int = 2,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    *,
+    min_count: int = 1,
+    prune_at: int = DEFAULT_PRUNE_AT,
+) -> NgramCounter:
+    """N-граммы файла; память - словарь, счётчик и один кусок текста"""
+    counter = NgramCounter(n, min_count=min_count, prune_at=prune_at)
+    for ids in iter_token_ids(file_obj, counter.vocab, chunk_size):
+        counter.update_ids(ids)
+    return counter
@@ -0,0 +1,225 @@
+import json
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Iterator, Optional, TextIO, Union
+
+try:
+    from .text import DEFAULT_CHUNK_SIZE, align_on_whitespace, normalize, tokenize
+except ImportError:
+    # Модуль импортирован как top-level (src/lib добавлен в sys.path)
+    from text import DEFAULT_CHUNK_SIZE, align_on_whitespace, normalize, tokenize
+
+
+class StageStats:
+    """Накопленная статистика одной стадии пайплайна"""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.bytes = 0
+        self.tokens = 0
+        self.peak_memory = 0
+
+    def to_dict(self) -> dict:
+        seconds = self.seconds
+        return {
+            "stage": self.name,
+            "calls": self.calls,
+            "seconds": round(seconds, 6),
+            "bytes": self.bytes,
+            "tokens": self.tokens,
+            "bytes_per_second": round(self.bytes / seconds) if seconds else None,
+            "tokens_per_second": round(self.tokens / seconds) if seconds else None,
+            "peak_memory_bytes": self.peak_memory,
+        }
+
+
+class Profiler:
+    """
+    Профилировщик стадий текстового пайплайна (read_text, normalize,
+    tokenize, count_freq, sort, write_csv и т.п.).
+
+    Для каждой стадии копит время, объём данных (байты/токены) и пик
+    дополнительной памяти по tracemalloc. Стадия может вызываться много раз
+    (например, на каждый кусок файла) - значения суммируются, пик берётся
+    максимальный.
+
+    Пример:
+        profiler = Profiler()
+        with profiler.stage("normalize"):
+            text = normalize(raw)
+            st.bytes += len(raw)
+        print(profiler.to_json())
+    """
+
+    def __init__(self, trace_memory: bool = True) -> None:
+        self.trace_memory = trace_memory
+        self.stages: dict[str, StageStats] = {}
+        self._started_tracing = False
+        self._wall_start = time.perf_counter()
+        # Абсолютные пики памяти открытых (вложенных) стадий, которые
+        # tracemalloc.reset_peak во вложенной стадии уже сбросил
+        self._peaks: list[int] = []
+
+    def start(self) -> "Profiler":
+        """Включает tracemalloc (если ещё не включён) и сбрасывает общее время"""
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._wall_start = time.perf_counter()
+        return self
+
+    def stop(self) -> None:
+        """Выключает tracemalloc, если его включил этот профилировщик"""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def __enter__(self) -> "Profiler":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageStats]:
+        """
+        Замеряет один вызов стадии; в yield-объект можно добавить bytes/tokens.
+        Стадии можно вкладывать: пик внешней стадии учитывает и пики
+        вложенных.
+        """
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats(name)
+
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            # reset_peak сбрасывает общий для всех стадий пик: пик,
+            # накопленный внешней стадией до этого момента, сохраняем в ней
+            peak = tracemalloc.get_traced_memory()[1]
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            self._peaks.append(0)
+
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.seconds += time.perf_counter() - start
+            stats.calls += 1
+            if tracing:
+                peak = max(tracemalloc.get_traced_memory()[1], self._peaks.pop())
+                stats.peak_memory = max(stats.peak_memory, peak - base)
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+
+    def wrap(self, func: Callable, name: Optional[str] = None) -> Callable:
+        """Оборачивает функцию так, что каждый её вызов - стадия name"""
+        stage_name = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.stage(stage_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    def report(self) -> dict:
+        """Сводка по всем стадиям в порядке их первого вызова"""
+        return {
+            "total_seconds": round(time.perf_counter() - self._wall_start, 6),
+            "stages": [stats.to_dict() for stats in self.stages.values()],
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.report(), ensure_ascii=False, indent=2)
+
+    def dump(self, path: Optional[Union[str, Path]] = None) -> None:
+        """Пишет JSON-сводку в файл или, если путь не задан, в stderr"""
+        if path is None:
+            print(self.to_json(), file=sys.stderr)
+            return
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(self.to_json() + "\n", encoding="utf-8")
+
+
+def profiled_frequencies(
+    file_obj: TextIO,
+    profiler: Profiler,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    *,
+    casefold: bool = True,
+    yo2e: bool = True,
+) -> Counter:
+    """
+    То же, что Counter(iter_tokens(file_obj)), но с замером стадий
+    read_text, normalize, tokenize и count_freq по каждому куску.
+    """
+    freq = Counter()
+    position = _byte_position(file_obj)
+    encoding = getattr(file_obj, "encoding", None) or "utf-8"
+    total_bytes = 0
+
+    def read_chunks() -> Iterator[str]:
+        nonlocal total_bytes
+        offset = position() if position is not None else 0
+        while True:
+            with profiler.stage("read_text") as st:
+                chunk = file_obj.read(chunk_size)
+            if not chunk:
+                if position is not None:
+                    # Остаток упреждающего чтения последнего куска
+                    size = position() - offset
+                    st.bytes += size
+                    total_bytes += size
+                return
+            if position is not None:
+                # Прочитанные байты - по позиции двоичного потока, без
+                # повторного кодирования куска
+                new_offset = position()
+                size = new_offset - offset
+                offset = new_offset
+            else:
+                size = len(chunk.encode(encoding))
+            st.bytes += size
+            total_bytes += size
+            yield chunk
+
+    for chunk in align_on_whitespace(read_chunks()):
+        with profiler.stage("normalize"):
+            text = normalize(chunk, casefold=casefold, yo2e=yo2e)
+
+        with profiler.stage("tokenize") as st:
+            tokens = tokenize(text)
+        st.tokens += len(tokens)
+
+        with profiler.stage("count_freq") as st:
+            freq.update(tokens)
+        st.tokens += len(tokens)
+
+    # Куски выровнены по пробелам, но вместе покрывают тот же текст
+    if "normalize" in profiler.stages:
+        profiler.stages["normalize"].bytes += total_bytes
+    return freq
+
+
+def _byte_position(file_obj: TextIO) -> Optional[Callable[[], int]]:
+    # Позиция в двоичном потоке под текстовым файлом; None, если её нет
+    # (io.StringIO, канал)
+    buffer = getattr(file_obj, "buffer", None)
+    if buffer is None:
+        return None
+    try:
+        buffer.tell()
+    except (OSError, ValueError):
+        return None
+    return buffer.tell
@@ -0,0 +1,308 @@
+import base64
+import hashlib
+import math
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Union
+
+try:
+    from .text import iter_range_tokens, split_byte_ranges
+    from .topk import SpaceSaving
+except ImportError:
+    # Модуль импортирован как top-level (src/lib добавлен в sys.path)
+    from text import iter_range_tokens, split_byte_ranges
+    from topk import SpaceSaving
+
+_MASK64 = (1 << 64) - 1
+
+
+def _hash128(item: str) -> tuple[int, int]:
+    # Стабильный между процессами и запусками хеш (встроенный hash()
+    # рандомизирован), разбитый на две 64-битные половины
+    digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+    return (
+        int.from_bytes(digest[:8], "little"),
+        int.from_bytes(digest[8:], "little"),
+    )
+
+
+def _pack_counts(counts: array) -> str:
+    # Счётчики сохраняются в little-endian независимо от платформы
+    data = array(counts.typecode, counts)
+    if sys.byteorder != "little":
+        data.byteswap()
+    return base64.b64encode(data.tobytes()).decode("ascii")
+
+
+def _unpack_counts(typecode: str, packed: str) -> array:
+    data = array(typecode)
+    data.frombytes(base64.b64decode(packed))
+    if sys.byteorder != "little":
+        data.byteswap()
+    return data
+
+
+class HyperLogLog:
+    """
+    Оценка количества уникальных элементов (HyperLogLog).
+
+    Занимает 2**precision байт; стандартная ошибка около
+    1.04 / sqrt(2**precision), для precision=14 (16 КБ) - примерно 0.8%.
+    """
+
+    def __init__(self, precision: int = 14) -> None:
+        if not 4 <= precision <= 18:
+            raise ValueError("precision должен быть от 4 до 18")
+        self.precision = precision
+        self.m = 1 << precision
+        self._registers = bytearray(self.m)
+
+    def _add_hash(self, h: int) -> None:
+        index = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        # Позиция первой единицы в оставшихся битах
+        rank = 64 - self.precision - rest.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def add(self, item: str) -> None:
+        """Добавляет элемент"""
+        self._add_hash(_hash128(item)[0])
+
+    def extend(self, items: Iterable[str]) -> "HyperLogLog":
+        """Добавляет все элементы итерируемого объекта"""
+        for item in items:
+            self._add_hash(_hash128(item)[0])
+        return self
+
+    def count(self) -> int:
+        """Оценка количества уникальных элементов"""
+        m = self.m
+        if m >= 128:
+            alpha = 0.7213 / (1 + 1.079 / m)
+        else:
+            alpha = {16: 0.673, 32: 0.697, 64: 0.709}[m]
+
+        estimate = alpha * m * m / sum(2.0**-r for r in self._registers)
+
+        # Поправка для малых мощностей (linear counting)
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+
+        return round(estimate)
+
+    def relative_error(self) -> float:
+        """Стандартная относительная ошибка оценки"""
+        return 1.04 / math.sqrt(self.m)
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Объединение: оценка мощности объединения множеств"""
+        if self.precision != other.precision:
+            raise ValueError("Нельзя объединить HyperLogLog с разной точностью")
+        merged = HyperLogLog(self.precision)
+        merged._registers = bytearray(map(max, self._registers, other._registers))
+        return merged
+
+    def to_dict(self) -> dict:
+        """Сериализует состояние в JSON-совместимый словарь"""
+        return {
+            "precision": self.precision,
+            "registers": base64.b64encode(self._registers).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "HyperLogLog":
+        """Восстанавливает состояние из словаря, созданного to_dict"""
+        sketch = cls(data["precision"])
+        registers = base64.b64decode(data["registers"])
+        if len(registers) != sketch.m:
+            raise ValueError("Размер регистров не соответствует precision")
+        sketch._registers = bytearray(registers)
+        return sketch
+
+
+class CountMinSketch:
+    """
+    Оценка частот элементов (Count-Min Sketch).
+
+    Оценка никогда не меньше истинной частоты и с вероятностью
+    1 - exp(-depth) превышает её не более чем на e / width * total.
+    Занимает width * depth * 8 байт.
+    """
+
+    def __init__(self, width: int = 1 << 14, depth: int = 4) -> None:
+        if width <= 0 or depth <= 0:
+            raise ValueError("width и depth должны быть положительными")
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self._counts = array("Q", bytes(8 * width * depth))
+
+    def _indexes(self, h1: int, h2: int) -> list[int]:
+        # Двойное хеширование: depth независимых строк из двух хешей
+        width = self.width
+        return [
+            row * width + ((h1 + row * h2) & _MASK64) % width
+            for row in range(self.depth)
+        ]
+
+    def _add_hash(self, h1: int, h2: int, count: int = 1) -> None:
+        self.total += count
+        for index in self._indexes(h1, h2):
+            self._counts[index] += count
+
+    def add(self, item: str, count: int = 1) -> None:
+        """Учитывает count вхождений элемента"""
+        self._add_hash(*_hash128(item), count)
+
+    def extend(self, items: Iterable[str]) -> "CountMinSketch":
+        """Учитывает все элементы итерируемого объекта"""
+        for item in items:
+            self._add_hash(*_hash128(item))
+        return self
+
+    def estimate(self, item: str) -> int:
+        """Верхняя оценка частоты элемента"""
+        return min(self._counts[i] for i in self._indexes(*_hash128(item)))
+
+    def error_bound(self) -> float:
+        """Граница переоценки частоты (выполняется с вероятностью 1 - e^-depth)"""
+        return math.e / self.width * self.total
+
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        """Объединение сводок с одинаковыми размерами"""
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("Нельзя объединить Count-Min Sketch разных размеров")
+        merged = CountMinSketch(self.width, self.depth)
+        merged.total = self.total + other.total
+        merged._counts = array("Q", map(sum, zip(self._counts, other._counts)))
+        return merged
+
+    def to_dict(self) -> dict:
+        """Сериализует состояние в JSON-совместимый словарь"""
+        return {
+            "width": self.width,
+            "depth": self.depth,
+            "total": self.total,
+            "counts": _pack_counts(self._counts),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CountMinSketch":
+        """Восстанавливает состояние из словаря, созданного to_dict"""
+        sketch = cls(data["width"], data["depth"])
+        counts = _unpack_counts("Q", data["counts"])
+        if len(counts) != sketch.width * sketch.depth:
+            raise ValueError("Размер счётчиков не соответствует width * depth")
+        sketch.total = data["total"]
+        sketch._counts = counts
+        return sketch
+
+
+class TextSketch:
+    """
+    Набор сводок по потоку слов за один проход: общее число слов,
+    HyperLogLog для уникальных слов, Count-Min Sketch для частот и
+    Space-Saving для топа. Память фиксирована и не зависит от объёма текста.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 100,
+        precision: int = 14,
+        width: int = 1 << 14,
+        depth: int = 4,
+    ) -> None:
+        self.unique = HyperLogLog(precision)
+        self.freq = CountMinSketch(width, depth)
+        self.top = SpaceSaving(capacity)
+
+    @property
+    def total(self) -> int:
+        return self.freq.total
+
+    def extend(self, tokens: Iterable[str]) -> "TextSketch":
+        """Учитывает все слова потока"""
+        for token in tokens:
+            h1, h2 = _hash128(token)
+            self.unique._add_hash(h1)
+            self.freq._add_hash(h1, h2)
+            self.top.update(token)
+        return self
+
+    def estimate(self, word: str) -> int:
+        """Верхняя оценка частоты слова (минимум из двух сводок)"""
+        return min(self.freq.estimate(word), self.top.estimate(word))
+
+    def merge(self, other: "TextSketch") -> "TextSketch":
+        """Объединяет сводки, например от разных воркеров"""
+        merged = TextSketch.__new__(TextSketch)
+        merged.unique = self.unique.merge(other.unique)
+        merged.freq = self.freq.merge(other.freq)
+        merged.top = self.top.merge(other.top)
+        return merged
+
+    def to_dict(self) -> dict:
+        """Сериализует состояние в JSON-совместимый словарь"""
+        return {
+            "unique": self.unique.to_dict(),
+            "freq": self.freq.to_dict(),
+            "top": self.top.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TextSketch":
+        """Восстанавливает состояние из словаря, созданного to_dict"""
+        sketch = cls.__new__(cls)
+        sketch.unique = HyperLogLog.from_dict(data["unique"])
+        sketch.freq = CountMinSketch.from_dict(data["freq"])
+        sketch.top = SpaceSaving.from_dict(data["top"])
+        return sketch
+
+
+def _sketch_range(args: tuple) -> dict:
+    # Задача для процесса-воркера: сводки одного диапазона файла
+    path, start, end, encoding, params = args
+    sketch = TextSketch(**params)
+    sketch.extend(iter_range_tokens(path, start, end, encoding=encoding))
+    return sketch.to_dict()
+
+
+def sketch_file(
+    path: Union[str, Path],
+    workers: int = 1,
+    *,
+    encoding: str = "utf-8",
+    capacity: int = 100,
+    precision: int = 14,
+    width: int = 1 << 14,
+    depth: int = 4,
+) -> TextSketch:
+    """
+    Строит TextSketch по словам файла, при workers > 1 - параллельно
+    по диапазонам байтов с объединением сводок
+    """
+    params = {
+        "capacity": capacity,
+        "precision": precision,
+        "width": width,
+        "depth": depth,
+    }
+    tasks = [
+        (str(path), start, end, encoding, params)
+        for start, end in split_byte_ranges(path, workers)
+    ]
+
+    result = TextSketch(**params)
+    if workers == 1 or len(tasks) <= 1:
+        for path, start, end, encoding, _ in tasks:
+            result.extend(iter_range_tokens(path, start, end, encoding=encoding))
+        return result
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for data in pool.map(_sketch_range, tasks):
+            result = result.merge(TextSketch.from_dict(data))
+    return result
@@ -1,4 +1,20 @@
+import codecs
+import heapq
+import os
 import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence, TextIO, Union
+
+# Размер куска (в символах), который читается из файла за один раз
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Во сколько раз словарь должен быть больше n, чтобы top_n выбирал кучей
+HEAP_SELECT_RATIO = 8
+
+# Регулярка для поиска слов (буквы/цифры/подчеркивание с дефисами внутри)
+TOKEN_PATTERN = re.compile(r"\w+(?:-\w+)*")
 
 
 def normalize(text: str, *, casefold: bool = True, yo2e: bool = True) -> str:
@@ -28,14 +44,66 @@ def tokenize(text: str) -> list[str]:
     if not text:
         return []
 
-    # Регулярка для поиска слов (буквы/цифры/подчеркивание с дефисами внутри)
-    pattern = r"\w+(?:-\w+)*"
-    tokens = re.findall(pattern, text)
+    tokens = TOKEN_PATTERN.findall(text)
 
     return tokens
 
 
-def count_freq(tokens: list[str]) -> dict[str, int]:
+# Пробельные байты ASCII: не встречаются внутри многобайтовых символов UTF-8
+_WHITESPACE_CHARS = b" \t\n\r\x0b\x0c"
+_WHITESPACE_BYTE = re.compile(b"[" + re.escape(_WHITESPACE_CHARS) + b"]")
+
+
+def align_on_whitespace(chunks: Iterable[str]) -> Iterator[str]:
+    # Склеивает куски текста и режет их по последнему пробельному символу,
+    # чтобы ни одно слово (в том числе через дефис) не попало на границу
+    tail = ""
+    for chunk in chunks:
+        if not chunk:
+            continue
+
+        buffer = tail + chunk
+        # Ищем последний пробельный символ - слово не может его содержать.
+        # В хвосте пробелов нет, поэтому смотрим только новый кусок
+        cut = len(buffer)
+        while cut > len(tail) and not buffer[cut - 1].isspace():
+            cut -= 1
+
+        if cut == len(tail):
+            # Пробелов нет: слово длиннее куска, копим дальше
+            tail = buffer
+            continue
+
+        tail = buffer[cut:]
+        yield buffer[:cut]
+
+    if tail:
+        yield tail
+
+
+def iter_text_chunks(
+    file_obj: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[str]:
+    # Читает файл кусками, выровненными по пробельным символам
+    if chunk_size <= 0:
+        raise ValueError("chunk_size должен быть положительным")
+
+    return align_on_whitespace(iter(lambda: file_obj.read(chunk_size), ""))
+
+
+def iter_tokens(
+    file_obj: TextIO,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    *,
+    casefold: bool = True,
+    yo2e: bool = True,
+) -> Iterator[str]:
+    # Потоковая версия tokenize(normalize(text)) с памятью O(chunk_size)
+    for chunk in iter_text_chunks(file_obj, chunk_size):
+        yield from tokenize(normalize(chunk, casefold=casefold, yo2e=yo2e))
+
+
+def count_freq(tokens: Iterable[str]) -> dict[str, int]:
 
     freq = {}
 
@@ -44,7 +112,168 @@ def count_freq(tokens: list[str]) -> dict[str, int]:
     return freq
 
 
-def top_n(freq: dict[str, int], n: int = 5) -> list[tuple[str, int]]:
+def split_byte_ranges(
+    path: Union[str, Path],
+    parts: int,
+    start: int = 0,
+    end: Optional[int] = None,
+) -> list[tuple[int, int]]:
+    # Делит файл (или его участок [start, end)) на диапазоны байтов, границы
+    # которых стоят сразу после пробельного байта, поэтому слова не
+    # разрываются между диапазонами. start должен сам быть такой границей.
+    # Подходит для кодировок, совместимых с ASCII (utf-8, cp1251 и т.п.)
+    if parts <= 0:
+        raise ValueError("parts должен быть положительным")
+
+    size = os.path.getsize(path) if end is None else end
+    length = size - start
+    bounds = [start]
+    with open(path, "rb") as f:
+        for i in range(1, parts):
+            pos = max(start + length * i // parts, bounds[-1])
+            f.seek(pos)
+            while pos < size:
+                block = f.read(min(1 << 16, size - pos))
+                if not block:
+                    break
+                match = _WHITESPACE_BYTE.search(block)
+                if match:
+                    pos += match.end()
+                    break
+                pos += len(block)
+            bounds.append(min(pos, size))
+    bounds.append(size)
+
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def last_token_boundary(
+    path: Union[str, Path], start: int = 0, end: Optional[int] = None
+) -> int:
+    # Позиция сразу после последнего пробельного байта в [start, end)
+    # (или start, если пробелов нет): всё до неё - законченные слова,
+    # а после может быть слово, которое ещё дописывается в файл
+    pos = os.path.getsize(path) if end is None else end
+    with open(path, "rb") as f:
+        while pos > start:
+            block_start = max(start, pos - (1 << 16))
+            f.seek(block_start)
+            block = f.read(pos - block_start)
+            last = max(block.rfind(byte) for byte in _WHITESPACE_CHARS)
+            if last != -1:
+                return block_start + last + 1
+            pos = block_start
+    return start
+
+
+def _iter_range_text(
+    path: Union[str, Path],
+    start: int,
+    end: int,
+    encoding: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[str]:
+    # Читает диапазон байтов файла и декодирует его по кускам
+    decoder = codecs.getincrementaldecoder(encoding)()
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = f.read(min(chunk_size, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield decoder.decode(block)
+    yield decoder.decode(b"", final=True)
+
+
+def iter_range_tokens(
+    path: Union[str, Path],
+    start: int,
+    end: int,
+    *,
+    encoding: str = "utf-8",
+    casefold: bool = True,
+    yo2e: bool = True,
+) -> Iterator[str]:
+    # Токены диапазона байтов [start, end), полученного из split_byte_ranges
+    for chunk in align_on_whitespace(_iter_range_text(path, start, end, encoding)):
+        yield from tokenize(normalize(chunk, casefold=casefold, yo2e=yo2e))
+
+
+def _count_range(args: tuple) -> Counter:
+    # Задача для процесса-воркера: частоты слов одного диапазона файла
+    path, start, end, encoding, casefold, yo2e = args
+    return Counter(
+        iter_range_tokens(
+            path, start, end, encoding=encoding, casefold=casefold, yo2e=yo2e
+        )
+    )
+
+
+def count_freq_parallel(
+    path: Union[str, Path],
+    workers: int = 1,
+    *,
+    encoding: str = "utf-8",
+    casefold: bool = True,
+    yo2e: bool = True,
+    start: int = 0,
+    end: Optional[int] = None,
+) -> dict[str, int]:
+    # Параллельный подсчет частот по диапазонам файла в пуле процессов.
+    # Результат совпадает с count_freq(iter_tokens(...)) на том же файле
+    if workers <= 0:
+        raise ValueError("workers должен быть положительным")
+
+    tasks = [
+        (str(path), a, b, encoding, casefold, yo2e)
+        for a, b in split_byte_ranges(path, workers, start, end)
+    ]
+
+    freq = Counter()
+    if workers == 1 or len(tasks) <= 1:
+        for task in tasks:
+            freq.update(_count_range(task))
+        return freq
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for partial in pool.map(_count_range, tasks):
+            freq.update(partial)
+    return freq
+
+
+def freq_order(item: tuple[str, int]) -> tuple[int, str]:
+    # Ключ сортировки пар (слово, частота) в порядке отчётов: по убыванию
+    # частоты, при равенстве - по алфавиту
+    return (-item[1], item[0])
+
+
+def iter_id_counts(
+    counts: Sequence[int], vocab: Sequence[str]
+) -> Iterator[tuple[str, int]]:
+    # Пары (слово, частота) из массива частот по ID (см. lib/vocab.py),
+    # слова с нулевой частотой пропускаются
+    for word, count in zip(vocab, counts):
+        if count:
+            yield word, int(count)
+
+
+def top_n(
+    freq: Union[dict[str, int], Sequence[int]],
+    n: int = 5,
+    vocab: Optional[Sequence[str]] = None,
+) -> list[tuple[str, int]]:
+    # freq - словарь частот или, если передан vocab, массив частот по ID
+    if vocab is not None:
+        items = iter_id_counts(freq, vocab)
+    else:
+        items = freq.items()
+
+    # Если нужно мало слов из большого словаря, частичный отбор кучей
+    # (O(V log n)) быстрее полной сортировки (O(V log V))
+    if 0 < n and n * HEAP_SELECT_RATIO < len(freq):
+        return heapq.nsmallest(n, items, key=freq_order)
 
-    sorted_items = sorted(freq.items(), key=lambda x: (-x[1], x[0]))
+    sorted_items = sorted(items, key=freq_order)
     return sorted_items[:n]
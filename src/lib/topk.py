@@ -0,0 +1,217 @@
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Union
+
+try:
+    from .text import iter_range_tokens, split_byte_ranges
+except ImportError:
+    # Модуль импортирован как top-level (src/lib добавлен в sys.path)
+    from text import iter_range_tokens, split_byte_ranges
+
+
+def _order(item: tuple[str, int]) -> tuple[int, str]:
+    # Тот же порядок, что и в text.top_n: (-count, word)
+    return (-item[1], item[0])
+
+
+class SpaceSaving:
+    """
+    Приближённый поиск самых частых элементов потока (алгоритм Space-Saving).
+
+    Хранит не больше capacity счётчиков. Для любого элемента выполняется
+    count(x) - error(x) <= true(x) <= count(x), а error(x) <= total / capacity,
+    поэтому каждый элемент с частотой больше total / capacity гарантированно
+    присутствует в сводке.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity должен быть положительным")
+        self.capacity = capacity
+        self.total = 0
+        self._counts: dict[str, int] = {}
+        self._errors: dict[str, int] = {}
+        # Верхняя граница частоты элементов, не попавших в сводку (после merge)
+        self._floor = 0
+        # Куча (count, item) по одной записи на элемент; count в куче может
+        # отставать от настоящего, такие записи обновляются при извлечении
+        self._heap: list[tuple[int, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __contains__(self, item: str) -> bool:
+        return item in self._counts
+
+    def _pop_min(self) -> tuple[int, str]:
+        # Извлекает элемент с минимальным счётчиком
+        while True:
+            count, item = heapq.heappop(self._heap)
+            actual = self._counts[item]
+            if actual == count:
+                return count, item
+            heapq.heappush(self._heap, (actual, item))
+
+    def min_count(self) -> int:
+        """Верхняя граница частоты элементов, которых нет в сводке"""
+        if len(self._counts) < self.capacity or not self._heap:
+            return self._floor
+        count, item = self._pop_min()
+        heapq.heappush(self._heap, (count, item))
+        return max(count, self._floor)
+
+    def update(self, item: str, count: int = 1) -> None:
+        """Учитывает count вхождений элемента"""
+        self.total += count
+
+        if item in self._counts:
+            self._counts[item] += count
+            return
+
+        if len(self._counts) < self.capacity:
+            self._counts[item] = self._floor + count
+            self._errors[item] = self._floor
+            heapq.heappush(self._heap, (self._floor + count, item))
+            return
+
+        # Вытесняем элемент с минимальным счётчиком, наследуя его значение
+        min_count, victim = self._pop_min()
+        del self._counts[victim]
+        del self._errors[victim]
+        self._counts[item] = min_count + count
+        self._errors[item] = min_count
+        heapq.heappush(self._heap, (min_count + count, item))
+
+    def extend(self, items: Iterable[str]) -> "SpaceSaving":
+        """Учитывает все элементы итерируемого объекта"""
+        for item in items:
+            self.update(item)
+        return self
+
+    def estimate(self, item: str) -> int:
+        """Верхняя оценка частоты элемента"""
+        if item in self._counts:
+            return self._counts[item]
+        return self.min_count()
+
+    def error(self, item: str) -> int:
+        """Максимальная переоценка частоты элемента"""
+        if item in self._errors:
+            return self._errors[item]
+        return self.min_count()
+
+    def error_bound(self) -> float:
+        """Гарантированная граница погрешности для любого элемента"""
+        return self.total / self.capacity
+
+    def top(self, n: int) -> list[tuple[str, int]]:
+        """n элементов с наибольшими оценками в порядке (-count, item)"""
+        return heapq.nsmallest(n, self._counts.items(), key=_order)
+
+    def guaranteed(self, n: int) -> list[tuple[str, int]]:
+        """Элементы из top(n), которые гарантированно входят в истинный топ-n"""
+        ranked = self.top(n + 1)
+        # Нижняя оценка элемента должна быть не меньше верхней оценки
+        # любого элемента за пределами топа
+        threshold = ranked[n][1] if len(ranked) > n else self.min_count()
+        return [
+            (item, count)
+            for item, count in ranked[:n]
+            if count - self._errors[item] >= threshold
+        ]
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """
+        Объединяет две сводки (например, от разных воркеров).
+
+        Погрешность результата не превышает (total1 + total2) / capacity.
+        """
+        capacity = max(self.capacity, other.capacity)
+        min_self = self.min_count()
+        min_other = other.min_count()
+
+        counts = {}
+        errors = {}
+        for item in self._counts.keys() | other._counts.keys():
+            counts[item] = self._counts.get(item, min_self) + other._counts.get(
+                item, min_other
+            )
+            errors[item] = self._errors.get(item, min_self) + other._errors.get(
+                item, min_other
+            )
+
+        kept = heapq.nsmallest(capacity, counts.items(), key=_order)
+
+        merged = SpaceSaving(capacity)
+        merged.total = self.total + other.total
+        merged._floor = min_self + min_other
+        merged._counts = dict(kept)
+        merged._errors = {item: errors[item] for item, _ in kept}
+        merged._heap = [(count, item) for item, count in kept]
+        heapq.heapify(merged._heap)
+        return merged
+
+    def to_dict(self) -> dict:
+        """Сериализует сводку в JSON-совместимый словарь"""
+        return {
+            "capacity": self.capacity,
+            "total": self.total,
+            "floor": self._floor,
+            "counters": [
+                [item, count, self._errors[item]]
+                for item, count in self._counts.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SpaceSaving":
+        """Восстанавливает сводку из словаря, созданного to_dict"""
+        sketch = cls(data["capacity"])
+        sketch.total = data["total"]
+        sketch._floor = data.get("floor", 0)
+        for item, count, error in data["counters"]:
+            sketch._counts[item] = count
+            sketch._errors[item] = error
+            sketch._heap.append((count, item))
+        heapq.heapify(sketch._heap)
+        return sketch
+
+
+def _sketch_range(args: tuple) -> dict:
+    # Задача для процесса-воркера: сводка Space-Saving одного диапазона файла
+    path, start, end, encoding, capacity = args
+    sketch = SpaceSaving(capacity)
+    sketch.extend(iter_range_tokens(path, start, end, encoding=encoding))
+    return sketch.to_dict()
+
+
+def space_saving_from_file(
+    path: Union[str, Path],
+    capacity: int,
+    workers: int = 1,
+    *,
+    encoding: str = "utf-8",
+) -> SpaceSaving:
+    """
+    Строит сводку Space-Saving по словам файла, при workers > 1 -
+    параллельно по диапазонам байтов с объединением сводок
+    """
+    tasks = [
+        (str(path), start, end, encoding, capacity)
+        for start, end in split_byte_ranges(path, workers)
+    ]
+
+    if workers == 1 or len(tasks) <= 1:
+        partials = map(_sketch_range, tasks)
+        return _merge_all(partials, capacity)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return _merge_all(pool.map(_sketch_range, tasks), capacity)
+
+
+def _merge_all(partials: Iterable[dict], capacity: int) -> SpaceSaving:
+    result = SpaceSaving(capacity)
+    for data in partials:
+        result = result.merge(SpaceSaving.from_dict(data))
+    return result
@@ -0,0 +1,163 @@
+from array import array
+from collections import Counter
+from typing import Iterable, Iterator, Optional, Sequence, TextIO
+
+try:
+    import numpy as np
+except ImportError:  # numpy необязателен
+    np = None
+
+try:
+    from .text import DEFAULT_CHUNK_SIZE, TOKEN_PATTERN, iter_text_chunks, normalize
+except ImportError:
+    # Модуль импортирован как top-level (src/lib добавлен в sys.path)
+    from text import DEFAULT_CHUNK_SIZE, TOKEN_PATTERN, iter_text_chunks, normalize
+
+
+class Vocabulary:
+    """
+    Словарь, сопоставляющий токенам плотные целочисленные ID (0, 1, 2, ...).
+
+    Каждый уникальный токен хранится один раз, поток токенов
+    представляется массивом array('I') с ID вместо списка строк.
+    """
+
+    def __init__(self, words: Iterable[str] = ()) -> None:
+        self._ids: dict[str, int] = {}
+        self._words: list[str] = []
+        for word in words:
+            self.add(word)
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def __getitem__(self, token_id: int) -> str:
+        return self._words[token_id]
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._words)
+
+    @property
+    def words(self) -> list[str]:
+        """Токены в порядке их ID"""
+        return self._words
+
+    def add(self, word: str) -> int:
+        """Возвращает ID токена, добавляя его при первом появлении"""
+        token_id = self._ids.get(word)
+        if token_id is None:
+            token_id = len(self._words)
+            self._ids[word] = token_id
+            self._words.append(word)
+        return token_id
+
+    def id_of(self, word: str) -> Optional[int]:
+        """ID токена или None, если токена нет в словаре"""
+        return self._ids.get(word)
+
+    def encode(self, tokens: Iterable[str]) -> array:
+        """Переводит поток токенов в массив ID"""
+        ids = self._ids
+        words = self._words
+        result = array("I")
+        append = result.append
+        for token in tokens:
+            token_id = ids.get(token)
+            if token_id is None:
+                token_id = len(words)
+                ids[token] = token_id
+                words.append(token)
+            append(token_id)
+        return result
+
+    def decode(self, ids: Iterable[int]) -> list[str]:
+        """Переводит ID обратно в токены"""
+        words = self._words
+        return [words[token_id] for token_id in ids]
+
+
+def tokenize_ids(text: str, vocab: Vocabulary) -> array:
+    """Аналог tokenize(text), возвращающий array('I') с ID токенов"""
+    if not text:
+        return array("I")
+    return vocab.encode(TOKEN_PATTERN.findall(text))
+
+
+def iter_token_ids(
+    file_obj: TextIO,
+    vocab: Vocabulary,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    *,
+    casefold: bool = True,
+    yo2e: bool = True,
+) -> Iterator[array]:
+    """Потоково выдаёт массивы ID токенов, по одному на кусок файла"""
+    for chunk in iter_text_chunks(file_obj, chunk_size):
+        yield tokenize_ids(normalize(chunk, casefold=casefold, yo2e=yo2e), vocab)
+
+
+def count_ids(ids: Iterable[int], size: int = 0) -> Sequence[int]:
+    """
+    Частоты ID: элемент i результата - число вхождений ID i.
+
+    С numpy используется bincount, без него - массив array('Q').
+    size задаёт минимальную длину результата (обычно len(vocab)).
+    """
+    return _accumulate(None, ids, size)
+
+
+def _accumulate(
+    counts: Optional[Sequence[int]], ids: Iterable[int], size: int
+) -> Sequence[int]:
+    # Добавляет вхождения ids к массиву частот counts, расширяя его до size
+    if np is not None:
+        part = np.bincount(np.asarray(ids, dtype=np.uint32), minlength=size)
+        if counts is None:
+            return part.astype(np.uint64)
+        if len(counts) < len(part):
+            counts = np.concatenate(
+                [counts, np.zeros(len(part) - len(counts), dtype=np.uint64)]
+            )
+        counts[: len(part)] += part.astype(np.uint64)
+        return counts
+
+    if counts is None:
+        counts = array("Q")
+    if len(counts) < size:
+        counts.frombytes(bytes(8 * (size - len(counts))))
+    # Counter считает на уровне C, в цикле Python остаются только уникальные ID
+    for token_id, count in Counter(ids).items():
+        if token_id >= len(counts):
+            counts.frombytes(bytes(8 * (token_id + 1 - len(counts))))
+        counts[token_id] += count
+    return counts
+
+
+def count_file_ids(
+    file_obj: TextIO,
+    vocab: Vocabulary,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    *,
+    casefold: bool = True,
+    yo2e: bool = True,
+) -> Sequence[int]:
+    """
+    Частоты ID токенов файла; память - словарь и один кусок текста.
+    Строки токенов хранятся один раз в vocab, частоты - плотным массивом
+    по ID, без словаря строка -> число.
+    """
+    counts = None
+    for ids in iter_token_ids(
+        file_obj, vocab, chunk_size, casefold=casefold, yo2e=yo2e
+    ):
+        counts = _accumulate(counts, ids, len(vocab))
+    if counts is None:
+        counts = count_ids([], len(vocab))
+    return counts
+    counts = array("Q", bytes(8 * len(vocab)))
+    for token_id, count in zip(ids, freq.values()):
+        counts[token_id] = count
+    return counts
@@ -0,0 +1,257 @@
+import operator
+import re
+from typing import Any, Callable, Optional, Sequence
+
+# Язык условий --where:
+#   условие  := или
+#   или      := и ("or" и)*
+#   и        := не ("and" не)*
+#   не       := "not" не | "(" условие ")" | сравнение
+#   сравнение := поле оператор значение
+# Поле - слово или `имя с пробелами`; оператор - = == != < <= > >=;
+# значение - число, строка в кавычках, null, true, false или слово.
+# Пример: age >= 18 and (city = "Москва" or city = Казань) and note != null
+
+_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<op><=|>=|==|!=|<|>|=)
+      | (?P<paren>[()])
+      | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<name>`[^`]+`)
+      | (?P<word>[^\s()<>=!"'`]+)
+    )""",
+    re.X,
+)
+
+_OPERATORS = {
+    "=": operator.eq,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+_KEYWORDS = {"and", "or", "not"}
+
+Row = Any
+Predicate = Callable[[Row], bool]
+
+
+def _tokenize(expr: str) -> list[tuple[str, str]]:
+    tokens = []
+    pos = 0
+    expr = expr.rstrip()
+    while pos < len(expr):
+        match = _TOKEN.match(expr, pos)
+        if match is None or match.end() == pos:
+            raise ValueError(f"Ошибка в условии (позиция {pos}): {expr[pos:]!r}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        pos = match.end()
+    return tokens
+
+
+def _literal(kind: str, text: str) -> Any:
+    # Значение справа от оператора
+    if kind == "string":
+        return re.sub(r"\\(.)", r"\1", text[1:-1])
+    lowered = text.lower()
+    if lowered == "null":
+        return None
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+
+def _number(value: Any) -> Optional[float]:
+    # Значение поля как число; None, если это не число
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _comparison(get: Callable[[Row], Any], op: str, literal: Any) -> Predicate:
+    # Сравнение компилируется в замыкание один раз; тип сравнения
+    # выбирается по значению справа, а не на каждой строке
+    compare = _OPERATORS[op]
+    if literal is None:
+        if compare not in (operator.eq, operator.ne):
+            raise ValueError(f"С null можно сравнивать только через = и !=: {op}")
+
+        def is_null(row: Row) -> bool:
+            return get(row) in (None, "")
+
+        if compare is operator.eq:
+            return is_null
+        return lambda row: not is_null(row)
+
+    if isinstance(literal, bool):
+        if compare not in (operator.eq, operator.ne):
+            raise ValueError(f"С true/false можно сравнивать только через = и !=: {op}")
+        text = str(literal).lower()
+
+        def match_bool(row: Row) -> bool:
+            value = get(row)
+            if isinstance(value, str):
+                return compare(value.lower(), text)
+            return compare(value, literal)
+
+        return match_bool
+
+    if isinstance(literal, (int, float)):
+        literal = float(literal)
+
+        def match_number(row: Row) -> bool:
+            value = _number(get(row))
+            # Пустые и нечисловые значения не проходят ни одно сравнение
+            return value is not None and compare(value, literal)
+
+        return match_number
+
+    def match_string(row: Row) -> bool:
+        value = get(row)
+        if value is None:
+            return False
+        if not isinstance(value, str):
+            value = str(value)
+        return compare(value, literal)
+
+    return match_string
+
+
+class _Parser:
+    # Рекурсивный спуск по токенам; результат - дерево замыканий
+
+    def __init__(self, tokens: list, field: Callable[[str], Callable]) -> None:
+        self.tokens = tokens
+        self.pos = 0
+        self.field = field
+
+    def peek(self) -> tuple[Optional[str], Optional[str]]:
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos]
+        return None, None
+
+    def take(self) -> tuple[str, str]:
+        if self.pos >= len(self.tokens):
+            raise ValueError("Неожиданный конец условия")
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def keyword(self, word: str) -> bool:
+        kind, text = self.peek()
+        if kind == "word" and text.lower() == word:
+            self.pos += 1
+            return True
+        return False
+
+    def parse(self) -> Predicate:
+        predicate = self.parse_or()
+        if self.pos != len(self.tokens):
+            raise ValueError(f"Лишнее в условии: {self.tokens[self.pos][1]!r}")
+        return predicate
+
+    def parse_or(self) -> Predicate:
+        parts = [self.parse_and()]
+        while self.keyword("or"):
+            parts.append(self.parse_and())
+        if len(parts) == 1:
+            return parts[0]
+        return lambda row: any(part(row) for part in parts)
+
+    def parse_and(self) -> Predicate:
+        parts = [self.parse_not()]
+        while self.keyword("and"):
+            parts.append(self.parse_not())
+        if len(parts) == 1:
+            return parts[0]
+        return lambda row: all(part(row) for part in parts)
+
+    def parse_not(self) -> Predicate:
+        if self.keyword("not"):
+            inner = self.parse_not()
+            return lambda row: not inner(row)
+        if self.peek() == ("paren", "("):
+            self.pos += 1
+            inner = self.parse_or()
+            if self.take() != ("paren", ")"):
+                raise ValueError("Ожидалась ')' в условии")
+            return inner
+        return self.parse_comparison()
+
+    def parse_comparison(self) -> Predicate:
+        kind, name = self.take()
+        if kind == "name":
+            name = name[1:-1]
+        elif kind != "word" or name.lower() in _KEYWORDS:
+            raise ValueError(f"Ожидалось имя поля в условии: {name!r}")
+        op_kind, op = self.take()
+        if op_kind != "op":
+            raise ValueError(f"Ожидался оператор сравнения после {name!r}: {op!r}")
+        value_kind, value = self.take()
+        if value_kind not in ("word", "string"):
+            raise ValueError(f"Ожидалось значение после {op!r}: {value!r}")
+        return _comparison(self.field(name), op, _literal(value_kind, value))
+
+
+def _field_index(fieldnames: Sequence[str], name: str) -> int:
+    try:
+        return list(fieldnames).index(name)
+    except ValueError:
+        raise ValueError(f"Колонка не найдена: {name}") from None
+
+
+def compile_where(expr: str, fieldnames: Optional[Sequence[str]] = None) -> Predicate:
+    """
+    Компилирует условие --where в функцию row -> bool (разбор - один раз).
+
+    Если заданы fieldnames, строки - последовательности значений (как
+    у csv.reader) и имена полей заранее переводятся в индексы; иначе
+    строки - словари и отсутствующее поле считается null.
+
+    Сравнение с числом - числовое (нечисловые и пустые значения его не
+    проходят), со строкой - строковое, "= null" - поле пустое или отсутствует.
+
+    Raises:
+        ValueError: синтаксическая ошибка или неизвестная колонка
+    """
+
+    def field(name: str) -> Callable[[Row], Any]:
+        if fieldnames is None:
+            return lambda row: row.get(name)
+        return operator.itemgetter(_field_index(fieldnames, name))
+
+    tokens = _tokenize(expr)
+    if not tokens:
+        raise ValueError("Пустое условие")
+    return _Parser(tokens, field).parse()
+
+
+def parse_columns(spec: str) -> list[str]:
+    """Список колонок --columns: "a,b, c" -> ["a", "b", "c"]"""
+    columns = [name.strip() for name in spec.split(",") if name.strip()]
+    if not columns:
+        raise ValueError("Пустой список колонок")
+    return columns
+
+
+def row_getter(
+    fieldnames: Sequence[str], columns: Sequence[str]
+) -> Callable[[Sequence], tuple]:
+    """Функция строка -> кортеж значений выбранных колонок (по индексам)"""
+    indices = [_field_index(fieldnames, name) for name in columns]
+    if len(indices) == 1:
+        index = indices[0]
+        return lambda row: (row[index],)
+    return operator.itemgetter(*indices)
@@ -0,0 +1,60 @@
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("openpyxl")
+
+sys.path.append(".")
+from src.lab06.batch import plan_batch, run_batch, source_format
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+class TestBatch:
+    """Тесты для пакетной конвертации"""
+
+    def test_source_format(self):
+        assert source_format("a/b.csv") == "csv"
+        assert source_format("b.JSON.gz") == "json"
+        assert source_format("b.ndjson") == "jsonl"
+        assert source_format("README") is None
+
+    def test_plan_keeps_subdirs(self, tmp_path):
+        write(tmp_path / "in" / "a.csv", "x\n1\n")
+        write(tmp_path / "in" / "sub" / "b.csv.gz", "")
+        write(tmp_path / "in" / "note.txt", "")
+        tasks, failures = plan_batch([str(tmp_path / "in")], tmp_path / "out", "json")
+        outputs = sorted(os.path.relpath(out, tmp_path / "out") for _, _, out in tasks)
+        assert outputs == ["a.json", os.path.join("sub", "b.json")]
+        assert failures == []
+
+    def test_plan_reports_unsupported_and_empty_patterns(self, tmp_path):
+        write(tmp_path / "note.txt", "")
+        pattern = str(tmp_path / "*.txt")
+        missing = str(tmp_path / "*.json")
+        tasks, failures = plan_batch([pattern, missing], tmp_path / "out", "csv")
+        assert tasks == []
+        assert [message for _, message in failures] == [
+            "нет файлов по шаблону",
+            "нет конвертации txt -> csv",
+        ]
+
+    def test_run_skips_up_to_date_and_collects_failures(self, tmp_path):
+        write(tmp_path / "in" / "a.csv", "x\n1\n")
+        write(tmp_path / "in" / "bad.csv", "x\n")
+        out = tmp_path / "out"
+
+        stats = run_batch([str(tmp_path / "in")], out, "json", workers=2)
+        assert (stats["converted"], stats["skipped"], stats["failed"]) == (1, 0, 1)
+        assert "только заголовок" in stats["failures"][0][1]
+        assert (out / "a.json").exists()
+
+        stats = run_batch([str(tmp_path / "in")], out, "json", workers=1)
+        assert (stats["converted"], stats["skipped"], stats["failed"]) == (0, 1, 1)
+
+        stats = run_batch([str(tmp_path / "in")], out, "json", workers=1, force=True)
+        assert stats["converted"] == 1
@@ -0,0 +1,66 @@
+import sys
+
+import pytest
+
+sys.path.append("src")
+from lib.bench_text import (
+    bench_corpus,
+    compare_results,
+    generate_corpus,
+    parse_size,
+    peak_memory,
+)
+
+
+class TestBenchText:
+    """Тесты для бенчмарков lib.text"""
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [("1KB", 1024), ("2mb", 2 << 20), ("1GB", 1 << 30), ("512", 512)],
+    )
+    def test_parse_size(self, text, expected):
+        assert parse_size(text) == expected
+
+    def test_parse_size_invalid(self):
+        with pytest.raises(ValueError):
+            parse_size("много")
+
+    def test_generate_corpus_is_reproducible(self, tmp_path):
+        """Один seed - один и тот же корпус"""
+        first = generate_corpus(tmp_path / "a.txt", "mixed", 4096, seed=7)
+        second = generate_corpus(tmp_path / "b.txt", "mixed", 4096, seed=7)
+        other = generate_corpus(tmp_path / "c.txt", "mixed", 4096, seed=8)
+        assert first.read_bytes() == second.read_bytes()
+        assert first.read_bytes() != other.read_bytes()
+        assert 4000 <= first.stat().st_size <= 4096
+
+    def test_bench_corpus(self, tmp_path):
+        """Результаты содержат все функции и пропускную способность"""
+        path = generate_corpus(tmp_path / "ru.txt", "ru", 2048)
+        results = bench_corpus(path, repeat=2, warmup=0)
+        assert set(results) == {"normalize", "tokenize", "count_freq", "top_n"}
+        assert results["tokenize"]["volume"] == results["count_freq"]["volume"]
+
+    def test_peak_memory_per_case(self, tmp_path):
+        """Пик памяти меряется для каждого корпуса отдельно"""
+        small = generate_corpus(tmp_path / "small.txt", "en", 1024)
+        large = generate_corpus(tmp_path / "large.txt", "en", 1 << 20)
+        assert peak_memory(large) > peak_memory(small)
+        # Больший корпус, замеренный раньше, не завышает пик меньшего
+        assert peak_memory(small) < peak_memory(large) / 4
+
+    def test_compare_results(self):
+        """Регрессия фиксируется только при падении больше порога"""
+
+        def make(rate):
+            return {
+                "cases": [
+                    {"corpus": "ru-1KB", "results": {"tokenize": {"per_second": rate}}}
+                ]
+            }
+
+        assert compare_results(make(100), make(95), threshold=0.1) == []
+        (regression,) = compare_results(make(100), make(80), threshold=0.1)
+        assert regression["benchmark"] == "tokenize"
+        assert regression["change"] == pytest.approx(-0.2)
@@ -0,0 +1,115 @@
+import json
+import sys
+
+import pytest
+
+sys.path.append("src")
+from lib.cache import ResultCache, code_sources, code_version
+from lib.text import normalize
+
+
+class TestResultCache:
+    """Тесты для кэша результатов по содержимому входов"""
+
+    def make(self, tmp_path, **kwargs):
+        src = tmp_path / "in.txt"
+        src.write_text("Привет мир", encoding="utf-8")
+        calls = []
+
+        def compute():
+            calls.append(1)
+            dst.write_text(normalize(src.read_text(encoding="utf-8")), encoding="utf-8")
+
+        dst = tmp_path / "out" / "result.txt"
+        dst.parent.mkdir()
+        cache = ResultCache(tmp_path / "cache", **kwargs)
+        return cache, src, dst, compute, calls
+
+    def test_hit_after_miss(self, tmp_path):
+        """Повторный запуск на том же входе берется из кэша"""
+        cache, src, dst, compute, calls = self.make(tmp_path)
+        assert cache.run("norm", [src], dst, compute) is False
+        dst.unlink()
+        assert cache.run("norm", [src], dst, compute) is True
+        assert dst.read_text(encoding="utf-8") == "привет мир"
+        assert len(calls) == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_key_depends_on_content_params_version(self, tmp_path):
+        """Изменение входа, параметров или версии кода - промах"""
+        cache, src, dst, compute, calls = self.make(tmp_path)
+        cache.run("norm", [src], dst, compute)
+        assert cache.run("norm", [src], dst, compute, {"casefold": False}) is False
+        assert cache.run("norm", [src], dst, compute, version="v2") is False
+        src.write_text("Другой текст", encoding="utf-8")
+        assert cache.run("norm", [src], dst, compute) is False
+        assert dst.read_text(encoding="utf-8") == "другой текст"
+        assert len(calls) == 4
+
+    def test_overwritten_link_is_not_served(self, tmp_path):
+        """Перезапись выходного файла на месте не портит ответы кэша"""
+        cache, src, dst, compute, calls = self.make(tmp_path)
+        cache.run("norm", [src], dst, compute)
+        cache.run("norm", [src], dst, compute)
+        with dst.open("w", encoding="utf-8") as f:
+            f.write("испорчено")
+        assert cache.run("norm", [src], dst, compute) is False
+        assert dst.read_text(encoding="utf-8") == "привет мир"
+
+    def test_lru_eviction_and_purge(self, tmp_path):
+        """Сверх лимита вытесняются давно не использованные объекты"""
+        cache, src, dst, compute, calls = self.make(tmp_path, max_bytes=30)
+        for version in ("a", "b", "c"):
+            cache.run("norm", [src], dst, compute, version=version)
+        assert cache.stats()["entries"] == 1
+        assert cache.stats()["bytes"] <= 30
+
+        cache.purge()
+        assert cache.stats() == ResultCache(tmp_path / "cache", max_bytes=30).stats()
+        assert cache.stats()["entries"] == 0
+
+    def test_code_version(self):
+        """Версия кода зависит от исходного файла функции"""
+        assert code_version(normalize) == code_version(normalize)
+        assert code_version(normalize) != code_version(ResultCache)
+
+    def test_code_sources_transitive(self):
+        """В версию входят и модули проекта, импортированные модулем функции"""
+        from lab05.json_csv import csv_to_json
+
+        names = {path.name for path in code_sources(csv_to_json)}
+        assert {"json_csv.py", "io_helpers.py", "csv_types.py", "where.py"} <= names
+        assert [path.name for path in code_sources(normalize)] == ["text.py"]
+
+    def test_schema_content_in_key(self, tmp_path, capsys):
+        """Изменённая схема (по тому же пути) - промах кэша"""
+        pytest.importorskip("openpyxl")
+        sys.path.append(".")
+        from src.lab05.json_csv import csv_to_json
+        from src.lab06.cli_convert import run_conversion
+
+        src = tmp_path / "in.csv"
+        src.write_text("a\n1\n", encoding="utf-8")
+        schema = tmp_path / "in.schema.json"
+        dst = tmp_path / "out.json"
+        cache_dir = str(tmp_path / "cache")
+
+        def convert():
+            run_conversion(
+                csv_to_json, str(src), str(dst), cache_dir, schema_file=str(schema)
+            )
+            return json.loads(dst.read_text(encoding="utf-8"))
+
+        # Первый запуск сохраняет выведенную схему, второй - кэшируется
+        assert convert() == [{"a": 1}]
+        assert schema.exists()
+        assert convert() == [{"a": 1}]
+        assert "из кэша" not in capsys.readouterr().out
+        assert convert() == [{"a": 1}]
+        assert "из кэша" in capsys.readouterr().out
+
+        schema.write_text(
+            json.dumps({"version": 1, "columns": {"a": "str"}}), encoding="utf-8"
+        )
+        assert convert() == [{"a": "1"}]
@@ -0,0 +1,61 @@
+import sys
+
+sys.path.append("src")
+from lib.checkpoint import incremental_counts, load_state, state_path_for
+from lib.text import count_freq, normalize, tokenize
+
+
+def exact(path):
+    return count_freq(tokenize(normalize(path.read_text(encoding="utf-8"))))
+
+
+class TestIncrementalCounts:
+    """Тесты для инкрементального подсчета частот"""
+
+    def test_state_path_for(self, tmp_path):
+        """Файл состояния лежит рядом с отчетом"""
+        report = tmp_path / "report.csv"
+        assert state_path_for(report) == tmp_path / "report.csv.state.json"
+
+    def test_append_reads_only_tail(self, tmp_path):
+        """При дописывании читается только новый хвост"""
+        log = tmp_path / "log.txt"
+        state = tmp_path / "report.csv.state.json"
+
+        log.write_text("привет мир\nмир те", encoding="utf-8")
+        freq, read = incremental_counts(log, state)
+        assert freq == exact(log)
+        assert read == log.stat().st_size
+
+        offset = load_state(state)["offset"]
+        with log.open("a", encoding="utf-8") as f:
+            f.write("ст привет\n")
+        freq, read = incremental_counts(log, state)
+        assert freq == exact(log)
+        assert freq["тест"] == 1
+        assert read == log.stat().st_size - offset
+
+    def test_truncation_triggers_rebuild(self, tmp_path):
+        """Усечение файла приводит к полному пересчету"""
+        log = tmp_path / "log.txt"
+        state = tmp_path / "state.json"
+
+        log.write_text("один два три четыре\n", encoding="utf-8")
+        incremental_counts(log, state)
+
+        log.write_text("пять\n", encoding="utf-8")
+        freq, read = incremental_counts(log, state)
+        assert freq == {"пять": 1}
+        assert read == log.stat().st_size
+
+    def test_rewrite_with_same_size_triggers_rebuild(self, tmp_path):
+        """Перезапись начала файла обнаруживается по хешу"""
+        log = tmp_path / "log.txt"
+        state = tmp_path / "state.json"
+
+        log.write_text("aaa bbb\n", encoding="utf-8")
+        incremental_counts(log, state)
+
+        log.write_text("ccc ddd\neee\n", encoding="utf-8")
+        freq, _ = incremental_counts(log, state)
+        assert freq == exact(log)
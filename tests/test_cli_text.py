@@ -0,0 +1,94 @@
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.append(".")
+from src.lab06.cli_text import cat_command, main
+
+
+class TestCat:
+    """Тесты для команды cat"""
+
+    def test_regular_file(self, tmp_path, capfdbinary):
+        path = tmp_path / "a.txt"
+        path.write_bytes("один\r\nдва\nтри".encode("utf-8"))
+        cat_command(str(path))
+        assert capfdbinary.readouterr().out == path.read_bytes()
+
+    def test_regular_file_numbered(self, tmp_path, capsys):
+        path = tmp_path / "a.txt"
+        path.write_text("один\nдва\n", encoding="utf-8")
+        cat_command(str(path), number_lines=True)
+        assert capsys.readouterr().out == "     1\tодин\n     2\tдва\n"
+
+    def test_empty_file(self, tmp_path, capfdbinary):
+        path = tmp_path / "empty.txt"
+        path.write_bytes(b"")
+        cat_command(str(path))
+        cat_command(str(path), number_lines=True)
+        assert capfdbinary.readouterr().out == b""
+
+    @pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="нет FIFO")
+    @pytest.mark.parametrize("number_lines", [False, True])
+    def test_fifo(self, tmp_path, capfdbinary, number_lines):
+        # У FIFO st_size == 0, но данные в нём есть
+        path = tmp_path / "pipe"
+        os.mkfifo(path)
+        data = b"x\n" * 100000 + b"end"
+
+        def writer():
+            with open(path, "wb") as f:
+                f.write(data)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        cat_command(str(path), number_lines=number_lines)
+        thread.join()
+
+        out = capfdbinary.readouterr().out
+        if number_lines:
+            lines = data.split(b"\n")
+            expected = b"".join(
+                b"%6d\t%s\n" % (i, line) for i, line in enumerate(lines, 1)
+            )
+            assert out == expected
+        else:
+            assert out == data
+
+
+class TestStatsOptions:
+    """Тесты для проверки опций команды stats"""
+
+    @pytest.mark.parametrize(
+        "options, message",
+        [
+            (["--approx", "--ngram", "2"], "--approx и --ngram"),
+            (["--ngram", "2", "--workers", "2"], "--ngram и --workers"),
+            (["--min-count", "2"], "--min-count без --ngram"),
+            (["--approx", "--min-count", "2"], "--min-count без --ngram"),
+            (["--capacity", "50"], "--capacity без --approx"),
+        ],
+    )
+    def test_rejects_conflicts(self, tmp_path, monkeypatch, capsys, options, message):
+        path = tmp_path / "a.txt"
+        path.write_text("кот и кот", encoding="utf-8")
+        argv = ["cli_text", "stats", "--input", str(path), *options]
+        monkeypatch.setattr(sys, "argv", argv)
+        with pytest.raises(SystemExit) as exc:
+            main()
+        assert exc.value.code == 2
+        captured = capsys.readouterr()
+        assert message in captured.err
+        assert "Всего" not in captured.out
+
+    def test_ngram_with_min_count(self, tmp_path, monkeypatch, capsys):
+        path = tmp_path / "a.txt"
+        path.write_text("серый кот, серый кот, белый кот", encoding="utf-8")
+        argv = ["cli_text", "stats", "--input", str(path), "--ngram", "2"]
+        monkeypatch.setattr(sys, "argv", argv + ["--min-count", "2"])
+        main()
+        out = capsys.readouterr().out
+        assert "Всего 2-грамм: 5" in out
+        assert "серый кот" in out and "белый кот" not in out
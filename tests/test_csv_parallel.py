@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+import sys
+
+import pytest
+
+sys.path.append("src")
+from lab05.json_csv import csv_to_json
+from lib.csv_parallel import (
+    iter_csv_dicts,
+    iter_csv_rows,
+    read_csv_header,
+    split_csv_ranges,
+)
+
+ROWS = [["id", "text"]] + [
+    [str(i), text]
+    for i, text in enumerate(
+        [
+            "просто",
+            'с "кавычками"',
+            "много\nстрок\r\nв поле",
+            "запятая, внутри",
+            '"',
+            "\n",
+            'a"\nb',
+        ]
+        * 40
+    )
+]
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "data.csv"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(ROWS)
+    return path
+
+
+class TestCsvParallel:
+    """Тесты для параллельного разбора CSV"""
+
+    @pytest.mark.parametrize("chunk_size", [1, 5, 64, 1 << 20])
+    def test_ranges_on_record_boundaries(self, csv_path, chunk_size):
+        data = csv_path.read_bytes()
+        ranges = split_csv_ranges(csv_path, chunk_size)
+        assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+        assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+        rows = []
+        for start, end in ranges:
+            text = data[start:end].decode("utf-8")
+            rows.extend(csv.reader(io.StringIO(text, newline="")))
+        assert rows == ROWS
+
+    def test_read_csv_header(self, csv_path, tmp_path):
+        header, start = read_csv_header(csv_path)
+        assert header == ["id", "text"]
+        assert start == len("id,text\r\n")
+
+        empty = tmp_path / "empty.csv"
+        empty.write_text("")
+        assert read_csv_header(empty) == (None, 0)
+
+    def test_rows_in_order(self, csv_path):
+        rows = list(iter_csv_rows(csv_path, workers=2, chunk_size=50))
+        assert rows == ROWS
+
+    def test_dicts_match_dictreader(self, csv_path):
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            expected = list(csv.DictReader(f))
+        assert list(iter_csv_dicts(csv_path, workers=2, chunk_size=50)) == expected
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_csv_to_json_parallel_same_output(self, csv_path, tmp_path, compact):
+        single = tmp_path / "single.json"
+        parallel = tmp_path / "parallel.json"
+        csv_to_json(str(csv_path), str(single), compact=compact)
+        csv_to_json(str(csv_path), str(parallel), compact=compact, workers=2)
+        assert parallel.read_bytes() == single.read_bytes()
+        assert len(json.loads(parallel.read_text(encoding="utf-8"))) == len(ROWS) - 1
+
+    def test_csv_to_json_parallel_header_only(self, tmp_path):
+        path = tmp_path / "header.csv"
+        path.write_text("a,b\n", encoding="utf-8")
+        with pytest.raises(ValueError, match="только заголовок"):
+            csv_to_json(str(path), str(tmp_path / "out.json"), workers=2)
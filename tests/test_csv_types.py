@@ -0,0 +1,103 @@
+import json
+import sys
+
+sys.path.append("src")
+from lab05.json_csv import csv_to_json
+from lib.csv_types import (
+    guess_value,
+    infer_schema,
+    infer_type,
+    load_schema,
+    make_converters,
+    save_schema,
+)
+
+
+class TestCsvTypes:
+    """Тесты для определения типов колонок CSV"""
+
+    def test_infer_type(self):
+        assert infer_type(["1", "-20", ""]) == "int"
+        assert infer_type(["1", "2.5", "1e3"]) == "float"
+        assert infer_type(["true", "False"]) == "bool"
+        assert infer_type(["2024-01-31", "2024-02-01T10:00:00"]) == "date"
+        assert infer_type(["", ""]) == "null"
+        assert infer_type(["007", "12"]) == "str"
+        assert infer_type(["2024-02-30"]) == "str"
+        assert infer_type(["1", "abc"]) == "str"
+
+    def test_infer_schema(self):
+        rows = [["1", "a", ""], ["2", "b", "1.5"]]
+        assert infer_schema(rows, ["id", "name", "x"]) == ["int", "str", "float"]
+
+    def test_converters_fall_back(self):
+        to_int, to_bool, to_str = make_converters(["int", "bool", "str"])
+        assert to_int("42") == 42
+        assert to_int("") is None
+        assert to_int("4.5") == 4.5
+        assert to_int("007") == "007"
+        assert to_bool("TRUE") is True
+        assert to_bool("n/a") == "n/a"
+        assert to_str("") == ""
+        assert guess_value("nan") == "nan"
+
+    def test_converters_reject_python_literals(self):
+        """Формы, которые понимают int() и float(), но не число CSV"""
+        to_int, to_float = make_converters(["int", "float"])
+        for value in ("1_000", " 12", "12 ", "+5", "١٢"):
+            assert to_int(value) == value
+            assert to_float(value) == value
+        assert to_float("1_000.5") == "1_000.5"
+        assert to_float("inf") == "inf"
+        assert to_float("1e999") == "1e999"
+        assert to_float("-1.5e3") == -1500.0
+        assert to_int("-12") == -12
+
+    def test_schema_file(self, tmp_path):
+        path = tmp_path / "data.csv.schema.json"
+        save_schema(path, ["a", "b"], ["int", "str"])
+        assert load_schema(path, ["a", "b"]) == ["int", "str"]
+        # Схема другого заголовка не подходит
+        assert load_schema(path, ["a", "c"]) is None
+        assert load_schema(tmp_path / "none.json", ["a"]) is None
+
+    def test_csv_to_json_infer_types(self, tmp_path):
+        csv_file = tmp_path / "data.csv"
+        csv_file.write_text(
+            "id,price,ok,day,note\n1,2.5,true,2024-01-31,\n2,3,false,,x\n",
+            encoding="utf-8",
+        )
+        json_file = tmp_path / "data.json"
+
+        csv_to_json(str(csv_file), str(json_file), infer_types=True)
+
+        data = json.loads(json_file.read_text(encoding="utf-8"))
+        assert data == [
+            {"id": 1, "price": 2.5, "ok": True, "day": "2024-01-31", "note": ""},
+            {"id": 2, "price": 3.0, "ok": False, "day": None, "note": "x"},
+        ]
+
+    def test_csv_to_json_mispredicted_type(self, tmp_path):
+        csv_file = tmp_path / "data.csv"
+        csv_file.write_text("n\n1\n2\nмного\n", encoding="utf-8")
+        json_file = tmp_path / "data.json"
+
+        csv_to_json(str(csv_file), str(json_file), infer_types=True, sample_rows=2)
+
+        data = json.loads(json_file.read_text(encoding="utf-8"))
+        assert [row["n"] for row in data] == [1, 2, "много"]
+
+    def test_csv_to_json_schema_file_reused(self, tmp_path):
+        csv_file = tmp_path / "data.csv"
+        csv_file.write_text("a,b\n1,2\n", encoding="utf-8")
+        schema = tmp_path / "data.csv.schema.json"
+        json_file = tmp_path / "data.json"
+
+        csv_to_json(str(csv_file), str(json_file), schema_file=str(schema))
+        assert load_schema(schema, ["a", "b"]) == ["int", "int"]
+
+        # Схема из файла используется без выборки
+        save_schema(schema, ["a", "b"], ["str", "int"])
+        csv_to_json(str(csv_file), str(json_file), schema_file=str(schema))
+        data = json.loads(json_file.read_text(encoding="utf-8"))
+        assert data == [{"a": "1", "b": 2}]
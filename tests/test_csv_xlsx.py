@@ -0,0 +1,92 @@
+import csv
+import gzip
+import sys
+
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+
+sys.path.append("src")
+from lab05.csv_xlsx import csv_to_xlsx
+
+NOTE = 'многострочная\n"заметка"'
+LAST = "Длинное имя в конце файла"
+
+ROWS = (
+    [
+        ["name", "city", "note"],
+        ["Алиса", "Москва", "a"],
+        ["Боб", "Санкт-Петербург", "b"],
+    ]
+    + [["x", "y", "z"] for _ in range(50)]
+    + [["Вера", "Казань", NOTE], [LAST, "", ""]]
+)
+
+
+def write_csv_text(path):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        csv.writer(f, lineterminator="\n").writerows(ROWS)
+    return path
+
+
+def read_book(path):
+    wb = openpyxl.load_workbook(path)
+    ws = wb.active
+    values = [
+        [cell if cell is not None else "" for cell in row]
+        for row in ws.iter_rows(values_only=True)
+    ]
+    widths = [ws.column_dimensions[letter].width for letter in "ABC"]
+    return values, widths
+
+
+class TestCsvXlsx:
+    """Тесты для конвертации CSV в XLSX"""
+
+    def test_values_roundtrip(self, tmp_path):
+        src = write_csv_text(tmp_path / "data.csv")
+        out = tmp_path / "out" / "data.xlsx"
+        csv_to_xlsx(str(src), str(out))
+        values, _ = read_book(out)
+        assert values == ROWS
+
+    def test_width_sample(self, tmp_path):
+        """Ширина - по первым width_sample строкам, None - по всему файлу"""
+        src = write_csv_text(tmp_path / "data.csv")
+        out = tmp_path / "data.xlsx"
+
+        csv_to_xlsx(str(src), str(out), width_sample=3)
+        _, widths = read_book(out)
+        # Видны только заголовок, "Алиса" и "Санкт-Петербург"; минимум - 8
+        assert widths == [8, len("Санкт-Петербург") + 2, 8]
+
+        csv_to_xlsx(str(src), str(out), width_sample=None)
+        _, widths = read_book(out)
+        assert widths == [len(LAST) + 2, len("Санкт-Петербург") + 2, len(NOTE) + 2]
+
+    @pytest.mark.parametrize("width_sample", [3, None])
+    def test_workers_match_serial(self, tmp_path, width_sample):
+        src = write_csv_text(tmp_path / "data.csv")
+        serial = tmp_path / "serial.xlsx"
+        parallel = tmp_path / "parallel.xlsx"
+        csv_to_xlsx(str(src), str(serial), width_sample=width_sample)
+        csv_to_xlsx(str(src), str(parallel), width_sample=width_sample, workers=2)
+        assert read_book(parallel) == read_book(serial)
+
+    def test_compressed_input(self, tmp_path):
+        src = write_csv_text(tmp_path / "data.csv")
+        packed = tmp_path / "data.csv.gz"
+        packed.write_bytes(gzip.compress(src.read_bytes()))
+        out = tmp_path / "data.xlsx"
+        csv_to_xlsx(str(packed), str(out), width_sample=None, workers=2)
+        plain = tmp_path / "plain.xlsx"
+        csv_to_xlsx(str(src), str(plain), width_sample=None)
+        assert read_book(out) == read_book(plain)
+
+    def test_errors(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            csv_to_xlsx(str(tmp_path / "missing.csv"), str(tmp_path / "x.xlsx"))
+        empty = tmp_path / "empty.csv"
+        empty.write_text("", encoding="utf-8")
+        with pytest.raises(ValueError):
+            csv_to_xlsx(str(empty), str(tmp_path / "x.xlsx"))
@@ -0,0 +1,39 @@
+import sys
+
+sys.path.append("src")
+from lib.external_sort import SpillingCounter
+from lib.text import count_freq, top_n
+
+TOKENS = ("b a c a d e b a f g h c i j k a l m n b " * 3).split() + ["z", "y"]
+
+
+class TestSpillingCounter:
+    """Тесты для подсчета частот с внешней сортировкой"""
+
+    def test_in_memory_matches_sort(self):
+        """Без сброса на диск порядок совпадает с top_n"""
+        with SpillingCounter(max_items=100) as counter:
+            counter.update(TOKENS)
+            result = list(counter.sorted_items())
+            assert counter.spilled == 0
+        freq = count_freq(TOKENS)
+        assert result == top_n(freq, len(freq))
+        assert counter.unique == len(freq)
+
+    def test_spilled_matches_in_memory(self, tmp_path):
+        """Со сбросом прогонов результат и порядок те же, что в памяти"""
+        with SpillingCounter(max_items=3, tmp_dir=tmp_path) as counter:
+            counter.update(TOKENS)
+            result = list(counter.sorted_items())
+            assert counter.spilled > 1
+        freq = count_freq(TOKENS)
+        assert result == sorted(freq.items(), key=lambda kv: (-kv[1], kv[0]))
+        assert counter.total == len(TOKENS)
+        assert counter.unique == len(freq)
+
+    def test_close_removes_runs(self, tmp_path):
+        """Временные файлы удаляются после закрытия"""
+        with SpillingCounter(max_items=2, tmp_dir=tmp_path) as counter:
+            counter.update(TOKENS)
+            list(counter.sorted_items())
+        assert list(tmp_path.iterdir()) == []
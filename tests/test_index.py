@@ -0,0 +1,109 @@
+import os
+import sys
+
+sys.path.append("src")
+from lib.index import (
+    InvertedIndex,
+    compact_index,
+    decode_postings,
+    encode_postings,
+    parse_query,
+    update_index,
+)
+
+
+def build(tmp_path, files):
+    docs = tmp_path / "docs"
+    docs.mkdir(exist_ok=True)
+    for name, text in files.items():
+        (docs / name).write_text(text, encoding="utf-8")
+    index_dir = tmp_path / "index"
+    update_index(index_dir, [docs])
+    return docs, index_dir
+
+
+def names(results):
+    return [os.path.basename(path) for path, _ in results]
+
+
+class TestInvertedIndex:
+    """Тесты для позиционного инвертированного индекса"""
+
+    FILES = {
+        "a.txt": "Привет, мир! Серый кот спит.",
+        "b.txt": "мир и кот. Мир без кота, мир.",
+        "c.txt": "собака лает, ёжик молчит",
+    }
+
+    def test_postings_roundtrip(self):
+        """Кодирование постингов обратимо"""
+        postings = [(0, [0, 5, 300]), (7, [2]), (1000, [0, 1, 2, 100000])]
+        data = bytearray()
+        encode_postings(postings, data)
+        assert list(decode_postings(bytes(data))) == postings
+
+    def test_parse_query(self):
+        """Слова - AND, OR разделяет группы, кавычки - фраза"""
+        assert parse_query('Кот "Серый мир" OR собака') == [
+            [("кот",), ("серый", "мир")],
+            [("собака",)],
+        ]
+
+    def test_term_and_or(self, tmp_path):
+        """Поиск по терму, AND и OR"""
+        _, index_dir = build(tmp_path, self.FILES)
+        with InvertedIndex(index_dir) as index:
+            assert len(index) == 3
+            assert names(index.search("мир")) == ["b.txt", "a.txt"]
+            assert names(index.search("мир кот")) == ["b.txt", "a.txt"]
+            assert names(index.search("мир привет")) == ["a.txt"]
+            assert sorted(names(index.search("привет OR ежик"))) == ["a.txt", "c.txt"]
+            assert index.search("нет такого") == []
+
+    def test_phrase(self, tmp_path):
+        """Фраза ищется по соседним позициям"""
+        _, index_dir = build(tmp_path, self.FILES)
+        with InvertedIndex(index_dir) as index:
+            assert names(index.search('"серый кот"')) == ["a.txt"]
+            assert index.search('"кот серый"') == []
+
+    def test_incremental_update(self, tmp_path):
+        """Изменённые и удалённые файлы учитываются без полной пересборки"""
+        docs, index_dir = build(tmp_path, self.FILES)
+        (docs / "c.txt").write_text("собака и кот, кот", encoding="utf-8")
+        (docs / "a.txt").unlink()
+        (docs / "d.txt").write_text("новый серый кот", encoding="utf-8")
+
+        stats = update_index(index_dir, [docs])
+        assert stats == {
+            "added": 1,
+            "updated": 1,
+            "removed": 1,
+            "unchanged": 1,
+            "skipped": 0,
+        }
+        with InvertedIndex(index_dir) as index:
+            assert sorted(names(index.search("кот"))) == ["b.txt", "c.txt", "d.txt"]
+            assert names(index.search('"серый кот"')) == ["d.txt"]
+            before = index.search("кот")
+
+        compact_index(index_dir)
+        assert len(list(index_dir.glob("*.lex"))) == 1
+        with InvertedIndex(index_dir) as index:
+            assert index.search("кот") == before
+
+    def test_index_inside_root(self, tmp_path):
+        """Файлы индекса внутри индексируемой директории не индексируются"""
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        for name, text in self.FILES.items():
+            (docs / name).write_text(text, encoding="utf-8")
+        index_dir = docs / ".index"
+
+        assert update_index(index_dir, [docs])["added"] == 3
+        # Повторный запуск видит свои сегменты, но не считает их документами
+        stats = update_index(index_dir, [docs])
+        assert stats["added"] == 0 and stats["unchanged"] == 3
+        with InvertedIndex(index_dir) as index:
+            assert len(index) == 3
+            assert sorted(names(index.search("кот"))) == ["a.txt", "b.txt"]
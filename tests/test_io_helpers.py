@@ -0,0 +1,107 @@
+import bz2
+import csv
+import gzip
+import lzma
+import sys
+
+import pytest
+
+sys.path.append("src")
+from lib.io_helpers import (
+    detect_compression,
+    open_file,
+    read_text,
+    write_csv,
+    write_text,
+)
+
+
+class TestWriteCsv:
+    """Тесты для потоковой записи CSV"""
+
+    def test_streams_generator_in_batches(self, tmp_path):
+        """Генератор пишется пачками, результат как у обычной записи"""
+        out = tmp_path / "sub" / "rows.csv"
+        rows = ((f"слово{i}", i) for i in range(25))
+        write_csv(rows, out, header=("word", "count"), batch_size=7, buffer_size=64)
+        with out.open(encoding="utf-8", newline="") as f:
+            result = list(csv.reader(f))
+        assert result[0] == ["word", "count"]
+        assert result[1:] == [[f"слово{i}", str(i)] for i in range(25)]
+
+    def test_mismatch_raised_on_bad_row(self, tmp_path):
+        """Ошибка длины возникает на плохой строке, остаток не читается"""
+        out = tmp_path / "rows.csv"
+        out.write_text("old\n", encoding="utf-8")
+        consumed = []
+
+        def rows():
+            for row in ([1, 2], [3, 4], [5], [6, 7]):
+                consumed.append(row)
+                yield row
+
+        with pytest.raises(ValueError, match="Строка 2 имеет длину 1, ожидалось 2"):
+            write_csv(rows(), out, batch_size=1)
+        assert consumed == [[1, 2], [3, 4], [5]]
+        # Старый файл не испорчен, временный удалён
+        assert out.read_text(encoding="utf-8") == "old\n"
+        assert list(tmp_path.iterdir()) == [out]
+
+    def test_empty_rows_with_header(self, tmp_path):
+        """Без строк пишется только заголовок"""
+        out = tmp_path / "rows.csv"
+        write_csv([], out, header=("a", "b"))
+        assert out.read_bytes() == b"a,b\r\n"
+
+
+class TestCompressedIO:
+    """Тесты для прозрачной работы со сжатыми файлами"""
+
+    @pytest.mark.parametrize(
+        "suffix, module", [(".gz", gzip), (".bz2", bz2), (".xz", lzma)]
+    )
+    def test_text_roundtrip(self, tmp_path, suffix, module):
+        """write_text сжимает по расширению, read_text распаковывает"""
+        path = tmp_path / f"text.txt{suffix}"
+        write_text(path, "Привет, мир!\n", compresslevel=1)
+        assert module.decompress(path.read_bytes()).decode("utf-8") == "Привет, мир!\n"
+        assert read_text(path) == "Привет, мир!\n"
+
+    def test_detect_by_magic_bytes(self, tmp_path):
+        """При чтении сжатие определяется по содержимому, а не по имени"""
+        path = tmp_path / "archive.dat"
+        path.write_bytes(gzip.compress("данные".encode("utf-8")))
+        assert detect_compression(path) == "gzip"
+        assert read_text(path) == "данные"
+        assert detect_compression(tmp_path / "new.csv.xz", "w") == "xz"
+
+    def test_bzh_text_is_not_bz2(self, tmp_path):
+        """Обычный CSV с заголовком "BZh,..." не принимается за bz2"""
+        path = tmp_path / "plain.csv"
+        path.write_text("BZh,col\n1,2\n", encoding="utf-8")
+        assert detect_compression(path) is None
+        assert read_text(path) == "BZh,col\n1,2\n"
+
+        path.write_text("BZh9,col\n", encoding="utf-8")
+        assert detect_compression(path) is None
+        renamed = tmp_path / "archive.dat"
+        renamed.write_bytes(bz2.compress(b"BZh,col\n"))
+        assert detect_compression(renamed) == "bz2"
+
+    def test_extension_wins_over_magic(self, tmp_path):
+        """Если расширение и сигнатура не согласны, верим расширению"""
+        path = tmp_path / "data.csv.xz"
+        path.write_bytes(lzma.compress(b"a,b\n"))
+        assert detect_compression(path) == "xz"
+        path = tmp_path / "data.csv.gz"
+        path.write_bytes(lzma.compress(b"a,b\n"))
+        assert detect_compression(path) == "gzip"
+
+    def test_write_csv_compressed(self, tmp_path):
+        """write_csv пишет сжатый CSV потоково"""
+        path = tmp_path / "rows.csv.gz"
+        write_csv(((i, i * i) for i in range(100)), path, header=("n", "sq"))
+        with open_file(path, "r", newline="") as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == ["n", "sq"]
+        assert rows[-1] == ["99", "9801"]
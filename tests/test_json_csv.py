@@ -3,6 +3,8 @@ import pytest
 import sys
 import json
 import csv
+import gzip
+import lzma
 from pathlib import Path
 
 sys.path.append("src")
@@ -100,6 +102,50 @@ class TestJsonToCsv:
         with pytest.raises(ValueError, match="JSON должен содержать список"):
             json_to_csv(str(json_file), str(csv_file))
 
+    def test_json_to_csv_not_dict_items(self, tmp_path):
+        """Тест когда элементы списка не словари"""
+        json_file = tmp_path / "test.json"
+        csv_file = tmp_path / "test.csv"
+
+        json_file.write_text('[{"name": "Alice"}, 42]', encoding="utf-8")
+
+        with pytest.raises(ValueError, match="Все элементы JSON должны быть словарями"):
+            json_to_csv(str(json_file), str(csv_file))
+        assert not csv_file.exists()
+
+    def test_json_to_csv_columns_where(self, tmp_path):
+        """Выборка колонок и строк без первого прохода по ключам"""
+        json_file = tmp_path / "test.json"
+        csv_file = tmp_path / "test.csv"
+        data = [
+            {"name": "Алиса", "age": 17, "city": "Москва"},
+            {"name": "Боб", "age": 25},
+            {"name": "Чарли", "age": 30, "city": "Казань", "extra": [1, 2]},
+        ]
+        json_file.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+        json_to_csv(
+            str(json_file), str(csv_file), columns=["name", "city"], where="age >= 18"
+        )
+
+        with csv_file.open(encoding="utf-8", newline="") as f:
+            rows = list(csv.reader(f))
+        assert rows == [["name", "city"], ["Боб", ""], ["Чарли", "Казань"]]
+
+    def test_json_to_csv_where_no_match(self, tmp_path):
+        """Ни один элемент не прошёл условие - ошибка, а не пустой CSV"""
+        json_file = tmp_path / "test.json"
+        csv_file = tmp_path / "test.csv"
+        json_file.write_text('[{"a": 1}, {"a": 5}]', encoding="utf-8")
+
+        with pytest.raises(ValueError, match="Нет записей, подходящих под условие"):
+            json_to_csv(str(json_file), str(csv_file), where="a > 5")
+        assert not csv_file.exists()
+
+        # С заданными колонками заголовок известен - пишется CSV без строк
+        json_to_csv(str(json_file), str(csv_file), columns=["a"], where="a > 5")
+        assert csv_file.read_text(encoding="utf-8").splitlines() == ["a"]
+
     def test_json_to_csv_file_not_found(self, tmp_path):
         """Тест когда файл не существует"""
         json_file = tmp_path / "nonexistent.json"
@@ -158,6 +204,57 @@ class TestCsvToJson:
         with pytest.raises(ValueError, match="CSV файл пустой"):
             csv_to_json(str(csv_file), str(json_file))
 
+    def test_csv_to_json_compact(self, tmp_path):
+        """Компактный режим дает те же данные без отступов"""
+        csv_file = tmp_path / "test.csv"
+        json_file = tmp_path / "test.json"
+
+        csv_file.write_text("name,age\nАлиса,22\nБоб,25\n", encoding="utf-8")
+        csv_to_json(str(csv_file), str(json_file), compact=True)
+
+        text = json_file.read_text(encoding="utf-8")
+        assert text == '[{"name":"Алиса","age":"22"},{"name":"Боб","age":"25"}]'
+
+    def test_csv_to_json_columns_where(self, tmp_path):
+        """Выборка колонок и строк из CSV"""
+        csv_file = tmp_path / "test.csv"
+        json_file = tmp_path / "test.json"
+        csv_file.write_text(
+            "name,age,city\nАлиса,17,Москва\nБоб,25,Казань\nЧарли,30\n",
+            encoding="utf-8",
+        )
+
+        csv_to_json(
+            str(csv_file),
+            str(json_file),
+            columns=["city", "name"],
+            where="age > 18 and (city = Казань or city = null)",
+        )
+
+        data = json.loads(json_file.read_text(encoding="utf-8"))
+        assert data == [
+            {"city": "Казань", "name": "Боб"},
+            {"city": None, "name": "Чарли"},
+        ]
+
+    def test_csv_to_json_where_no_match(self, tmp_path):
+        """Если ни одна строка не прошла условие - пустой массив"""
+        csv_file = tmp_path / "test.csv"
+        json_file = tmp_path / "test.json"
+        csv_file.write_text("name,age\nАлиса,17\n", encoding="utf-8")
+
+        csv_to_json(str(csv_file), str(json_file), where="age > 100")
+
+        assert json.loads(json_file.read_text(encoding="utf-8")) == []
+
+    def test_csv_to_json_unknown_column(self, tmp_path):
+        """Неизвестная колонка в --columns"""
+        csv_file = tmp_path / "test.csv"
+        csv_file.write_text("name,age\nАлиса,17\n", encoding="utf-8")
+
+        with pytest.raises(ValueError, match="Колонка не найдена"):
+            csv_to_json(str(csv_file), str(tmp_path / "out.json"), columns=["nope"])
+
     def test_csv_to_json_file_not_found(self):
         """Тест когда файл не существует"""
         with pytest.raises(FileNotFoundError):
@@ -229,3 +326,22 @@ class TestRoundTrip:
         assert len(final_data) == 2
         # CSV корректно обрабатывает кавычки и переносы строк
         assert final_data[0]["имя"] == "Иван"
+
+    def test_round_trip_compressed(self, tmp_path):
+        """Полный цикл со сжатыми входами и выходами"""
+        original_data = [{"name": "Алиса", "age": 22}, {"name": "Боб", "age": 25}]
+        json_file1 = tmp_path / "original.json.gz"
+        json_file1.write_bytes(
+            gzip.compress(json.dumps(original_data, ensure_ascii=False).encode("utf-8"))
+        )
+        csv_file = tmp_path / "converted.csv.bz2"
+        json_file2 = tmp_path / "final.json.xz"
+
+        json_to_csv(str(json_file1), str(csv_file))
+        csv_to_json(str(csv_file), str(json_file2), compresslevel=1)
+
+        final_data = json.loads(lzma.decompress(json_file2.read_bytes()))
+        assert final_data == [
+            {"age": "22", "name": "Алиса"},
+            {"age": "25", "name": "Боб"},
+        ]
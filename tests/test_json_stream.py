@@ -0,0 +1,111 @@
+import io
+import json
+import random
+import sys
+
+import pytest
+
+sys.path.append("src")
+from lib.json_stream import NotAnArrayError, iter_json_array, write_json_array
+
+DATA = [
+    {"name": "Алиса", "age": 22, "tags": ["a", "b"], "score": 12345.678},
+    123456789,
+    "строка с ] и , внутри",
+    None,
+    True,
+    [1, [2, [3]]],
+    {"вложенный": {"ключ": "значение " * 50}},
+]
+
+
+class TestIterJsonArray:
+    """Тесты для потокового разбора JSON-массива"""
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 1 << 20])
+    def test_matches_json_load(self, chunk_size):
+        """Результат не зависит от размера куска чтения"""
+        for indent in (None, 2):
+            text = json.dumps(DATA, ensure_ascii=False, indent=indent)
+            result = list(iter_json_array(io.StringIO(text), chunk_size))
+            assert result == DATA
+
+    def test_number_on_chunk_boundary(self):
+        """Число, разрезанное границей куска, не обрезается"""
+        assert list(iter_json_array(io.StringIO("[12345]"), chunk_size=3)) == [12345]
+        assert list(iter_json_array(io.StringIO(" [ ] "), chunk_size=2)) == []
+        assert list(iter_json_array(io.StringIO("[1.5]"), chunk_size=1)) == [1.5]
+        assert list(iter_json_array(io.StringIO("[-2e+10,7]"), 2)) == [-2e10, 7]
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7])
+    def test_random_arrays(self, chunk_size):
+        """Случайные массивы разбираются так же, как json.loads"""
+        rng = random.Random(chunk_size)
+
+        def scalar():
+            return rng.choice(
+                [
+                    rng.randint(-(10**6), 10**6),
+                    rng.uniform(-1e3, 1e3),
+                    rng.uniform(-1, 1) * 10 ** rng.randint(-30, 30),
+                    rng.choice([True, False, None]),
+                    "".join(rng.choice('ab ,]["\\\n') for _ in range(3)),
+                ]
+            )
+
+        def value(depth):
+            kind = rng.random()
+            if depth > 2 or kind < 0.6:
+                return scalar()
+            if kind < 0.8:
+                return [value(depth + 1) for _ in range(rng.randint(0, 3))]
+            return {str(i): value(depth + 1) for i in range(rng.randint(0, 3))}
+
+        for _ in range(3000):
+            items = [value(0) for _ in range(rng.randint(0, 5))]
+            text = json.dumps(items, indent=rng.choice([None, 1]))
+            stream = io.StringIO(text)
+            assert list(iter_json_array(stream, chunk_size)) == json.loads(text)
+
+    def test_yields_lazily(self):
+        """Элементы выдаются до того, как прочитан весь файл"""
+        stream = io.StringIO("[1, 2, " + "3, " * 10000 + "4]")
+        items = iter_json_array(stream, chunk_size=16)
+        assert next(items) == 1
+        assert stream.tell() < 100
+
+    @pytest.mark.parametrize(
+        "text", ["[1, 2", "[1 2]", "[1,]", "[1] x", "", '[{"a": }]']
+    )
+    def test_syntax_errors(self, text):
+        """Синтаксические ошибки - JSONDecodeError"""
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_array(io.StringIO(text), chunk_size=4))
+
+    def test_not_an_array(self):
+        """Корректный JSON другого типа - NotAnArrayError со значением"""
+        with pytest.raises(NotAnArrayError) as info:
+            list(iter_json_array(io.StringIO('{"name": "Alice"}')))
+        assert info.value.value == {"name": "Alice"}
+
+
+class TestWriteJsonArray:
+    """Тесты для потоковой записи JSON-массива"""
+
+    @pytest.mark.parametrize("items", [DATA, [], [{}], [{"a": "1", "б": None}]])
+    def test_indent_matches_json_dump(self, items):
+        """С отступом вывод совпадает с json.dump(indent=2)"""
+        out = io.StringIO()
+        count = write_json_array(iter(items), out)
+        assert out.getvalue() == json.dumps(items, ensure_ascii=False, indent=2)
+        assert count == len(items)
+
+    def test_compact(self):
+        """Компактный режим без пробелов и переводов строк"""
+        out = io.StringIO()
+        write_json_array(iter(DATA), out, indent=None)
+        assert json.loads(out.getvalue()) == DATA
+        assert "\n" not in out.getvalue()
+        assert out.getvalue() == json.dumps(
+            DATA, ensure_ascii=False, separators=(",", ":")
+        )
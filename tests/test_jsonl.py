@@ -0,0 +1,110 @@
+import csv
+import gzip
+import json
+import sys
+
+import pytest
+
+sys.path.append("src")
+from lab05.json_csv import json_to_csv
+import lab05.jsonl
+from lab05.jsonl import csv_to_jsonl, jsonl_to_csv
+from lib.io_helpers import split_line_ranges
+
+RECORDS = [
+    {"name": "Алиса", "age": 22},
+    {"name": "Боб", "city": "Москва, центр"},
+    {"name": "Чарли", "age": 30, "job": 'Dev "lead"\nteam'},
+    {"name": "Дина", "note": None},
+] * 25
+
+
+def write_jsonl(path, records):
+    text = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+    path.write_text(text, encoding="utf-8")
+
+
+class TestJsonl:
+    """Тесты для конвертации JSON Lines"""
+
+    def test_split_line_ranges(self, tmp_path):
+        """Диапазоны покрывают файл и не разрывают строки"""
+        path = tmp_path / "data.jsonl"
+        write_jsonl(path, RECORDS)
+        data = path.read_bytes()
+        ranges = split_line_ranges(path, 7)
+        assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+        for (a, b), (c, _) in zip(ranges, ranges[1:]):
+            assert b == c and data[b - 1 : b] == b"\n"
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_jsonl_to_csv_matches_json_to_csv(self, tmp_path, workers):
+        """Результат тот же, что у json_to_csv, при любом числе процессов"""
+        jsonl_file = tmp_path / "data.jsonl"
+        json_file = tmp_path / "data.json"
+        write_jsonl(jsonl_file, RECORDS)
+        json_file.write_text(json.dumps(RECORDS, ensure_ascii=False), encoding="utf-8")
+
+        jsonl_to_csv(str(jsonl_file), str(tmp_path / "a.csv"), workers=workers)
+        json_to_csv(str(json_file), str(tmp_path / "b.csv"))
+        assert (tmp_path / "a.csv").read_bytes() == (tmp_path / "b.csv").read_bytes()
+
+    def test_compressed_roundtrip(self, tmp_path):
+        """CSV -> JSONL.gz -> CSV"""
+        csv_file = tmp_path / "data.csv"
+        csv_file.write_text("name,age\nАлиса,22\nБоб,25\n", encoding="utf-8")
+        jsonl_file = tmp_path / "data.jsonl.gz"
+
+        csv_to_jsonl(str(csv_file), str(jsonl_file))
+        lines = gzip.decompress(jsonl_file.read_bytes()).decode("utf-8").splitlines()
+        assert json.loads(lines[1]) == {"name": "Боб", "age": "25"}
+
+        jsonl_to_csv(str(jsonl_file), str(tmp_path / "back.csv"), workers=2)
+        with open(tmp_path / "back.csv", encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert rows == [{"age": "22", "name": "Алиса"}, {"age": "25", "name": "Боб"}]
+
+    def test_failed_merge_keeps_old_csv(self, tmp_path, monkeypatch):
+        """Ошибка при склейке частей не оставляет обрезанный CSV"""
+        path = tmp_path / "data.jsonl"
+        write_jsonl(path, RECORDS)
+        out = tmp_path / "out.csv"
+        out.write_text("old\n", encoding="utf-8")
+
+        def broken_copy(src, dst, length):
+            dst.write(src.read(10))
+            raise OSError("диск заполнен")
+
+        monkeypatch.setattr(lab05.jsonl.shutil, "copyfileobj", broken_copy)
+        with pytest.raises(OSError, match="диск заполнен"):
+            jsonl_to_csv(str(path), str(out), workers=2)
+        assert out.read_text(encoding="utf-8") == "old\n"
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["data.jsonl", "out.csv"]
+
+    def test_compressed_output(self, tmp_path):
+        path = tmp_path / "data.jsonl"
+        write_jsonl(path, RECORDS[:4])
+        out = tmp_path / "out.csv.gz"
+        jsonl_to_csv(str(path), str(out))
+        lines = gzip.decompress(out.read_bytes()).decode("utf-8").splitlines()
+        assert lines[0] == "age,city,job,name,note"
+
+    def test_errors(self, tmp_path):
+        """Ошибки парсинга, не-объекты и пустой вход"""
+        path = tmp_path / "data.jsonl"
+        path.write_text('{"a": 1}\n{oops\n', encoding="utf-8")
+        with pytest.raises(ValueError, match="Ошибка парсинга JSON \\(байт 9\\)"):
+            jsonl_to_csv(str(path), str(tmp_path / "out.csv"))
+
+        path.write_text('{"a": 1}\n[1, 2]\n', encoding="utf-8")
+        with pytest.raises(ValueError, match="должны быть словарями"):
+            jsonl_to_csv(str(path), str(tmp_path / "out.csv"))
+
+        path.write_text("\n\n", encoding="utf-8")
+        with pytest.raises(ValueError, match="не содержит записей"):
+            jsonl_to_csv(str(path), str(tmp_path / "out.csv"))
+
+        csv_file = tmp_path / "header.csv"
+        csv_file.write_text("name,age", encoding="utf-8")
+        with pytest.raises(ValueError, match="CSV файл пустой"):
+            csv_to_jsonl(str(csv_file), str(tmp_path / "out.jsonl"))
@@ -0,0 +1,47 @@
+import io
+import sys
+from collections import Counter
+
+sys.path.append("src")
+from lib.ngrams import NgramCounter, count_file_ngrams
+from lib.text import normalize, tokenize
+
+
+def exact_ngrams(text, n):
+    tokens = tokenize(normalize(text))
+    return Counter(" ".join(tokens[i : i + n]) for i in range(len(tokens) - n + 1))
+
+
+class TestNgramCounter:
+    """Тесты для потокового подсчета n-грамм"""
+
+    TEXT = "Привет, мир! Привет мир и снова привет мир. Ёж и мир."
+
+    def test_bigrams_match_exact(self):
+        """Биграммы совпадают с подсчетом по полному списку токенов"""
+        counter = NgramCounter(2)
+        counter.update(tokenize(normalize(self.TEXT)))
+        assert counter.to_counter() == exact_ngrams(self.TEXT, 2)
+        assert counter.most_common(1) == [("привет мир", 3)]
+
+    def test_ngrams_span_chunks(self):
+        """N-граммы на границах кусков не теряются"""
+        text = self.TEXT * 20
+        for n in (1, 2, 3):
+            counter = count_file_ngrams(io.StringIO(text), n, chunk_size=7)
+            assert counter.to_counter() == exact_ngrams(text, n)
+            assert counter.total == sum(exact_ngrams(text, n).values())
+
+    def test_min_count_pruning(self):
+        """Редкие n-граммы отбрасываются, частые остаются"""
+        counter = NgramCounter(2, min_count=2, prune_at=3)
+        for word in "а б в а б г а б".split():
+            counter.update([word])
+        assert counter.pruned > 0
+        assert dict(counter.items()) == {"а б": 3}
+
+    def test_short_input(self):
+        """Текст короче n не дает n-грамм"""
+        counter = count_file_ngrams(io.StringIO("одно"), 3)
+        assert counter.total == 0
+        assert counter.to_counter() == Counter()
@@ -0,0 +1,88 @@
+import io
+import json
+import sys
+
+sys.path.append("src")
+from lib.profiling import Profiler, profiled_frequencies
+from lib.text import count_freq, normalize, tokenize
+
+
+class TestProfiler:
+    """Тесты для профилировщика стадий"""
+
+    def test_stage_accumulates(self):
+        """Повторные вызовы стадии суммируются"""
+        with Profiler() as profiler:
+            for _ in range(3):
+                with profiler.stage("work") as st:
+                    data = [0] * 10000
+                st.tokens += len(data)
+
+        (stage,) = profiler.report()["stages"]
+        assert stage["stage"] == "work"
+        assert stage["calls"] == 3
+        assert stage["tokens"] == 30000
+        assert stage["peak_memory_bytes"] > 0
+
+    def test_nested_stage_keeps_outer_peak(self):
+        """Вложенная стадия не сбрасывает пик внешней"""
+        with Profiler() as profiler:
+            with profiler.stage("outer"):
+                data = [0] * 1_000_000
+                del data
+                with profiler.stage("inner"):
+                    small = [0] * 1000
+                with profiler.stage("inner"):
+                    small += [0] * 1000
+
+        stages = {s["stage"]: s for s in profiler.report()["stages"]}
+        assert stages["inner"]["calls"] == 2
+        assert stages["inner"]["peak_memory_bytes"] < 1_000_000
+        # Пик внешней стадии (список из 10^6 элементов) был до вложенных
+        assert stages["outer"]["peak_memory_bytes"] >= 7_500_000
+
+    def test_wrap(self):
+        """Обертка функции записывает стадию с ее именем"""
+        profiler = Profiler(trace_memory=False)
+        wrapped = profiler.wrap(tokenize)
+        assert wrapped("a b") == ["a", "b"]
+        assert profiler.stages["tokenize"].calls == 1
+
+    def test_dump_json(self, tmp_path):
+        """JSON-сводка пишется в файл"""
+        profiler = Profiler(trace_memory=False)
+        with profiler.stage("sort"):
+            sorted(range(100))
+        out = tmp_path / "profile.json"
+        profiler.dump(out)
+        data = json.loads(out.read_text(encoding="utf-8"))
+        assert [s["stage"] for s in data["stages"]] == ["sort"]
+
+
+class TestProfiledFrequencies:
+    """Пошаговый пайплайн дает тот же результат"""
+
+    def test_matches_count_freq(self):
+        text = "Привет, мир! Мир привет.\nЕщё один тест-пример. " * 20
+        with Profiler() as profiler:
+            freq = profiled_frequencies(io.StringIO(text), profiler, chunk_size=32)
+
+        assert freq == count_freq(tokenize(normalize(text)))
+        stages = {s["stage"]: s for s in profiler.report()["stages"]}
+        assert set(stages) == {"read_text", "normalize", "tokenize", "count_freq"}
+        assert stages["read_text"]["bytes"] == len(text.encode("utf-8"))
+        assert stages["tokenize"]["tokens"] == sum(freq.values())
+
+    def test_bytes_in_file_encoding(self, tmp_path):
+        """Байты считаются в кодировке файла, а не в utf-8"""
+        text = "Привет, мир! Ёжик и кот.\n" * 500
+        path = tmp_path / "cp1251.txt"
+        path.write_bytes(text.encode("cp1251"))
+        with Profiler(trace_memory=False) as profiler:
+            with open(path, "r", encoding="cp1251") as f:
+                freq = profiled_frequencies(f, profiler, chunk_size=100)
+
+        assert freq == count_freq(tokenize(normalize(text)))
+        stages = {s["stage"]: s for s in profiler.report()["stages"]}
+        assert stages["read_text"]["bytes"] == path.stat().st_size
+        assert stages["normalize"]["bytes"] == path.stat().st_size
@@ -0,0 +1,90 @@
+import json
+import sys
+
+import pytest
+
+sys.path.append("src")
+from lib.sketches import CountMinSketch, HyperLogLog, TextSketch, sketch_file
+
+
+class TestHyperLogLog:
+    """Тесты для оценки числа уникальных элементов"""
+
+    def test_small_cardinality_exact(self):
+        """Малые мощности считаются практически точно"""
+        hll = HyperLogLog().extend(["a", "b", "c", "a", "b"])
+        assert hll.count() == 3
+
+    def test_large_cardinality_within_error(self):
+        """Оценка в пределах нескольких стандартных ошибок"""
+        hll = HyperLogLog(12).extend(f"word{i}" for i in range(50000))
+        assert abs(hll.count() - 50000) <= 50000 * 4 * hll.relative_error()
+
+    def test_merge_is_union(self):
+        """Объединение равно сводке по объединению множеств"""
+        left = HyperLogLog(10).extend(str(i) for i in range(3000))
+        right = HyperLogLog(10).extend(str(i) for i in range(2000, 5000))
+        union = HyperLogLog(10).extend(str(i) for i in range(5000))
+        assert left.merge(right).to_dict() == union.to_dict()
+
+    def test_merge_precision_mismatch(self):
+        """Нельзя объединять сводки разной точности"""
+        with pytest.raises(ValueError):
+            HyperLogLog(10).merge(HyperLogLog(12))
+
+    def test_serialization_round_trip(self):
+        """Состояние переживает сериализацию в JSON"""
+        hll = HyperLogLog(8).extend(str(i) for i in range(1000))
+        restored = HyperLogLog.from_dict(json.loads(json.dumps(hll.to_dict())))
+        assert restored.count() == hll.count()
+
+
+class TestCountMinSketch:
+    """Тесты для оценки частот"""
+
+    def test_never_underestimates(self):
+        """Оценка не меньше истинной частоты"""
+        tokens = ["мир"] * 50 + [f"w{i}" for i in range(2000)]
+        cms = CountMinSketch(width=256, depth=4).extend(tokens)
+        assert cms.total == len(tokens)
+        assert 50 <= cms.estimate("мир") <= 50 + cms.error_bound()
+        assert cms.estimate("w1") >= 1
+
+    def test_merge_and_serialization(self):
+        """Объединение складывает счетчики, состояние сериализуется"""
+        left = CountMinSketch(64, 3).extend(["a"] * 5)
+        right = CountMinSketch(64, 3).extend(["a"] * 7)
+        merged = CountMinSketch.from_dict(
+            json.loads(json.dumps(left.merge(right).to_dict()))
+        )
+        assert merged.estimate("a") == 12
+        assert merged.total == 12
+
+    def test_merge_size_mismatch(self):
+        """Нельзя объединять сводки разных размеров"""
+        with pytest.raises(ValueError):
+            CountMinSketch(64, 3).merge(CountMinSketch(32, 3))
+
+
+class TestTextSketch:
+    """Тесты для набора сводок по тексту"""
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_sketch_file(self, tmp_path, workers):
+        """Сводки по файлу совпадают с точной статистикой на малом тексте"""
+        path = tmp_path / "input.txt"
+        path.write_text("мир привет мир\nмир тест привет\n" * 20, encoding="utf-8")
+
+        sketch = sketch_file(path, workers, capacity=10)
+        assert sketch.total == 120
+        assert sketch.unique.count() == 3
+        assert sketch.estimate("мир") == 60
+        assert sketch.top.top(1) == [("мир", 60)]
+
+    def test_serialization_round_trip(self):
+        """Набор сводок переживает сериализацию в JSON"""
+        sketch = TextSketch(capacity=5, precision=8, width=64, depth=2)
+        sketch.extend(["a", "b", "a"])
+        restored = TextSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+        assert restored.total == 3
+        assert restored.estimate("a") == 2
@@ -1,9 +1,18 @@
 # tests/test_text.py
+import io
 import pytest
 import sys
 
 sys.path.append("src")  # Добавляем папку src в путь поиска
-from lib.text import normalize, tokenize, count_freq, top_n
+from lib.text import (
+    normalize,
+    tokenize,
+    count_freq,
+    top_n,
+    iter_tokens,
+    split_byte_ranges,
+    count_freq_parallel,
+)
 
 
 class TestNormalize:
@@ -60,6 +69,33 @@ class TestTokenize:
         assert tokenize(source) == expected
 
 
+class TestIterTokens:
+    """Тесты для потоковой функции iter_tokens"""
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 64])
+    def test_iter_tokens_matches_tokenize(self, chunk_size):
+        """Результат не зависит от размера куска"""
+        text = "Привет, мир!\nЁжик тест-пример  word-with-hyphen\tконец"
+        expected = tokenize(normalize(text))
+        result = list(iter_tokens(io.StringIO(text), chunk_size=chunk_size))
+        assert result == expected
+
+    def test_iter_tokens_hyphen_on_boundary(self):
+        """Слово с дефисом на границе куска не разрывается"""
+        text = "aa bb-cc dd"
+        result = list(iter_tokens(io.StringIO(text), chunk_size=5))
+        assert result == ["aa", "bb-cc", "dd"]
+
+    def test_iter_tokens_empty(self):
+        """Пустой поток"""
+        assert list(iter_tokens(io.StringIO(""))) == []
+
+    def test_iter_tokens_invalid_chunk_size(self):
+        """Некорректный размер куска"""
+        with pytest.raises(ValueError):
+            list(iter_tokens(io.StringIO("a"), chunk_size=0))
+
+
 class TestCountFreq:
     """Тесты для функции count_freq"""
 
@@ -86,6 +122,40 @@ class TestCountFreq:
         assert result == expected
 
 
+class TestCountFreqParallel:
+    """Тесты для параллельного подсчета частот"""
+
+    TEXT = "Привет, мир! Ёжик тест-пример\nмир привет word-with-hyphen " * 50
+
+    def test_split_byte_ranges_cover_file(self, tmp_path):
+        """Диапазоны покрывают файл без пропусков и не режут слова"""
+        path = tmp_path / "input.txt"
+        path.write_text(self.TEXT, encoding="utf-8")
+        data = path.read_bytes()
+
+        ranges = split_byte_ranges(path, 7)
+        assert ranges[0][0] == 0
+        assert ranges[-1][1] == len(data)
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            assert end == start
+            assert data[end - 1 : end].isspace()
+
+    @pytest.mark.parametrize("workers", [1, 2, 5])
+    def test_count_freq_parallel_matches_serial(self, tmp_path, workers):
+        """Параллельный результат совпадает с последовательным"""
+        path = tmp_path / "input.txt"
+        path.write_text(self.TEXT, encoding="utf-8")
+
+        expected = count_freq(tokenize(normalize(self.TEXT)))
+        assert dict(count_freq_parallel(path, workers)) == expected
+
+    def test_count_freq_parallel_empty_file(self, tmp_path):
+        """Пустой файл"""
+        path = tmp_path / "empty.txt"
+        path.write_text("", encoding="utf-8")
+        assert dict(count_freq_parallel(path, 4)) == {}
+
+
 class TestTopN:
     """Тесты для функции top_n"""
 
@@ -123,6 +193,12 @@ class TestTopN:
         expected = [("b", 2), ("a", 1)]
         assert result == expected
 
+    def test_top_n_large_vocabulary(self):
+        """Частичный отбор кучей совпадает с полной сортировкой"""
+        freq = {f"w{i}": i % 17 for i in range(1000)}
+        expected = sorted(freq.items(), key=lambda x: (-x[1], x[0]))[:5]
+        assert top_n(freq, 5) == expected
+
     def test_top_n_empty_dict(self):
         """Тест с пустым словарем"""
         assert top_n({}) == []
@@ -0,0 +1,126 @@
+import csv
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).parent.parent / "src" / "lab04" / "text_report.py"
+
+FILES = {
+    "a.txt": "Привет, мир! Серый кот спит. Ёжик и кот.\n",
+    "b.txt": "Мир и кот. МИР без кота, мир.\n" * 3,
+    "sub/c.txt": "собака лает, ёжик молчит, кот спит\n",
+}
+
+
+def run_report(*args):
+    return subprocess.run(
+        [sys.executable, str(SCRIPT), *map(str, args)],
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+    )
+
+
+def read_report(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        return list(csv.reader(f))
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    root = tmp_path / "docs"
+    for name, text in FILES.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+    return root
+
+
+class TestTextReport:
+    """Тесты для CLI отчёта о частотах слов"""
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_corpus_matches_single_file(self, corpus, tmp_path, workers):
+        """Отчёт по корпусу совпадает с отчётом по склеенным файлам"""
+        joined = tmp_path / "joined.txt"
+        joined.write_text(
+            "".join(FILES[name] for name in sorted(FILES)), encoding="utf-8"
+        )
+        single = tmp_path / "single.csv"
+        result = run_report(joined, single)
+        assert result.returncode == 0, result.stderr
+
+        report = tmp_path / "corpus.csv"
+        result = run_report(corpus, report, "--workers", workers)
+        assert result.returncode == 0, result.stderr
+        assert read_report(report) == read_report(single)
+
+        summary = read_report(tmp_path / "corpus_files.csv")
+        assert summary[0] == ["file", "bytes", "words", "unique_words", "error"]
+        assert sorted(Path(row[0]).name for row in summary[1:]) == [
+            "a.txt",
+            "b.txt",
+            "c.txt",
+        ]
+
+    @pytest.mark.parametrize(
+        "option",
+        [
+            ["--incremental"],
+            ["--profile"],
+            ["--spill-items", "10"],
+            ["--ngram", "2"],
+            ["--min-count", "2"],
+            ["--cache"],
+        ],
+    )
+    def test_corpus_rejects_single_file_options(self, corpus, tmp_path, option):
+        report = tmp_path / "corpus.csv"
+        result = run_report(corpus, report, *option)
+        assert result.returncode == 2
+        assert option[0] in result.stderr
+        assert not report.exists()
+
+    def test_summary_requires_corpus(self, corpus, tmp_path):
+        result = run_report(
+            corpus / "a.txt", tmp_path / "r.csv", "--summary", tmp_path / "s.csv"
+        )
+        assert result.returncode == 2
+        assert "--summary" in result.stderr
+
+    @pytest.mark.parametrize(
+        "options, message",
+        [
+            (["--ngram", "2", "--spill-items", "3"], "--spill-items и --ngram"),
+            (["--incremental", "--ngram", "2"], "--ngram и --incremental"),
+            (["--incremental", "--spill-items", "3"], "--spill-items и --incremental"),
+            (["--ngram", "2", "--workers", "2"], "--ngram и --workers"),
+            (["--spill-items", "3", "--workers", "2"], "--spill-items и --workers"),
+            (["--min-count", "2"], "--min-count без --ngram"),
+        ],
+    )
+    def test_single_file_rejects_mode_conflicts(
+        self, corpus, tmp_path, options, message
+    ):
+        """Несовместимые режимы подсчёта не выбираются молча"""
+        report = tmp_path / "r.csv"
+        result = run_report(corpus / "b.txt", report, *options)
+        assert result.returncode == 2
+        assert message in result.stderr
+        assert not report.exists()
+
+    @pytest.mark.parametrize(
+        "options, header",
+        [
+            (["--ngram", "2", "--min-count", "2"], ["ngram", "count"]),
+            (["--incremental", "--workers", "2"], ["word", "count"]),
+            (["--spill-items", "3"], ["word", "count"]),
+        ],
+    )
+    def test_single_file_compatible_options(self, corpus, tmp_path, options, header):
+        report = tmp_path / "r.csv"
+        result = run_report(corpus / "b.txt", report, *options)
+        assert result.returncode == 0, result.stderr
+        assert read_report(report)[0] == header
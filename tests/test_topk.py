@@ -0,0 +1,88 @@
+import json
+import random
+import sys
+
+import pytest
+
+sys.path.append("src")
+from lib.text import count_freq, top_n
+from lib.topk import SpaceSaving, space_saving_from_file
+
+
+def make_stream(seed: int = 42, size: int = 5000) -> list[str]:
+    """Поток с несколькими частыми словами и длинным хвостом"""
+    rng = random.Random(seed)
+    heavy = ["альфа", "бета", "гамма"]
+    stream = []
+    for _ in range(size):
+        if rng.random() < 0.4:
+            stream.append(rng.choice(heavy))
+        else:
+            stream.append(f"w{rng.randrange(2000)}")
+    return stream
+
+
+class TestSpaceSaving:
+    """Тесты для приближенного топа Space-Saving"""
+
+    def test_exact_when_capacity_is_enough(self):
+        """При достаточной емкости результат точный"""
+        tokens = ["a", "b", "a", "c", "a", "b"]
+        sketch = SpaceSaving(10).extend(tokens)
+        assert sketch.top(3) == top_n(count_freq(tokens), 3)
+        assert sketch.error_bound() == 0.6
+        assert all(sketch.error(word) == 0 for word in "abc")
+
+    def test_error_bounds(self):
+        """Оценки ограничены снизу и сверху гарантированными границами"""
+        stream = make_stream()
+        exact = count_freq(stream)
+        sketch = SpaceSaving(50).extend(stream)
+
+        assert len(sketch) <= 50
+        assert sketch.total == len(stream)
+        for word, true_count in exact.items():
+            estimate = sketch.estimate(word)
+            assert true_count <= estimate
+            assert estimate - sketch.error(word) <= true_count
+            assert sketch.error(word) <= sketch.error_bound()
+
+    def test_heavy_hitters_found(self):
+        """Частые слова гарантированно попадают в топ"""
+        stream = make_stream()
+        sketch = SpaceSaving(50).extend(stream)
+        expected = [word for word, _ in top_n(count_freq(stream), 3)]
+        assert [word for word, _ in sketch.guaranteed(3)] == expected
+
+    def test_merge_keeps_bounds(self):
+        """Объединение сводок сохраняет гарантии"""
+        stream = make_stream()
+        left = SpaceSaving(50).extend(stream[:2500])
+        right = SpaceSaving(50).extend(stream[2500:])
+        merged = left.merge(right)
+
+        exact = count_freq(stream)
+        assert merged.total == len(stream)
+        for word, true_count in exact.items():
+            assert true_count <= merged.estimate(word)
+            assert merged.estimate(word) - merged.error(word) <= true_count
+
+    def test_serialization_round_trip(self):
+        """Сводка переживает сериализацию в JSON"""
+        sketch = SpaceSaving(20).extend(make_stream(size=500))
+        restored = SpaceSaving.from_dict(json.loads(json.dumps(sketch.to_dict())))
+        assert restored.top(20) == sketch.top(20)
+        assert restored.min_count() == sketch.min_count()
+
+    def test_invalid_capacity(self):
+        """Некорректная емкость"""
+        with pytest.raises(ValueError):
+            SpaceSaving(0)
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_from_file(self, tmp_path, workers):
+        """Сводка по файлу, в том числе по нескольким диапазонам"""
+        path = tmp_path / "input.txt"
+        path.write_text("мир привет мир\nмир тест привет\n" * 20, encoding="utf-8")
+        sketch = space_saving_from_file(path, 10, workers)
+        assert sketch.top(3) == [("мир", 60), ("привет", 40), ("тест", 20)]
@@ -0,0 +1,68 @@
+import io
+import sys
+from array import array
+
+sys.path.append("src")
+from lib.text import count_freq, normalize, tokenize, top_n
+from lib.vocab import Vocabulary, count_file_ids, count_ids, tokenize_ids
+
+
+class TestVocabulary:
+    """Тесты для словаря с целочисленными ID"""
+
+    def test_dense_ids(self):
+        """ID выдаются подряд в порядке первого появления"""
+        vocab = Vocabulary()
+        ids = vocab.encode(["мир", "привет", "мир", "тест"])
+        assert isinstance(ids, array)
+        assert list(ids) == [0, 1, 0, 2]
+        assert vocab.words == ["мир", "привет", "тест"]
+        assert vocab.decode(ids) == ["мир", "привет", "мир", "тест"]
+        assert vocab.id_of("тест") == 2
+        assert vocab.id_of("нет") is None
+
+    def test_tokenize_ids_matches_tokenize(self):
+        """tokenize_ids согласован с tokenize"""
+        text = normalize("Привет, мир! Тест-пример и мир")
+        vocab = Vocabulary()
+        assert vocab.decode(tokenize_ids(text, vocab)) == tokenize(text)
+        assert len(tokenize_ids("", vocab)) == 0
+
+
+class TestCountIds:
+    """Тесты для подсчета частот по ID"""
+
+    def test_count_ids(self):
+        """Частоты по ID с минимальной длиной"""
+        assert list(count_ids([0, 2, 2], size=4)) == [1, 0, 2, 0]
+
+    def test_count_file_ids_matches_count_freq(self):
+        """Частоты по файлу совпадают с count_freq"""
+        text = "Привет, мир! Мир привет.\nЕщё один тест-пример. " * 30
+        vocab = Vocabulary()
+        counts = count_file_ids(io.StringIO(text), vocab, chunk_size=16)
+
+        expected = count_freq(tokenize(normalize(text)))
+        assert {w: int(c) for w, c in zip(vocab, counts)} == expected
+        assert top_n(counts, 3, vocab) == top_n(expected, 3)
+
+    def test_count_file_ids_normalization_options(self):
+        """casefold и yo2e передаются в нормализацию"""
+        text = "Ёж ёж ЕЖ"
+        vocab = Vocabulary()
+        counts = count_file_ids(io.StringIO(text), vocab, casefold=False, yo2e=False)
+        assert {w: int(c) for w, c in zip(vocab, counts)} == {
+            w: c
+            for w, c in count_freq(
+                tokenize(normalize(text, casefold=False, yo2e=False))
+            ).items()
+        }
+        vocab = Vocabulary()
+        counts = count_file_ids(io.StringIO(text), vocab)
+        assert {w: int(c) for w, c in zip(vocab, counts)} == {"еж": 3}
+
+    def test_count_file_ids_empty(self):
+        """Пустой файл"""
+        vocab = Vocabulary()
+        assert len(count_file_ids(io.StringIO(""), vocab)) == 0
+        assert top_n(count_file_ids(io.StringIO(""), vocab), 5, vocab) == []
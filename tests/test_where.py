@@ -0,0 +1,54 @@
+import sys
+
+import pytest
+
+sys.path.append("src")
+from lib.where import compile_where, parse_columns, row_getter
+
+
+class TestWhere:
+    """Тесты для языка условий --where"""
+
+    @pytest.mark.parametrize(
+        "expr, expected",
+        [
+            ("age >= 18", [True, False, False]),
+            ("age < 18", [False, True, False]),
+            ("city = Москва", [True, False, False]),
+            ('city != "Москва"', [False, True, False]),
+            ("city = null", [False, False, True]),
+            ("not city = null and age > 10", [True, True, False]),
+            ("age > 100 or (city = Казань and active = true)", [False, True, False]),
+            ("`full name` = 'Ан Ли'", [False, False, True]),
+        ],
+    )
+    def test_dict_rows(self, expr, expected):
+        rows = [
+            {"age": 20, "city": "Москва", "active": False},
+            {"age": "15", "city": "Казань", "active": "True"},
+            {"age": "n/a", "full name": "Ан Ли"},
+        ]
+        predicate = compile_where(expr)
+        assert [predicate(row) for row in rows] == expected
+
+    def test_list_rows_by_index(self):
+        predicate = compile_where("b >= 2.5 and a != x", ["a", "b"])
+        assert predicate(["y", "3"])
+        assert not predicate(["x", "3"])
+        assert not predicate(["y", ""])
+
+    @pytest.mark.parametrize(
+        "expr", ["", "age >", "age > (", "(age = 1", "and = 1", "age ! 1", "a < null"]
+    )
+    def test_syntax_errors(self, expr):
+        with pytest.raises(ValueError):
+            compile_where(expr)
+
+    def test_unknown_column(self):
+        with pytest.raises(ValueError, match="Колонка не найдена"):
+            compile_where("c = 1", ["a", "b"])
+
+    def test_columns(self):
+        assert parse_columns("a, b,,c") == ["a", "b", "c"]
+        assert row_getter(["a", "b", "c"], ["c", "a"])(["1", "2", "3"]) == ("3", "1")
+        assert row_getter(["a", "b"], ["b"])(["1", "2"]) == ("2",)
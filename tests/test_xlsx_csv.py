@@ -0,0 +1,66 @@
+import csv
+import datetime
+import json
+import sys
+
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+
+sys.path.append("src")
+from lab05.xlsx_csv import xlsx_sheets_to_dir, xlsx_to_csv, xlsx_to_json
+
+
+@pytest.fixture
+def book(tmp_path):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "people"
+    ws.append(["name", "age", "born"])
+    ws.append(["Алиса", 22, datetime.date(2003, 5, 1)])
+    ws.append(["Боб", None])
+    ws.append(["Вера", 30, datetime.datetime(1994, 2, 3, 10, 30)])
+    other = wb.create_sheet("cities")
+    other.append(["city"])
+    other.append(["Москва, центр"])
+    path = tmp_path / "book.xlsx"
+    wb.save(path)
+    return path
+
+
+class TestXlsxCsv:
+    """Тесты для конвертации XLSX в CSV и JSON"""
+
+    def test_xlsx_to_csv_first_sheet(self, book, tmp_path):
+        out = tmp_path / "people.csv"
+        xlsx_to_csv(str(book), str(out))
+        with open(out, encoding="utf-8", newline="") as f:
+            rows = list(csv.reader(f))
+        assert rows == [
+            ["name", "age", "born"],
+            ["Алиса", "22", "2003-05-01"],
+            ["Боб", "", ""],
+            ["Вера", "30", "1994-02-03T10:30:00"],
+        ]
+
+    def test_xlsx_to_json_keeps_types(self, book, tmp_path):
+        out = tmp_path / "people.json"
+        xlsx_to_json(str(book), str(out))
+        data = json.loads(out.read_text(encoding="utf-8"))
+        assert data[0] == {"name": "Алиса", "age": 22, "born": "2003-05-01"}
+        assert data[1]["age"] is None
+
+    def test_sheet_selection(self, book, tmp_path):
+        out = tmp_path / "cities.csv"
+        xlsx_to_csv(str(book), str(out), sheet="cities")
+        assert out.read_text(encoding="utf-8").splitlines()[1] == '"Москва, центр"'
+        with pytest.raises(ValueError, match="Лист не найден"):
+            xlsx_to_csv(str(book), str(out), sheet="nope")
+
+    def test_all_sheets_parallel(self, book, tmp_path):
+        outputs = xlsx_sheets_to_dir(str(book), str(tmp_path / "out"), workers=2)
+        assert [p.rsplit("/", 1)[-1] for p in outputs] == ["people.csv", "cities.csv"]
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            xlsx_to_csv(str(tmp_path / "none.xlsx"), str(tmp_path / "x.csv"))